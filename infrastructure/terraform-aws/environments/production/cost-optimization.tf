@@ -43,6 +43,9 @@ module "cost_optimization" {
   database_budget_limit = "3000"
   budget_alert_emails   = var.budget_alert_emails
 
+  # numpy/pyarrow layer (e.g. AWS SDK for pandas) required by the cost optimizer Lambda
+  cost_optimizer_layer_arns = var.cost_optimizer_layer_arns
+
   # Spot Instance Configuration
   enable_spot_instances = true
   spot_max_price        = "0.10"
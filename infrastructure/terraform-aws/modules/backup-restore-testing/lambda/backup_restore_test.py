@@ -3,22 +3,59 @@ AWS Backup Restoration Testing Lambda Function
 
 This Lambda function automates backup restoration testing for RDS/Aurora databases.
 It performs the following operations:
-1. Identifies the latest RDS snapshot
-2. Restores snapshot to a temporary database instance
-3. Runs connectivity and data integrity tests
-4. Cleans up temporary resources
+1. Identifies the snapshot to test (latest, oldest retained or random sample)
+2. Restores snapshot to a temporary database instance (or, in quick mode,
+   creates a copy-on-write clone of the live cluster)
+3. Runs connectivity and data integrity tests, and optionally a cold-read
+   performance probe measuring time to full service while storage hydrates
+4. Hands temporary resources to the reaper for cleanup
 5. Sends notification with results
 
+In export mode a snapshot is verified without any restore: it is exported
+to S3 as Parquet and the files are checked column by column
+(see snapshot_export).
+
+A separate reaper entry point (reaper_handler) runs on its own schedule and
+deletes released or abandoned test resources by tag.
+A scheduler entry point (scheduler_handler) dispatches tests fleet-wide to
+the most overdue clusters and snapshots (see restore_scheduler).
+
 Author: Unified Health Platform Team
 """
 
 import os
 import json
 import time
+import bisect
+import random
 import logging
+import threading
 import boto3
-from datetime import datetime, timezone
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional, Tuple
+
+from restore_history import build_timing_record, open_history_store, rto_summary
+from performance_probe import build_workload, connection_factory, driver_available, run_probe
+from restore_scheduler import (
+    HistoryDigest,
+    PriorityScheduler,
+    build_targets,
+    is_eligible_cluster,
+    lookback_start,
+    month_start
+)
+from snapshot_export import (
+    EXPORT_FAILED_STATUSES,
+    VERIFIED_MARKER,
+    check_expectations,
+    export_task_identifier,
+    export_uri,
+    scan_export,
+    start_or_resume_export,
+    summarize_tables
+)
 
 # Configure logging
 logger = logging.getLogger()
@@ -35,12 +72,68 @@ SNS_TOPIC_ARN = os.environ.get('SNS_TOPIC_ARN', '')
 TEST_QUERIES = json.loads(os.environ.get('TEST_QUERIES', '[]'))
 CLEANUP_AFTER_TEST = os.environ.get('CLEANUP_AFTER_TEST', 'true').lower() == 'true'
 MAX_WAIT_MINUTES = int(os.environ.get('MAX_WAIT_MINUTES', '60'))
+REAPER_MAX_AGE_MINUTES = int(os.environ.get('REAPER_MAX_AGE_MINUTES', '180'))
+REAPER_MAX_WORKERS = int(os.environ.get('REAPER_MAX_WORKERS', '8'))
+STATUS_CACHE_TTL_SECONDS = float(os.environ.get('STATUS_CACHE_TTL_SECONDS', '5'))
+RTO_SLO_MINUTES = float(os.environ.get('RTO_SLO_MINUTES', '60'))
+RTO_HISTORY_DAYS = int(os.environ.get('RTO_HISTORY_DAYS', '90'))
+PITR_SWEEP_POINTS = int(os.environ.get('PITR_SWEEP_POINTS', '4'))
+PITR_MAX_CONCURRENCY = int(os.environ.get('PITR_MAX_CONCURRENCY', '2'))
+PITR_RESTORE_TYPE = os.environ.get('PITR_RESTORE_TYPE', 'copy-on-write')
+
+# DR regions: [{"region": "eu-west-1", "db_subnet_group": "...",
+#               "security_group_ids": ["sg-..."], "kms_key_id": "arn:..."}]
+DR_REGIONS = json.loads(os.environ.get('DR_REGIONS', '[]'))
+DR_COPY_MAX_AGE_HOURS = float(os.environ.get('DR_COPY_MAX_AGE_HOURS', '24'))
+DR_COPY_WAIT_MINUTES = int(os.environ.get('DR_COPY_WAIT_MINUTES', '60'))
+DR_COPY_RETENTION_HOURS = float(os.environ.get('DR_COPY_RETENTION_HOURS', '48'))
+SOURCE_REGION = os.environ.get('AWS_REGION', '')
+TEST_INSTANCE_CLASS = os.environ.get('TEST_INSTANCE_CLASS', '')
+DB_CREDENTIALS_SECRET = os.environ.get('DB_CREDENTIALS_SECRET', '')
+PERF_PROBE_ENABLED = os.environ.get('PERF_PROBE_ENABLED', 'false').lower() == 'true'
+PERF_PROBE_WORKLOAD = json.loads(os.environ.get('PERF_PROBE_WORKLOAD', '{}'))
+PERF_PROBE_BASELINE = json.loads(os.environ.get('PERF_PROBE_BASELINE', '{}'))
+PERF_PROBE_TARGET_FRACTION = float(os.environ.get('PERF_PROBE_TARGET_FRACTION', '0.8'))
+PERF_PROBE_DURATION_SECONDS = int(os.environ.get('PERF_PROBE_DURATION_SECONDS', '300'))
+PERF_PROBE_WINDOW_SECONDS = int(os.environ.get('PERF_PROBE_WINDOW_SECONDS', '30'))
+EXPORT_BUCKET = os.environ.get('EXPORT_BUCKET', '')
+EXPORT_PREFIX = os.environ.get('EXPORT_PREFIX', 'snapshot-exports')
+EXPORT_IAM_ROLE_ARN = os.environ.get('EXPORT_IAM_ROLE_ARN', '')
+EXPORT_KMS_KEY_ID = os.environ.get('EXPORT_KMS_KEY_ID', '')
+EXPORT_ONLY = json.loads(os.environ.get('EXPORT_ONLY', '[]'))
+EXPORT_EXPECTATIONS = json.loads(os.environ.get('EXPORT_EXPECTATIONS', '{}'))
+EXPORT_MAX_WAIT_MINUTES = int(os.environ.get('EXPORT_MAX_WAIT_MINUTES', '10'))
+EXPORT_READERS = int(os.environ.get('EXPORT_READERS', '4'))
+TEST_FUNCTION_NAME = os.environ.get('TEST_FUNCTION_NAME', '')
+MAX_CONCURRENT_RESTORES = int(os.environ.get('MAX_CONCURRENT_RESTORES', '2'))
+RESTORE_MONTHLY_BUDGET_USD = float(os.environ.get('RESTORE_MONTHLY_BUDGET_USD', '200'))
+RESTORE_HOURLY_COST_USD = float(os.environ.get('RESTORE_HOURLY_COST_USD', '0.5'))
+RESTORE_DEFAULT_RUN_HOURS = float(os.environ.get('RESTORE_DEFAULT_RUN_HOURS', '1.5'))
+
+# Smallest instance class that supports each engine, used for test instances
+TEST_INSTANCE_CLASSES = {
+    'aurora-postgresql': 'db.t4g.medium',
+    'aurora-mysql': 'db.t3.medium',
+    'aurora': 'db.t3.small'
+}
+DEFAULT_TEST_INSTANCE_CLASS = 'db.r6g.large'
+
+# Test types whose restore duration is measured against the RTO SLO
+RESTORE_TEST_TYPES = ('full', 'quick')
+
+CLUSTER_FAILED_STATUSES = ['failed', 'incompatible-restore', 'incompatible-parameters']
+INSTANCE_FAILED_STATUSES = ['failed', 'incompatible-restore']
+
+# Time source for waits and timings; restore_simulator swaps in a virtual clock
+clock = time
 
 # AWS clients
 rds_client = boto3.client('rds')
 sns_client = boto3.client('sns')
 cloudwatch_client = boto3.client('cloudwatch')
 secrets_client = boto3.client('secretsmanager')
+s3_client = boto3.client('s3')
+lambda_client = boto3.client('lambda')
 
 
 class BackupRestoreTestResult:
@@ -48,11 +141,25 @@ class BackupRestoreTestResult:
 
     def __init__(self):
         self.success = False
+        self.test_type = 'full'
+        self.source_cluster_id = None
         self.snapshot_id = None
         self.snapshot_create_time = None
         self.restore_start_time = None
         self.restore_end_time = None
         self.restore_duration_minutes = 0
+        self.restore_duration_seconds = None
+        self.phase_timings = {}
+        self.run_duration_seconds = None
+        self.rto_p50_seconds = None
+        self.rto_p95_seconds = None
+        self.slo_breached = False
+        self.pipeline_timeline = None
+        self.rpo_lag_seconds = None
+        self.pitr_results = []
+        self.dr_results = []
+        self.performance_probe = None
+        self.export_verification = None
         self.connectivity_test_passed = False
         self.data_integrity_tests = []
         self.cleanup_completed = False
@@ -62,11 +169,25 @@ class BackupRestoreTestResult:
     def to_dict(self) -> Dict[str, Any]:
         return {
             'success': self.success,
+            'test_type': self.test_type,
+            'source_cluster_id': self.source_cluster_id,
             'snapshot_id': self.snapshot_id,
             'snapshot_create_time': str(self.snapshot_create_time) if self.snapshot_create_time else None,
             'restore_start_time': str(self.restore_start_time) if self.restore_start_time else None,
             'restore_end_time': str(self.restore_end_time) if self.restore_end_time else None,
             'restore_duration_minutes': self.restore_duration_minutes,
+            'restore_duration_seconds': self.restore_duration_seconds,
+            'phase_timings': self.phase_timings,
+            'run_duration_seconds': self.run_duration_seconds,
+            'rto_p50_seconds': self.rto_p50_seconds,
+            'rto_p95_seconds': self.rto_p95_seconds,
+            'slo_breached': self.slo_breached,
+            'pipeline_timeline': self.pipeline_timeline,
+            'rpo_lag_seconds': self.rpo_lag_seconds,
+            'pitr_results': self.pitr_results,
+            'dr_results': self.dr_results,
+            'performance_probe': self.performance_probe,
+            'export_verification': self.export_verification,
             'connectivity_test_passed': self.connectivity_test_passed,
             'data_integrity_tests': self.data_integrity_tests,
             'cleanup_completed': self.cleanup_completed,
@@ -75,44 +196,158 @@ class BackupRestoreTestResult:
         }
 
 
-def get_latest_cluster_snapshot(cluster_identifier: str) -> Optional[Dict[str, Any]]:
-    """Get the latest automated snapshot for an Aurora cluster"""
-    try:
-        response = rds_client.describe_db_cluster_snapshots(
-            DBClusterIdentifier=cluster_identifier,
-            SnapshotType='automated',
-            MaxRecords=20
-        )
+class PhaseTimer:
+    """Wall-clock durations (seconds) of the named phases of a test run"""
 
-        snapshots = response.get('DBClusterSnapshots', [])
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.started = clock.time()
 
-        if not snapshots:
-            logger.warning(f"No automated snapshots found for cluster {cluster_identifier}")
-            # Try manual snapshots as fallback
-            response = rds_client.describe_db_cluster_snapshots(
-                DBClusterIdentifier=cluster_identifier,
-                SnapshotType='manual',
-                MaxRecords=20
+    @contextmanager
+    def phase(self, name: str):
+        start = clock.time()
+        try:
+            yield
+        finally:
+            self.record(name, clock.time() - start)
+
+    def record(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def to_dict(self) -> Dict[str, float]:
+        return {name: round(seconds, 1) for name, seconds in self.phases.items()}
+
+    def elapsed(self) -> float:
+        """Wall-clock span of the whole run; phases can overlap, so this is not their sum"""
+        return clock.time() - self.started
+
+
+class SnapshotCatalog:
+    """
+    Index of a cluster's available snapshots ordered by creation time.
+
+    Automated and manual snapshots are paged through once on load(); every
+    selection afterwards is served from the in-memory index without further
+    describe calls.
+    """
+
+    def __init__(self, cluster_identifier: str, client: Any = None):
+        self.cluster_identifier = cluster_identifier
+        self._client = client or rds_client
+        self._snapshots: List[Dict[str, Any]] = []
+        self._create_times: List[datetime] = []
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+
+    def load(self) -> 'SnapshotCatalog':
+        """Page through automated and manual snapshots and build the index"""
+        paginator = self._client.get_paginator('describe_db_cluster_snapshots')
+
+        for snapshot_type in ('automated', 'manual'):
+            pages = paginator.paginate(
+                DBClusterIdentifier=self.cluster_identifier,
+                SnapshotType=snapshot_type,
+                PaginationConfig={'PageSize': 100}
             )
-            snapshots = response.get('DBClusterSnapshots', [])
+            for page in pages:
+                for snapshot in page.get('DBClusterSnapshots', []):
+                    if snapshot.get('Status') == 'available':
+                        self.add(snapshot)
 
-        if not snapshots:
-            logger.error(f"No snapshots found for cluster {cluster_identifier}")
-            return None
+        logger.info(
+            f"Snapshot catalog for {self.cluster_identifier}: {len(self)} available snapshots"
+        )
+        return self
+
+    def add(self, snapshot: Dict[str, Any]):
+        """Insert a snapshot into the index, keeping creation-time order"""
+        snapshot_id = snapshot['DBClusterSnapshotIdentifier']
+        if snapshot_id in self._by_id:
+            return
+
+        create_time = snapshot['SnapshotCreateTime']
+        position = bisect.bisect_right(self._create_times, create_time)
+        self._create_times.insert(position, create_time)
+        self._snapshots.insert(position, snapshot)
+        self._by_id[snapshot_id] = snapshot
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def __iter__(self):
+        """Snapshots in creation order, oldest first"""
+        return iter(self._snapshots)
+
+    def get(self, snapshot_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a snapshot by identifier"""
+        return self._by_id.get(snapshot_id)
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """Most recently created snapshot"""
+        return self._snapshots[-1] if self._snapshots else None
+
+    def oldest(self) -> Optional[Dict[str, Any]]:
+        """Oldest snapshot still retained"""
+        return self._snapshots[0] if self._snapshots else None
+
+    def between(self, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        """Snapshots created in the half-open interval [start, end)"""
+        lo = bisect.bisect_left(self._create_times, start)
+        hi = bisect.bisect_left(self._create_times, end)
+        return self._snapshots[lo:hi]
+
+    def sample(self, count: int, rng: Optional[random.Random] = None) -> List[Dict[str, Any]]:
+        """
+        Random sample spread across the retention window.
+
+        The window between the oldest and latest snapshot is split into
+        `count` equal buckets and one snapshot is drawn from each non-empty
+        bucket, so samples are not clustered around the most recent days.
+        """
+        if not self._snapshots or count <= 0:
+            return []
+
+        rng = rng or random.Random()
+        if count >= len(self._snapshots):
+            return list(self._snapshots)
+
+        first = self._create_times[0]
+        span = self._create_times[-1] - first
+        step = span / count
+        selected = []
+
+        for i in range(count):
+            start = first + step * i
+            end = first + step * (i + 1) if i < count - 1 else self._create_times[-1] + timedelta(seconds=1)
+            bucket = self.between(start, end)
+            if bucket:
+                selected.append(rng.choice(bucket))
+
+        return selected
+
+
+def select_snapshot(catalog: SnapshotCatalog, selection: str = 'latest') -> Optional[Dict[str, Any]]:
+    """Pick a snapshot from the catalog: 'latest', 'oldest' or 'random'"""
+    if selection == 'oldest':
+        return catalog.oldest()
+    if selection == 'random':
+        sample = catalog.sample(1)
+        return sample[0] if sample else None
+    if selection != 'latest':
+        raise ValueError(f"Unknown snapshot selection: {selection}")
+    return catalog.latest()
 
-        # Filter for available snapshots and sort by creation time
-        available_snapshots = [s for s in snapshots if s['Status'] == 'available']
 
-        if not available_snapshots:
-            logger.error("No available snapshots found")
-            return None
+def get_latest_cluster_snapshot(cluster_identifier: str) -> Optional[Dict[str, Any]]:
+    """Get the latest available snapshot (automated or manual) for an Aurora cluster"""
+    try:
+        catalog = SnapshotCatalog(cluster_identifier).load()
+        latest_snapshot = catalog.latest()
 
-        # Sort by creation time descending
-        available_snapshots.sort(key=lambda x: x['SnapshotCreateTime'], reverse=True)
+        if not latest_snapshot:
+            logger.error(f"No available snapshots found for cluster {cluster_identifier}")
+            return None
 
-        latest_snapshot = available_snapshots[0]
         logger.info(f"Found latest snapshot: {latest_snapshot['DBClusterSnapshotIdentifier']}")
-
         return latest_snapshot
 
     except Exception as e:
@@ -120,30 +355,68 @@ def get_latest_cluster_snapshot(cluster_identifier: str) -> Optional[Dict[str, A
         return None
 
 
-def generate_test_cluster_identifier() -> str:
-    """Generate a unique identifier for the test cluster"""
-    timestamp = datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')
-    return f"{PROJECT_NAME}-{ENVIRONMENT}-{REGION_NAME}-restore-test-{timestamp}"[:63]
+def test_identifier_prefix() -> str:
+    """Identifier prefix of this deployment's test resources (matches the IAM resource pattern)"""
+    name = f"{PROJECT_NAME}-{ENVIRONMENT}-{REGION_NAME}" if REGION_NAME else f"{PROJECT_NAME}-{ENVIRONMENT}"
+    return f"{name}-restore-test-"
+
+
+def generate_test_cluster_identifier(suffix: str = '') -> str:
+    """
+    Generate a unique identifier for the test cluster: the reaper prefix, a
+    timestamp to the second and the suffix, all kept intact. Raises
+    ValueError when they do not fit in the 63 characters RDS allows.
+    """
+    timestamp = datetime.fromtimestamp(clock.time(), timezone.utc).strftime('%y%m%d%H%M%S')
+    identifier = f"{test_identifier_prefix()}{timestamp}{suffix}"
+    if len(identifier) > 63:
+        raise ValueError(f"Test cluster identifier {identifier} is longer than 63 characters")
+    return identifier
+
+
+# Compass words shortened in region codes, e.g. ap-southeast-1 -> apse1
+REGION_CODE_WORDS = (('north', 'n'), ('south', 's'), ('east', 'e'), ('west', 'w'), ('central', 'c'))
+
+
+def region_code(region: str) -> str:
+    """Short, unique code of an AWS region for identifier suffixes, e.g. us-gov-west-1 -> usgovw1"""
+    code = region.replace('-', '')
+    for word, letter in REGION_CODE_WORDS:
+        code = code.replace(word, letter)
+    return code
+
+
+def test_cluster_tags(test_cluster_id: str) -> List[Dict[str, str]]:
+    """Tags applied to every temporary cluster created by the test"""
+    return [
+        {'Key': 'Name', 'Value': test_cluster_id},
+        {'Key': 'Purpose', 'Value': 'BackupRestoreTest'},
+        {'Key': 'Project', 'Value': PROJECT_NAME},
+        {'Key': 'Environment', 'Value': ENVIRONMENT},
+        {'Key': 'AutoDelete', 'Value': 'true'},
+        {'Key': 'CreatedBy', 'Value': 'backup-restore-test-lambda'}
+    ]
 
 
 def restore_cluster_from_snapshot(
-    snapshot_id: str,
+    snapshot: Dict[str, Any],
     test_cluster_id: str,
     db_subnet_group: str,
-    security_groups: List[str]
-) -> bool:
-    """Restore an Aurora cluster from snapshot"""
+    security_groups: List[str],
+    client: Any = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Restore an Aurora cluster from a snapshot record returned by the catalog.
+
+    `client` selects the region to restore in (defaults to the local one).
+    Returns the DBCluster description from the restore call, or None on error.
+    """
     try:
+        snapshot_id = snapshot['DBClusterSnapshotIdentifier']
         logger.info(f"Restoring cluster {test_cluster_id} from snapshot {snapshot_id}")
 
-        # Get snapshot details for engine information
-        snapshot_response = rds_client.describe_db_cluster_snapshots(
-            DBClusterSnapshotIdentifier=snapshot_id
-        )
-        snapshot = snapshot_response['DBClusterSnapshots'][0]
-
         # Restore the cluster
-        rds_client.restore_db_cluster_from_snapshot(
+        response = (client or rds_client).restore_db_cluster_from_snapshot(
             DBClusterIdentifier=test_cluster_id,
             SnapshotIdentifier=snapshot_id,
             Engine=snapshot['Engine'],
@@ -152,35 +425,82 @@ def restore_cluster_from_snapshot(
             VpcSecurityGroupIds=[sg for sg in security_groups if sg],
             DeletionProtection=False,
             CopyTagsToSnapshot=False,
-            Tags=[
-                {'Key': 'Name', 'Value': test_cluster_id},
-                {'Key': 'Purpose', 'Value': 'BackupRestoreTest'},
-                {'Key': 'Project', 'Value': PROJECT_NAME},
-                {'Key': 'Environment', 'Value': ENVIRONMENT},
-                {'Key': 'AutoDelete', 'Value': 'true'},
-                {'Key': 'CreatedBy', 'Value': 'backup-restore-test-lambda'}
-            ]
+            Tags=test_cluster_tags(test_cluster_id)
         )
 
         logger.info(f"Cluster restoration initiated: {test_cluster_id}")
-        return True
+        return response['DBCluster']
 
     except Exception as e:
         logger.error(f"Error restoring cluster from snapshot: {str(e)}")
-        return False
+        return None
+
+
+def clone_cluster(
+    source_cluster_id: str,
+    test_cluster_id: str,
+    db_subnet_group: str,
+    security_groups: List[str],
+    restore_to_time: Optional[datetime] = None,
+    restore_type: str = 'copy-on-write'
+) -> Optional[Dict[str, Any]]:
+    """
+    Create a copy-on-write clone of the source cluster for quick testing.
 
+    Aurora clones share storage pages with the source until either side
+    writes, so the clone is usually available within minutes instead of
+    the full snapshot restore time. With `restore_to_time` the clone is
+    taken at that point in time instead of the latest restorable time.
+    Returns the DBCluster description, or None on error.
+    """
+    try:
+        target = restore_to_time.isoformat() if restore_to_time else 'latest restorable time'
+        logger.info(f"Cloning cluster {source_cluster_id} to {test_cluster_id} ({restore_type}, {target})")
 
-def create_test_instance(test_cluster_id: str) -> bool:
+        if restore_to_time:
+            point_in_time = {'RestoreToTime': restore_to_time}
+        else:
+            point_in_time = {'UseLatestRestorableTime': True}
+
+        response = rds_client.restore_db_cluster_to_point_in_time(
+            DBClusterIdentifier=test_cluster_id,
+            SourceDBClusterIdentifier=source_cluster_id,
+            RestoreType=restore_type,
+            **point_in_time,
+            DBSubnetGroupName=db_subnet_group,
+            VpcSecurityGroupIds=[sg for sg in security_groups if sg],
+            DeletionProtection=False,
+            CopyTagsToSnapshot=False,
+            Tags=test_cluster_tags(test_cluster_id)
+        )
+
+        logger.info(f"Cluster clone initiated: {test_cluster_id}")
+        return response['DBCluster']
+
+    except Exception as e:
+        logger.error(f"Error cloning cluster: {str(e)}")
+        return None
+
+
+def select_test_instance_class(engine: str) -> str:
+    """Choose the instance class for the test instance from the cluster engine"""
+    if TEST_INSTANCE_CLASS:
+        return TEST_INSTANCE_CLASS
+    return TEST_INSTANCE_CLASSES.get(engine, DEFAULT_TEST_INSTANCE_CLASS)
+
+
+def create_test_instance(test_cluster_id: str, engine: str, client: Any = None) -> bool:
     """Create a database instance in the test cluster"""
     try:
         instance_id = f"{test_cluster_id}-instance-1"
+        instance_class = select_test_instance_class(engine)
 
-        logger.info(f"Creating test instance: {instance_id}")
+        logger.info(f"Creating test instance: {instance_id} ({engine}, {instance_class})")
 
-        rds_client.create_db_instance(
+        (client or rds_client).create_db_instance(
             DBInstanceIdentifier=instance_id,
-            DBInstanceClass='db.t3.medium',  # Use smaller instance for testing
-            Engine='aurora-postgresql',
+            DBInstanceClass=instance_class,
+            Engine=engine,
             DBClusterIdentifier=test_cluster_id,
             PubliclyAccessible=False,
             Tags=[
@@ -198,100 +518,266 @@ def create_test_instance(test_cluster_id: str) -> bool:
         return False
 
 
-def wait_for_cluster_available(cluster_id: str, max_wait_minutes: int = 60) -> bool:
-    """Wait for the cluster to become available"""
-    logger.info(f"Waiting for cluster {cluster_id} to become available...")
+class ResourceStatusWatcher:
+    """
+    Shared, short-lived cache of test cluster and instance descriptions.
 
-    start_time = time.time()
-    max_wait_seconds = max_wait_minutes * 60
-    check_interval = 30  # Check every 30 seconds
+    Every pipeline step reads cluster and instance state through the watcher
+    instead of calling describe itself. All watched clusters (and their
+    instances) are refreshed together with filtered describe calls, results
+    are reused for `ttl_seconds`, and concurrent readers that arrive while a
+    refresh is in flight wait for it instead of issuing their own.
+    """
 
-    while (time.time() - start_time) < max_wait_seconds:
-        try:
-            response = rds_client.describe_db_clusters(
-                DBClusterIdentifier=cluster_id
+    FILTER_CHUNK_SIZE = 50
+
+    def __init__(self, client: Any = None, ttl_seconds: float = 5.0):
+        self.client = client or rds_client
+        self.ttl_seconds = ttl_seconds
+        self.api_calls = 0
+        self._lock = threading.Lock()
+        self._watched: set = set()
+        self._clusters: Dict[str, Dict[str, Any]] = {}
+        self._instances: Dict[str, Dict[str, Any]] = {}
+        self._fetched_at: Optional[float] = None
+        self._inflight: Optional[threading.Event] = None
+
+    def watch(self, cluster_id: str):
+        with self._lock:
+            if cluster_id not in self._watched:
+                self._watched.add(cluster_id)
+                self._fetched_at = None
+
+    def unwatch(self, cluster_id: str):
+        with self._lock:
+            self._watched.discard(cluster_id)
+            self._clusters.pop(cluster_id, None)
+            for instance_id in [i for i, v in self._instances.items() if v.get('DBClusterIdentifier') == cluster_id]:
+                del self._instances[instance_id]
+
+    def invalidate(self):
+        """Force the next read to refresh, e.g. after creating or deleting a resource"""
+        with self._lock:
+            self._fetched_at = None
+
+    def cluster(self, cluster_id: str) -> Optional[Dict[str, Any]]:
+        """Cached DBCluster description, or None if the cluster does not exist (yet)"""
+        self.watch(cluster_id)
+        self.refresh()
+        return self._clusters.get(cluster_id)
+
+    def instance(self, instance_id: str, cluster_id: str) -> Optional[Dict[str, Any]]:
+        """Cached DBInstance description for an instance in a watched cluster"""
+        self.watch(cluster_id)
+        self.refresh()
+        return self._instances.get(instance_id)
+
+    def refresh(self, force: bool = False):
+        """Refresh all watched resources unless the cache is still fresh"""
+        while True:
+            with self._lock:
+                if not force and self._fetched_at is not None and clock.time() - self._fetched_at < self.ttl_seconds:
+                    return
+                if self._inflight is not None:
+                    inflight, leader = self._inflight, False
+                else:
+                    inflight = self._inflight = threading.Event()
+                    leader = True
+                watched = sorted(self._watched)
+
+            if not leader:
+                # The joined refresh counts as the forced one; if it started before a
+                # cluster was watched it is not marked fresh and the loop refreshes again
+                inflight.wait()
+                force = False
+                continue
+
+            try:
+                clusters, instances = self._describe(watched)
+                with self._lock:
+                    self._clusters = clusters
+                    self._instances = instances
+                    # Clusters watched while the describe calls ran are not in the results
+                    self._fetched_at = clock.time() if self._watched.issubset(watched) else None
+            finally:
+                with self._lock:
+                    self._inflight = None
+                inflight.set()
+            return
+
+    def _describe(self, cluster_ids: List[str]):
+        clusters: Dict[str, Dict[str, Any]] = {}
+        instances: Dict[str, Dict[str, Any]] = {}
+
+        for i in range(0, len(cluster_ids), self.FILTER_CHUNK_SIZE):
+            chunk = cluster_ids[i:i + self.FILTER_CHUNK_SIZE]
+            filters = [{'Name': 'db-cluster-id', 'Values': chunk}]
+
+            for page in self.client.get_paginator('describe_db_clusters').paginate(Filters=filters):
+                self.api_calls += 1
+                for cluster in page.get('DBClusters', []):
+                    clusters[cluster['DBClusterIdentifier']] = cluster
+
+            for page in self.client.get_paginator('describe_db_instances').paginate(Filters=filters):
+                self.api_calls += 1
+                for instance in page.get('DBInstances', []):
+                    instances[instance['DBInstanceIdentifier']] = instance
+
+        return clusters, instances
+
+
+# Shared by every pipeline step in this invocation
+status_watcher = ResourceStatusWatcher(ttl_seconds=STATUS_CACHE_TTL_SECONDS)
+_region_watchers: Dict[str, ResourceStatusWatcher] = {}
+_region_watchers_lock = threading.Lock()
+
+
+def get_region_watcher(region: Optional[str] = None) -> ResourceStatusWatcher:
+    """Status watcher (and RDS client) scoped to a region; None means the local region"""
+    if not region or region == SOURCE_REGION:
+        return status_watcher
+    with _region_watchers_lock:
+        if region not in _region_watchers:
+            _region_watchers[region] = ResourceStatusWatcher(
+                boto3.client('rds', region_name=region),
+                ttl_seconds=STATUS_CACHE_TTL_SECONDS
             )
+        return _region_watchers[region]
 
-            if response['DBClusters']:
-                cluster = response['DBClusters'][0]
-                status = cluster['Status']
-                logger.info(f"Cluster status: {status}")
 
-                if status == 'available':
-                    return True
-                elif status in ['failed', 'incompatible-restore', 'incompatible-parameters']:
-                    logger.error(f"Cluster restoration failed with status: {status}")
-                    return False
+class RestorePipelineTimeline:
+    """Timestamps (epoch seconds) for the overlapped cluster/instance provisioning"""
 
-        except rds_client.exceptions.DBClusterNotFoundFault:
-            logger.warning(f"Cluster {cluster_id} not found yet, waiting...")
-        except Exception as e:
-            logger.error(f"Error checking cluster status: {str(e)}")
+    def __init__(self, start: float):
+        self.start = start
+        self.instance_submitted = None
+        self.cluster_available = None
+        self.instance_available = None
 
-        time.sleep(check_interval)
+    @property
+    def total_seconds(self) -> float:
+        end = self.instance_available if self.instance_available is not None else self.start
+        return end - self.start
 
-    logger.error(f"Timeout waiting for cluster {cluster_id} to become available")
-    return False
+    @property
+    def sequential_estimate_seconds(self) -> float:
+        """What the run would have taken waiting for the cluster before creating the instance"""
+        if None in (self.cluster_available, self.instance_available, self.instance_submitted):
+            return self.total_seconds
+        instance_provisioning = self.instance_available - self.instance_submitted
+        return (self.cluster_available - self.start) + instance_provisioning
 
+    @property
+    def time_saved_seconds(self) -> float:
+        return max(0.0, self.sequential_estimate_seconds - self.total_seconds)
 
-def wait_for_instance_available(cluster_id: str, max_wait_minutes: int = 30) -> bool:
-    """Wait for the instance in the cluster to become available"""
-    instance_id = f"{cluster_id}-instance-1"
-    logger.info(f"Waiting for instance {instance_id} to become available...")
+    def to_dict(self) -> Dict[str, Any]:
+        def offset(value):
+            return round(value - self.start, 1) if value is not None else None
 
-    start_time = time.time()
+        return {
+            'instance_submitted_after_seconds': offset(self.instance_submitted),
+            'cluster_available_after_seconds': offset(self.cluster_available),
+            'instance_available_after_seconds': offset(self.instance_available),
+            'total_seconds': round(self.total_seconds, 1),
+            'sequential_estimate_seconds': round(self.sequential_estimate_seconds, 1),
+            'time_saved_seconds': round(self.time_saved_seconds, 1)
+        }
+
+
+def provision_test_cluster_pipelined(
+    cluster_id: str,
+    engine: str,
+    max_wait_minutes: int = 60,
+    start_time: Optional[float] = None,
+    watcher: Optional[ResourceStatusWatcher] = None
+) -> RestorePipelineTimeline:
+    """
+    Wait for a restored cluster and its test instance, overlapping the two.
+
+    The instance creation is submitted as soon as the restored cluster is
+    visible to describe calls rather than after it becomes available, so
+    instance provisioning runs while the cluster storage is still being
+    restored. Both resources are polled in the same loop.
+
+    Raises RuntimeError on failure or timeout.
+    """
+    instance_id = f"{cluster_id}-instance-1"
+    timeline = RestorePipelineTimeline(start_time if start_time is not None else clock.time())
     max_wait_seconds = max_wait_minutes * 60
     check_interval = 30
 
-    while (time.time() - start_time) < max_wait_seconds:
+    logger.info(f"Waiting for cluster {cluster_id} and instance {instance_id} (pipelined)")
+    watcher = watcher or status_watcher
+    watcher.watch(cluster_id)
+
+    while (clock.time() - timeline.start) < max_wait_seconds:
         try:
-            response = rds_client.describe_db_instances(
-                DBInstanceIdentifier=instance_id
-            )
+            cluster = watcher.cluster(cluster_id)
 
-            if response['DBInstances']:
-                instance = response['DBInstances'][0]
-                status = instance['DBInstanceStatus']
-                logger.info(f"Instance status: {status}")
+            if cluster is None:
+                logger.warning(f"Cluster {cluster_id} not found yet, waiting...")
+            elif timeline.cluster_available is None:
+                status = cluster['Status']
+                logger.info(f"Cluster status: {status}")
 
+                if status in CLUSTER_FAILED_STATUSES:
+                    raise RuntimeError(f"Cluster restoration failed with status: {status}")
                 if status == 'available':
-                    return True
-                elif status in ['failed', 'incompatible-restore']:
-                    logger.error(f"Instance restoration failed with status: {status}")
-                    return False
-
-        except rds_client.exceptions.DBInstanceNotFoundFault:
-            logger.warning(f"Instance {instance_id} not found yet, waiting...")
+                    timeline.cluster_available = clock.time()
+
+            if cluster is not None and timeline.instance_submitted is None:
+                if not create_test_instance(cluster_id, engine, client=watcher.client):
+                    raise RuntimeError("Failed to create test instance")
+                timeline.instance_submitted = clock.time()
+                watcher.invalidate()
+
+            if timeline.instance_submitted is not None and timeline.instance_available is None:
+                instance = watcher.instance(instance_id, cluster_id)
+                if instance is None:
+                    logger.warning(f"Instance {instance_id} not found yet, waiting...")
+                else:
+                    status = instance['DBInstanceStatus']
+                    logger.info(f"Instance status: {status}")
+
+                    if status in INSTANCE_FAILED_STATUSES:
+                        raise RuntimeError(f"Instance creation failed with status: {status}")
+                    if status == 'available':
+                        timeline.instance_available = clock.time()
+
+            if timeline.cluster_available is not None and timeline.instance_available is not None:
+                logger.info(
+                    f"Cluster and instance available after {timeline.total_seconds:.0f}s "
+                    f"(saved {timeline.time_saved_seconds:.0f}s versus sequential provisioning)"
+                )
+                return timeline
+
+        except RuntimeError:
+            raise
         except Exception as e:
-            logger.error(f"Error checking instance status: {str(e)}")
+            logger.error(f"Error checking restore status: {str(e)}")
 
-        time.sleep(check_interval)
+        clock.sleep(check_interval)
 
-    logger.error(f"Timeout waiting for instance {instance_id} to become available")
-    return False
+    raise RuntimeError(f"Cluster {cluster_id} and instance did not become available within timeout")
 
 
-def get_cluster_endpoint(cluster_id: str) -> Optional[str]:
+def get_cluster_endpoint(cluster_id: str, watcher: Optional[ResourceStatusWatcher] = None) -> Optional[str]:
     """Get the endpoint of the restored cluster"""
     try:
-        response = rds_client.describe_db_clusters(
-            DBClusterIdentifier=cluster_id
-        )
-
-        if response['DBClusters']:
-            return response['DBClusters'][0].get('Endpoint')
-
-        return None
+        cluster = (watcher or status_watcher).cluster(cluster_id)
+        return cluster.get('Endpoint') if cluster else None
 
     except Exception as e:
         logger.error(f"Error getting cluster endpoint: {str(e)}")
         return None
 
 
-def test_database_connectivity(cluster_id: str) -> bool:
+def test_database_connectivity(cluster_id: str, watcher: Optional[ResourceStatusWatcher] = None) -> bool:
     """Test basic connectivity to the restored database"""
     try:
-        endpoint = get_cluster_endpoint(cluster_id)
+        watcher = watcher or status_watcher
+        endpoint = get_cluster_endpoint(cluster_id, watcher)
 
         if not endpoint:
             logger.error("Could not get cluster endpoint")
@@ -304,15 +790,11 @@ def test_database_connectivity(cluster_id: str) -> bool:
         # The actual connectivity test would require the Lambda to be in the VPC.
 
         # Verify the cluster is responding to describe calls
-        response = rds_client.describe_db_clusters(
-            DBClusterIdentifier=cluster_id
-        )
+        cluster = watcher.cluster(cluster_id)
 
-        if response['DBClusters']:
-            cluster = response['DBClusters'][0]
-            if cluster['Status'] == 'available':
-                logger.info("Database cluster is available and responding")
-                return True
+        if cluster and cluster['Status'] == 'available':
+            logger.info("Database cluster is available and responding")
+            return True
 
         return False
 
@@ -321,7 +803,11 @@ def test_database_connectivity(cluster_id: str) -> bool:
         return False
 
 
-def run_data_integrity_tests(cluster_id: str, queries: List[str]) -> List[Dict[str, Any]]:
+def run_data_integrity_tests(
+    cluster_id: str,
+    queries: List[str],
+    watcher: Optional[ResourceStatusWatcher] = None
+) -> List[Dict[str, Any]]:
     """
     Run data integrity test queries.
 
@@ -335,15 +821,11 @@ def run_data_integrity_tests(cluster_id: str, queries: List[str]) -> List[Dict[s
 
     try:
         # Get cluster information
-        response = rds_client.describe_db_clusters(
-            DBClusterIdentifier=cluster_id
-        )
+        cluster = (watcher or status_watcher).cluster(cluster_id)
 
-        if not response['DBClusters']:
+        if not cluster:
             return results
 
-        cluster = response['DBClusters'][0]
-
         # Verify cluster health indicators
         health_checks = [
             {
@@ -399,50 +881,389 @@ def run_data_integrity_tests(cluster_id: str, queries: List[str]) -> List[Dict[s
     return results
 
 
-def cleanup_test_resources(cluster_id: str) -> bool:
-    """Delete the temporary test cluster and instance"""
+def get_database_credentials() -> Optional[Dict[str, Any]]:
+    """Read the source cluster's credentials (shared by restored clusters) from Secrets Manager"""
+    if not DB_CREDENTIALS_SECRET:
+        return None
+    try:
+        response = secrets_client.get_secret_value(SecretId=DB_CREDENTIALS_SECRET)
+        return json.loads(response['SecretString'])
+
+    except Exception as e:
+        logger.error(f"Error reading database credentials: {str(e)}")
+        return None
+
+
+def run_performance_probe(
+    cluster_id: str,
+    engine: str,
+    watcher: Optional[ResourceStatusWatcher] = None
+) -> Dict[str, Any]:
+    """
+    Run the configured read workload against the restored cluster and
+    report how long it takes to reach the target fraction of baseline.
+
+    Returns a result with 'skipped' set when the probe cannot run here
+    (no workload, credentials or database driver).
+    """
+    queries = build_workload(PERF_PROBE_WORKLOAD, engine)
+    if not queries:
+        return {'skipped': True, 'reason': 'No probe workload configured'}
+    if not driver_available(engine):
+        return {'skipped': True, 'reason': f"No database driver available for {engine}"}
+
+    credentials = get_database_credentials()
+    if not credentials:
+        return {'skipped': True, 'reason': 'Database credentials unavailable'}
+
+    endpoint = get_cluster_endpoint(cluster_id, watcher)
+    if not endpoint:
+        return {'skipped': True, 'reason': 'Cluster endpoint unavailable'}
+
     try:
-        instance_id = f"{cluster_id}-instance-1"
+        report = run_probe(
+            connection_factory(engine, endpoint, credentials),
+            queries,
+            duration_seconds=PERF_PROBE_DURATION_SECONDS,
+            window_seconds=PERF_PROBE_WINDOW_SECONDS,
+            concurrency=int(PERF_PROBE_WORKLOAD.get('concurrency', 2)),
+            baseline=PERF_PROBE_BASELINE or None,
+            target_fraction=PERF_PROBE_TARGET_FRACTION,
+            clock=clock
+        )
+        report['skipped'] = False
+        logger.info(
+            f"Performance probe: {len(report['windows'])} windows, "
+            f"time to {PERF_PROBE_TARGET_FRACTION:.0%} of baseline: {report['time_to_target_seconds']}s"
+        )
+        return report
+
+    except Exception as e:
+        logger.error(f"Performance probe failed: {str(e)}")
+        return {'skipped': True, 'reason': str(e)}
+
+
+def release_test_resources(cluster_id: str, watcher: Optional[ResourceStatusWatcher] = None) -> bool:
+    """
+    Hand the test cluster over to the reaper without waiting for deletion.
+
+    The cluster is tagged with ReapAfter so the next reaper run deletes it
+    regardless of age, and deletion of the test instance is started right
+    away since nothing depends on it any more. Missing resources count as
+    released.
+    """
+    instance_id = f"{cluster_id}-instance-1"
+    watcher = watcher or status_watcher
+
+    try:
+        cluster = watcher.cluster(cluster_id)
+        if not cluster:
+            logger.info(f"Cluster {cluster_id} not found, nothing to release")
+            return True
+
+        watcher.client.add_tags_to_resource(
+            ResourceName=cluster['DBClusterArn'],
+            Tags=[{'Key': 'ReapAfter', 'Value': datetime.now(timezone.utc).isoformat()}]
+        )
+    except Exception as e:
+        logger.error(f"Error marking cluster {cluster_id} for cleanup: {str(e)}")
+        return False
 
-        # Delete the instance first
+    try:
         logger.info(f"Deleting test instance: {instance_id}")
+        watcher.client.delete_db_instance(
+            DBInstanceIdentifier=instance_id,
+            SkipFinalSnapshot=True,
+            DeleteAutomatedBackups=True
+        )
+    except watcher.client.exceptions.DBInstanceNotFoundFault:
+        logger.info(f"Instance {instance_id} not found, may already be deleted")
+    except Exception as e:
+        # The reaper retries the instance deletion on its next run
+        logger.warning(f"Error deleting instance: {str(e)}")
+
+    watcher.unwatch(cluster_id)
+    logger.info(f"Test cluster {cluster_id} handed over to the reaper")
+    return True
+
+
+def keep_test_resources(cluster_id: str, watcher: Optional[ResourceStatusWatcher] = None):
+    """Opt the test cluster out of reaping when cleanup is disabled"""
+    watcher = watcher or status_watcher
+    try:
+        cluster = watcher.cluster(cluster_id)
+        if cluster:
+            watcher.client.add_tags_to_resource(
+                ResourceName=cluster['DBClusterArn'],
+                Tags=[{'Key': 'AutoDelete', 'Value': 'false'}]
+            )
+        watcher.unwatch(cluster_id)
+    except Exception as e:
+        logger.warning(f"Could not mark cluster {cluster_id} to be kept: {str(e)}")
+
+
+def _tag_value(resource: Dict[str, Any], key: str) -> Optional[str]:
+    for tag in resource.get('TagList', []):
+        if tag['Key'] == key:
+            return tag['Value']
+    return None
+
+
+def is_own_test_cluster(cluster: Dict[str, Any]) -> bool:
+    """
+    A test cluster created by this deployment. Other environments' test
+    clusters share the Purpose tag but not the project/environment tags or
+    the identifier prefix the IAM policy allows deleting.
+    """
+    return (
+        _tag_value(cluster, 'Purpose') == 'BackupRestoreTest'
+        and _tag_value(cluster, 'Project') == PROJECT_NAME
+        and _tag_value(cluster, 'Environment') == ENVIRONMENT
+        and cluster.get('DBClusterIdentifier', '').startswith(test_identifier_prefix())
+    )
+
+
+def _is_reapable(cluster: Dict[str, Any], now: datetime, max_age: timedelta) -> bool:
+    """A test cluster is reapable once released by its test or past the maximum age"""
+    if not is_own_test_cluster(cluster):
+        return False
+    if _tag_value(cluster, 'AutoDelete') != 'true':
+        return False
+    if _tag_value(cluster, 'ReapAfter'):
+        return True
+    create_time = cluster.get('ClusterCreateTime')
+    return bool(create_time) and now - create_time >= max_age
+
+
+def find_reapable_test_resources(max_age_minutes: int, client: Any = None) -> Dict[str, Any]:
+    """
+    Find released or abandoned test clusters of this deployment and their
+    instances by tag and identifier prefix.
+
+    Returns {'clusters': [cluster ids], 'instances': [instance ids]}.
+    Instances are matched through their cluster membership so untagged
+    instances in a reapable cluster are not left behind.
+    """
+    client = client or rds_client
+    now = datetime.now(timezone.utc)
+    max_age = timedelta(minutes=max_age_minutes)
+    clusters = []
+    instances = []
+
+    for page in client.get_paginator('describe_db_clusters').paginate():
+        for cluster in page.get('DBClusters', []):
+            if _is_reapable(cluster, now, max_age) and cluster.get('Status') != 'deleting':
+                clusters.append(cluster['DBClusterIdentifier'])
+
+    reapable = set(clusters)
+    for page in client.get_paginator('describe_db_instances').paginate():
+        for instance in page.get('DBInstances', []):
+            if instance.get('DBClusterIdentifier') in reapable and instance.get('DBInstanceStatus') != 'deleting':
+                instances.append(instance['DBInstanceIdentifier'])
+
+    return {'clusters': clusters, 'instances': instances}
+
+
+# Errors that clear up on their own: throttling, and clusters still waiting for their instances to go
+RETRYABLE_ERROR_CODES = {
+    'Throttling',
+    'ThrottlingException',
+    'RequestLimitExceeded',
+    'TooManyRequestsException',
+    'InvalidDBClusterStateFault',
+    'InvalidDBInstanceState',
+    'InvalidDBInstanceStateFault',
+}
+
+
+def _error_code(error: Exception) -> str:
+    """AWS error code of a ClientError, or the exception class name (modeled faults)"""
+    return getattr(error, 'response', {}).get('Error', {}).get('Code') or type(error).__name__
+
+
+def _with_backoff(
+    action,
+    description: str,
+    deadline: float,
+    client: Any = None,
+    base_delay: float = 5.0,
+    max_delay: float = 60.0
+) -> bool:
+    """
+    Run a delete call, retrying throttling and invalid-state errors with
+    exponential backoff and jitter until the deadline. Any other error (e.g.
+    AccessDenied) fails at once and is left for the next reaper run.
+    """
+    client = client or rds_client
+    attempt = 0
+    while True:
         try:
-            rds_client.delete_db_instance(
+            action()
+            return True
+        except (client.exceptions.DBClusterNotFoundFault, client.exceptions.DBInstanceNotFoundFault):
+            logger.info(f"{description}: already deleted")
+            return True
+        except Exception as e:
+            if _error_code(e) not in RETRYABLE_ERROR_CODES:
+                logger.warning(f"{description}: failed ({str(e)})")
+                return False
+            delay = min(max_delay, base_delay * (2 ** attempt)) * random.uniform(0.5, 1.0)
+            if clock.time() + delay >= deadline:
+                logger.warning(f"{description}: giving up until next reaper run ({str(e)})")
+                return False
+            logger.info(f"{description}: retrying in {delay:.0f}s ({str(e)})")
+            clock.sleep(delay)
+            attempt += 1
+
+
+def reap_test_resources(
+    max_age_minutes: int,
+    deadline: float,
+    max_workers: int = 8,
+    client: Any = None
+) -> Dict[str, Any]:
+    """
+    Delete reapable test instances, then their clusters, concurrently.
+
+    Instances are deleted first because Aurora refuses to delete a cluster
+    that still has members; cluster deletes are retried with backoff while
+    the instance deletions finish. Anything not deleted before the deadline
+    is picked up again by the next run, so the reaper is idempotent.
+    """
+    client = client or rds_client
+    resources = find_reapable_test_resources(max_age_minutes, client)
+    summary = {'instances_deleted': [], 'clusters_deleted': [], 'failed': []}
+
+    def delete_instance(instance_id):
+        return _with_backoff(
+            lambda: client.delete_db_instance(
                 DBInstanceIdentifier=instance_id,
                 SkipFinalSnapshot=True,
                 DeleteAutomatedBackups=True
-            )
-        except rds_client.exceptions.DBInstanceNotFoundFault:
-            logger.info(f"Instance {instance_id} not found, may already be deleted")
-        except Exception as e:
-            logger.warning(f"Error deleting instance: {str(e)}")
-
-        # Wait a bit for instance deletion to start
-        time.sleep(30)
+            ),
+            f"Delete instance {instance_id}",
+            deadline,
+            client
+        )
 
-        # Delete the cluster
-        logger.info(f"Deleting test cluster: {cluster_id}")
-        try:
-            rds_client.delete_db_cluster(
-                DBClusterIdentifier=cluster_id,
-                SkipFinalSnapshot=True
-            )
-        except rds_client.exceptions.DBClusterNotFoundFault:
-            logger.info(f"Cluster {cluster_id} not found, may already be deleted")
-        except rds_client.exceptions.InvalidDBClusterStateFault:
-            logger.warning(f"Cluster {cluster_id} is not in a valid state for deletion, retrying...")
-            time.sleep(60)
-            rds_client.delete_db_cluster(
+    def delete_cluster(cluster_id):
+        return _with_backoff(
+            lambda: client.delete_db_cluster(
                 DBClusterIdentifier=cluster_id,
                 SkipFinalSnapshot=True
-            )
+            ),
+            f"Delete cluster {cluster_id}",
+            deadline,
+            client
+        )
 
-        logger.info("Cleanup completed successfully")
-        return True
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for instance_id, deleted in zip(resources['instances'], executor.map(delete_instance, resources['instances'])):
+            summary['instances_deleted' if deleted else 'failed'].append(instance_id)
+
+        for cluster_id, deleted in zip(resources['clusters'], executor.map(delete_cluster, resources['clusters'])):
+            summary['clusters_deleted' if deleted else 'failed'].append(cluster_id)
+
+    logger.info(
+        f"Reaper deleted {len(summary['instances_deleted'])} instances and "
+        f"{len(summary['clusters_deleted'])} clusters, {len(summary['failed'])} pending"
+    )
+    return summary
+
+
+def find_expired_dr_copies(retention_hours: float, client: Any) -> List[str]:
+    """
+    Manual snapshot copies made by DR tests of this deployment that are
+    older than the retention. Copies are kept that long so DR runs close
+    together can reuse them (see find_or_copy_dr_snapshot).
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=retention_hours)
+    expired = []
+    for page in client.get_paginator('describe_db_cluster_snapshots').paginate(SnapshotType='manual'):
+        for snapshot in page.get('DBClusterSnapshots', []):
+            if (
+                _tag_value(snapshot, 'Purpose') == 'DRSnapshotCopy'
+                and _tag_value(snapshot, 'Project') == PROJECT_NAME
+                and _tag_value(snapshot, 'Environment') == ENVIRONMENT
+                and snapshot.get('Status') == 'available'
+                and snapshot.get('SnapshotCreateTime')
+                and snapshot['SnapshotCreateTime'] < cutoff
+            ):
+                expired.append(snapshot['DBClusterSnapshotIdentifier'])
+    return expired
+
+
+def reap_dr_snapshot_copies(retention_hours: float, deadline: float, client: Any) -> Dict[str, Any]:
+    """Delete expired DR snapshot copies in one region"""
+    summary = {'snapshots_deleted': [], 'failed': []}
+    for snapshot_id in find_expired_dr_copies(retention_hours, client):
+        deleted = _with_backoff(
+            lambda: client.delete_db_cluster_snapshot(DBClusterSnapshotIdentifier=snapshot_id),
+            f"Delete DR snapshot copy {snapshot_id}",
+            deadline,
+            client
+        )
+        summary['snapshots_deleted' if deleted else 'failed'].append(snapshot_id)
+
+    if summary['snapshots_deleted'] or summary['failed']:
+        logger.info(
+            f"Reaper deleted {len(summary['snapshots_deleted'])} DR snapshot copies, "
+            f"{len(summary['failed'])} pending"
+        )
+    return summary
+
+
+def format_seconds(seconds: Optional[float]) -> str:
+    """Render a duration as minutes and seconds for notifications"""
+    if seconds is None:
+        return 'N/A'
+    minutes, secs = divmod(int(round(seconds)), 60)
+    return f"{minutes}m {secs:02d}s"
+
+
+def record_run_history(result: BackupRestoreTestResult):
+    """
+    Append the run (timings and full result) to the history store and
+    evaluate the RTO SLO.
+
+    p50/p95 are computed over the successful runs of the same cluster and
+    test type in the last RTO_HISTORY_DAYS, including this one.
+    """
+    if result.restore_duration_seconds is not None:
+        result.slo_breached = result.restore_duration_seconds > RTO_SLO_MINUTES * 60
+    else:
+        # A restore that failed or timed out never recovered within the RTO
+        result.slo_breached = result.test_type in RESTORE_TEST_TYPES and not result.success
+
+    store = open_history_store(s3_client)
+    if not store or not result.source_cluster_id:
+        return
+
+    try:
+        store.append(build_timing_record(
+            result.source_cluster_id,
+            result.test_type,
+            result.success,
+            result.restore_duration_seconds,
+            result.phase_timings,
+            snapshot_id=result.snapshot_id,
+            run_seconds=result.run_duration_seconds,
+            result=result.to_dict()
+        ))
+
+        summary = rto_summary(
+            store,
+            result.source_cluster_id,
+            since=datetime.now(timezone.utc) - timedelta(days=RTO_HISTORY_DAYS),
+            test_type=result.test_type
+        )
+        result.rto_p50_seconds = summary['p50_seconds']
+        result.rto_p95_seconds = summary['p95_seconds']
+
+        logger.info(f"RTO over {summary['runs']} runs: p50={summary['p50_seconds']} p95={summary['p95_seconds']}")
 
     except Exception as e:
-        logger.error(f"Error during cleanup: {str(e)}")
-        return False
+        logger.error(f"Error recording run history: {str(e)}")
 
 
 def publish_metrics(result: BackupRestoreTestResult):
@@ -471,14 +1292,129 @@ def publish_metrics(result: BackupRestoreTestResult):
                 'Value': 1,
                 'Unit': 'Count'
             },
-            {
-                'MetricName': 'RestoreTimeMinutes',
+        ]
+
+        # Clones take minutes where full restores take an hour; the test type keeps
+        # their times out of the RTO alarm on full restores
+        rto_dimensions = dimensions + [{'Name': 'TestType', 'Value': result.test_type}]
+
+        if result.restore_duration_seconds is not None:
+            # RestoreTimeMinutes has no CloudWatch unit; kept for the existing alarm
+            metrics.extend([
+                {
+                    'MetricName': 'RestoreTimeMinutes',
+                    'Dimensions': rto_dimensions,
+                    'Timestamp': timestamp,
+                    'Value': result.restore_duration_minutes,
+                    'Unit': 'None'
+                },
+                {
+                    'MetricName': 'RestoreTimeSeconds',
+                    'Dimensions': rto_dimensions,
+                    'Timestamp': timestamp,
+                    'Value': result.restore_duration_seconds,
+                    'Unit': 'Seconds'
+                }
+            ])
+
+        if result.test_type in RESTORE_TEST_TYPES:
+            metrics.append({
+                'MetricName': 'RestoreSLOBreach',
+                'Dimensions': rto_dimensions,
+                'Timestamp': timestamp,
+                'Value': 1 if result.slo_breached else 0,
+                'Unit': 'Count'
+            })
+
+        if result.rpo_lag_seconds is not None:
+            metrics.append({
+                'MetricName': 'RecoveryPointLagSeconds',
                 'Dimensions': dimensions,
                 'Timestamp': timestamp,
-                'Value': result.restore_duration_minutes,
+                'Value': result.rpo_lag_seconds,
+                'Unit': 'Seconds'
+            })
+
+        for point in result.pitr_results:
+            metrics.append({
+                'MetricName': 'PointInTimeRestoreSuccess' if point['success'] else 'PointInTimeRestoreFailure',
+                'Dimensions': dimensions,
+                'Timestamp': timestamp,
+                'Value': 1,
                 'Unit': 'Count'
-            }
-        ]
+            })
+
+        for outcome in result.dr_results:
+            region_dimensions = dimensions + [{'Name': 'TargetRegion', 'Value': outcome['region']}]
+            metrics.append({
+                'MetricName': 'DRRestoreSuccess' if outcome['success'] else 'DRRestoreFailure',
+                'Dimensions': region_dimensions,
+                'Timestamp': timestamp,
+                'Value': 1,
+                'Unit': 'Count'
+            })
+            for name, key in (('DRSnapshotCopySeconds', 'copy_seconds'),
+                              ('DRRestoreTimeSeconds', 'restore_duration_seconds')):
+                if outcome[key] is not None:
+                    metrics.append({
+                        'MetricName': name,
+                        'Dimensions': region_dimensions,
+                        'Timestamp': timestamp,
+                        'Value': outcome[key],
+                        'Unit': 'Seconds'
+                    })
+
+        for phase, seconds in result.phase_timings.items():
+            metrics.append({
+                'MetricName': 'RestorePhaseSeconds',
+                'Dimensions': dimensions + [{'Name': 'Phase', 'Value': phase}],
+                'Timestamp': timestamp,
+                'Value': seconds,
+                'Unit': 'Seconds'
+            })
+
+        for name, value in (('RestoreTimeP50Seconds', result.rto_p50_seconds),
+                            ('RestoreTimeP95Seconds', result.rto_p95_seconds)):
+            if value is not None:
+                metrics.append({
+                    'MetricName': name,
+                    'Dimensions': dimensions,
+                    'Timestamp': timestamp,
+                    'Value': value,
+                    'Unit': 'Seconds'
+                })
+
+        if result.pipeline_timeline:
+            metrics.append({
+                'MetricName': 'RestorePipelineTimeSavedSeconds',
+                'Dimensions': dimensions,
+                'Timestamp': timestamp,
+                'Value': result.pipeline_timeline['time_saved_seconds'],
+                'Unit': 'Seconds'
+            })
+
+        probe = result.performance_probe
+        if probe and not probe.get('skipped'):
+            if probe['time_to_target_seconds'] is not None:
+                metrics.append({
+                    'MetricName': 'TimeToTargetPerformanceSeconds',
+                    'Dimensions': dimensions,
+                    'Timestamp': timestamp,
+                    'Value': probe['time_to_target_seconds'],
+                    'Unit': 'Seconds'
+                })
+            if probe['windows']:
+                # Latency of the coldest window shows the hydration penalty
+                for kind, stats in probe['windows'][0]['kinds'].items():
+                    if stats['p95_ms'] is None:
+                        continue
+                    metrics.append({
+                        'MetricName': 'ColdReadP95Milliseconds',
+                        'Dimensions': dimensions + [{'Name': 'Workload', 'Value': kind}],
+                        'Timestamp': timestamp,
+                        'Value': stats['p95_ms'],
+                        'Unit': 'Milliseconds'
+                    })
 
         # Add data integrity metrics
         integrity_passed = all(t.get('passed', False) for t in result.data_integrity_tests)
@@ -516,11 +1452,16 @@ def send_notification(result: BackupRestoreTestResult):
             f"Test Time: {datetime.now(timezone.utc).isoformat()}",
             "",
             "=== Test Details ===",
+            f"Test Type: {result.test_type}",
+            f"Source Cluster: {result.source_cluster_id or 'N/A'}",
             f"Snapshot ID: {result.snapshot_id or 'N/A'}",
             f"Snapshot Created: {result.snapshot_create_time or 'N/A'}",
             f"Restoration Duration: {result.restore_duration_minutes} minutes",
+            f"RTO p50/p95: {format_seconds(result.rto_p50_seconds)} / {format_seconds(result.rto_p95_seconds)}",
+            f"RTO SLO ({RTO_SLO_MINUTES:g} minutes): {'BREACHED' if result.slo_breached else 'MET'}",
+            f"Pipelining Time Saved: {result.pipeline_timeline['time_saved_seconds'] if result.pipeline_timeline else 'N/A'} seconds",
             f"Connectivity Test: {'PASSED' if result.connectivity_test_passed else 'FAILED'}",
-            f"Cleanup Completed: {'YES' if result.cleanup_completed else 'NO'}",
+            f"Cleanup Scheduled: {'YES' if result.cleanup_completed else 'NO'}",
             ""
         ]
 
@@ -531,6 +1472,62 @@ def send_notification(result: BackupRestoreTestResult):
                 ""
             ])
 
+        if result.pitr_results:
+            message_lines.append("=== Point-in-Time Restores ===")
+            message_lines.append(f"  Recovery point lag (RPO): {format_seconds(result.rpo_lag_seconds)}")
+            for point in result.pitr_results:
+                status_icon = "PASS" if point['success'] else "FAIL"
+                message_lines.append(
+                    f"  [{status_icon}] {point['target_time']} "
+                    f"restored in {format_seconds(point['restore_duration_seconds'])}"
+                    + (f" - {point['error_message']}" if point['error_message'] else "")
+                )
+            message_lines.append("")
+
+        if result.dr_results:
+            message_lines.append("=== DR Region Restores ===")
+            for outcome in result.dr_results:
+                status_icon = "PASS" if outcome['success'] else "FAIL"
+                copy_label = 'reused' if outcome['copy_reused'] else format_seconds(outcome['copy_seconds'])
+                message_lines.append(
+                    f"  [{status_icon}] {outcome['region']}: copy {copy_label}, "
+                    f"restore {format_seconds(outcome['restore_duration_seconds'])}"
+                    + (f" - {outcome['error_message']}" if outcome['error_message'] else "")
+                )
+            message_lines.append("")
+
+        export = result.export_verification
+        if export:
+            message_lines.append("=== Snapshot Export Verification ===")
+            message_lines.append(f"  Export: {export['uri'] or 'N/A'} ({export['status']})")
+            for table, summary in export.get('tables', {}).items():
+                message_lines.append(f"  {table}: {summary['rows']} rows in {summary['files']} files")
+            message_lines.append("")
+
+        probe = result.performance_probe
+        if probe:
+            message_lines.append("=== Performance Probe ===")
+            if probe.get('skipped'):
+                message_lines.append(f"  Skipped: {probe['reason']}")
+            else:
+                message_lines.append(
+                    f"  Time to {probe['target_fraction']:.0%} of baseline ({probe['baseline_source']}): "
+                    f"{format_seconds(probe['time_to_target_seconds'])}"
+                )
+                for window in probe['windows']:
+                    summary = ", ".join(
+                        f"{kind} {stats['ops_per_second']}/s p95 {stats['p95_ms']}ms"
+                        for kind, stats in window['kinds'].items()
+                    )
+                    message_lines.append(f"  +{window['elapsed_seconds']:.0f}s: {summary}")
+            message_lines.append("")
+
+        if result.phase_timings:
+            message_lines.append("=== Phase Timings ===")
+            for phase, seconds in result.phase_timings.items():
+                message_lines.append(f"  {phase}: {format_seconds(seconds)}")
+            message_lines.append("")
+
         if result.data_integrity_tests:
             message_lines.append("=== Data Integrity Tests ===")
             for test in result.data_integrity_tests:
@@ -540,6 +1537,8 @@ def send_notification(result: BackupRestoreTestResult):
         message = "\n".join(message_lines)
 
         subject = f"[{PROJECT_NAME}] Backup Restore Test {status} - {ENVIRONMENT}/{REGION_NAME}"
+        if result.slo_breached:
+            subject = f"[{PROJECT_NAME}] Backup Restore RTO SLO BREACHED - {ENVIRONMENT}/{REGION_NAME}"
 
         sns_client.publish(
             TopicArn=SNS_TOPIC_ARN,
@@ -567,30 +1566,46 @@ def send_notification(result: BackupRestoreTestResult):
         logger.error(f"Error sending notification: {str(e)}")
 
 
-def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+def run_restore_test(
+    result: BackupRestoreTestResult,
+    timer: PhaseTimer,
+    cluster_id: str,
+    event: Dict[str, Any]
+):
     """
-    Main Lambda handler for backup restoration testing.
+    Restore (or clone) one test cluster and verify it, filling in `result`.
 
-    Event can include:
-    - source: 'scheduled' or 'manual'
-    - test_type: 'full' or 'quick'
-    - cluster_identifier: Override the default cluster to test
+    result.test_instance_id is set before anything is created so the caller
+    can release the test cluster even when a later step raises.
     """
-    logger.info(f"Starting backup restoration test. Event: {json.dumps(event)}")
+    test_cluster_id = generate_test_cluster_identifier()
+    result.test_instance_id = test_cluster_id
 
-    result = BackupRestoreTestResult()
-    test_cluster_id = None
-
-    try:
-        # Get cluster identifier
-        cluster_id = event.get('cluster_identifier', RDS_CLUSTER_IDENTIFIER)
-
-        if not cluster_id:
-            raise ValueError("No RDS cluster identifier provided")
-
-        # Step 1: Get the latest snapshot
-        logger.info(f"Step 1: Finding latest snapshot for cluster {cluster_id}")
-        snapshot = get_latest_cluster_snapshot(cluster_id)
+    if result.test_type == 'quick':
+        # Steps 1-2: Copy-on-write clone of the live cluster
+        logger.info(f"Steps 1-2: Cloning cluster {cluster_id} for quick test")
+        result.restore_start_time = datetime.now(timezone.utc)
+        submit_time = clock.time()
+
+        with timer.phase('restore_submit'):
+            restored_cluster = clone_cluster(
+                cluster_id,
+                test_cluster_id,
+                DB_SUBNET_GROUP_NAME,
+                VPC_SECURITY_GROUP_IDS
+            )
+        if not restored_cluster:
+            raise RuntimeError("Failed to initiate cluster clone")
+    else:
+        # Step 1: Select a snapshot from the catalog
+        selection = event.get('snapshot_selection', 'latest')
+        logger.info(f"Step 1: Selecting {event.get('snapshot_identifier', selection)} snapshot for cluster {cluster_id}")
+        with timer.phase('snapshot_lookup'):
+            catalog = SnapshotCatalog(cluster_id).load()
+            if event.get('snapshot_identifier'):
+                snapshot = catalog.get(event['snapshot_identifier'])
+            else:
+                snapshot = select_snapshot(catalog, selection)
 
         if not snapshot:
             raise ValueError(f"No snapshots found for cluster {cluster_id}")
@@ -600,36 +1615,37 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
         # Step 2: Restore from snapshot
         logger.info("Step 2: Restoring cluster from snapshot")
-        test_cluster_id = generate_test_cluster_identifier()
-        result.test_instance_id = test_cluster_id
         result.restore_start_time = datetime.now(timezone.utc)
-
-        if not restore_cluster_from_snapshot(
-            result.snapshot_id,
-            test_cluster_id,
-            DB_SUBNET_GROUP_NAME,
-            VPC_SECURITY_GROUP_IDS
-        ):
+        submit_time = clock.time()
+
+        with timer.phase('restore_submit'):
+            restored_cluster = restore_cluster_from_snapshot(
+                snapshot,
+                test_cluster_id,
+                DB_SUBNET_GROUP_NAME,
+                VPC_SECURITY_GROUP_IDS
+            )
+        if not restored_cluster:
             raise RuntimeError("Failed to initiate cluster restoration")
 
-        # Step 3: Wait for cluster to be available
-        logger.info("Step 3: Waiting for cluster to become available")
-        if not wait_for_cluster_available(test_cluster_id, max_wait_minutes=MAX_WAIT_MINUTES):
-            raise RuntimeError("Cluster did not become available within timeout")
-
-        # Step 4: Create and wait for instance
-        logger.info("Step 4: Creating test instance")
-        if not create_test_instance(test_cluster_id):
-            raise RuntimeError("Failed to create test instance")
-
-        if not wait_for_instance_available(test_cluster_id, max_wait_minutes=30):
-            raise RuntimeError("Instance did not become available within timeout")
-
-        result.restore_end_time = datetime.now(timezone.utc)
-        result.restore_duration_minutes = int(
-            (result.restore_end_time - result.restore_start_time).total_seconds() / 60
-        )
-
+    # Steps 3-4: Create the test instance as soon as the cluster exists and
+    # wait for both resources together
+    logger.info("Steps 3-4: Provisioning test instance alongside cluster restore")
+    timeline = provision_test_cluster_pipelined(
+        test_cluster_id,
+        restored_cluster['Engine'],
+        max_wait_minutes=MAX_WAIT_MINUTES,
+        start_time=submit_time
+    )
+    result.pipeline_timeline = timeline.to_dict()
+    timer.record('cluster_available', timeline.cluster_available - timeline.start)
+    timer.record('instance_available', timeline.instance_available - timeline.instance_submitted)
+
+    result.restore_end_time = datetime.now(timezone.utc)
+    result.restore_duration_seconds = round(timeline.total_seconds, 1)
+    result.restore_duration_minutes = round(timeline.total_seconds / 60, 2)
+
+    with timer.phase('verification'):
         # Step 5: Test connectivity
         logger.info("Step 5: Testing database connectivity")
         result.connectivity_test_passed = test_database_connectivity(test_cluster_id)
@@ -641,11 +1657,463 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         logger.info("Step 6: Running data integrity tests")
         result.data_integrity_tests = run_data_integrity_tests(test_cluster_id, TEST_QUERIES)
 
-        # Check if all integrity tests passed
-        all_passed = all(t.get('passed', False) for t in result.data_integrity_tests)
+    # Step 6b: Measure cold-read performance while storage hydrates
+    if event.get('performance_probe', PERF_PROBE_ENABLED):
+        logger.info("Step 6b: Running post-restore performance probe")
+        with timer.phase('performance_probe'):
+            result.performance_probe = run_performance_probe(test_cluster_id, restored_cluster['Engine'])
+
+    # Check if all integrity tests passed
+    all_passed = all(t.get('passed', False) for t in result.data_integrity_tests)
+
+    if not all_passed:
+        logger.warning("Some data integrity tests failed")
+
+
+def pitr_target_times(earliest: datetime, latest: datetime, points: int) -> List[datetime]:
+    """
+    Evenly spaced restore targets across the restorable window.
+
+    The first target sits one step after the earliest restorable time and
+    the last one at the latest restorable time, so the oldest retained logs
+    and the most recent ones are both exercised.
+    """
+    if points <= 0 or latest <= earliest:
+        return []
+    step = (latest - earliest) / points
+    return [earliest + step * (i + 1) for i in range(points)]
+
+
+def verify_point_in_time(
+    cluster_id: str,
+    target_time: datetime,
+    index: int,
+    restore_type: str = 'copy-on-write'
+) -> Dict[str, Any]:
+    """Clone the cluster at `target_time`, verify it and release it to the reaper"""
+    test_cluster_id = generate_test_cluster_identifier(suffix=f"-p{index}")
+    point = {
+        'target_time': target_time.isoformat(),
+        'test_cluster_id': test_cluster_id,
+        'success': False,
+        'restore_duration_seconds': None,
+        'connectivity_test_passed': False,
+        'integrity_passed': False,
+        'error_message': None
+    }
+
+    try:
+        submit_time = clock.time()
+        restored_cluster = clone_cluster(
+            cluster_id,
+            test_cluster_id,
+            DB_SUBNET_GROUP_NAME,
+            VPC_SECURITY_GROUP_IDS,
+            restore_to_time=target_time,
+            restore_type=restore_type
+        )
+        if not restored_cluster:
+            raise RuntimeError("Failed to initiate point-in-time restore")
+
+        timeline = provision_test_cluster_pipelined(
+            test_cluster_id,
+            restored_cluster['Engine'],
+            max_wait_minutes=MAX_WAIT_MINUTES,
+            start_time=submit_time
+        )
+        point['restore_duration_seconds'] = round(timeline.total_seconds, 1)
+
+        point['connectivity_test_passed'] = test_database_connectivity(test_cluster_id)
+        if not point['connectivity_test_passed']:
+            raise RuntimeError("Database connectivity test failed")
+
+        checks = run_data_integrity_tests(test_cluster_id, TEST_QUERIES)
+        point['integrity_passed'] = all(t.get('passed', False) for t in checks)
+        point['success'] = True
+
+    except Exception as e:
+        point['error_message'] = str(e)
+        logger.error(f"Point-in-time restore to {target_time.isoformat()} failed: {str(e)}")
+
+    finally:
+        if CLEANUP_AFTER_TEST:
+            release_test_resources(test_cluster_id)
+        else:
+            keep_test_resources(test_cluster_id)
+
+    return point
 
-        if not all_passed:
-            logger.warning("Some data integrity tests failed")
+
+def _export_marker_key(uri: str) -> Tuple[str, str]:
+    bucket, _, prefix = uri[len('s3://'):].partition('/')
+    return bucket, f"{prefix}/{VERIFIED_MARKER}"
+
+
+def export_already_verified(uri: str) -> bool:
+    """Whether a previous run already verified this export"""
+    bucket, key = _export_marker_key(uri)
+    try:
+        s3_client.head_object(Bucket=bucket, Key=key)
+        return True
+    except Exception:
+        return False
+
+
+def mark_export_verified(uri: str, checks: List[Dict[str, Any]]):
+    bucket, key = _export_marker_key(uri)
+    try:
+        s3_client.put_object(
+            Bucket=bucket,
+            Key=key,
+            Body=json.dumps({'verified_at': datetime.now(timezone.utc).isoformat(), 'checks': checks}, default=str),
+            ContentType='application/json'
+        )
+    except Exception as e:
+        logger.error(f"Error writing export verification marker: {str(e)}")
+
+
+def wait_for_export(task_id: str, max_wait_minutes: int) -> Dict[str, Any]:
+    """Poll an export task until it completes, fails or the wait budget runs out"""
+    deadline = clock.time() + max_wait_minutes * 60
+    while True:
+        task = rds_client.describe_export_tasks(ExportTaskIdentifier=task_id)['ExportTasks'][0]
+        status = task['Status']
+        if status == 'COMPLETE' or status in EXPORT_FAILED_STATUSES:
+            return task
+        if clock.time() >= deadline:
+            return task
+        logger.info(f"Export task {task_id}: {status} ({task.get('PercentProgress', 0)}%)")
+        clock.sleep(30)
+
+
+def run_export_verification(
+    result: BackupRestoreTestResult,
+    timer: PhaseTimer,
+    cluster_id: str,
+    event: Dict[str, Any]
+):
+    """
+    Verify a snapshot through an S3 Parquet export instead of a restore.
+
+    Exports usually outlast a single invocation, so the export task ID is
+    derived from the snapshot: a run that finds the export still in progress
+    reports it as pending and the next scheduled run resumes waiting on the
+    same task. A marker object stops a finished export being verified twice.
+    An 'export_uri' in the event (an S3 URI or a local directory) skips the
+    export and verifies existing files.
+    """
+    verification = {'status': 'pending', 'task_id': None, 'uri': event.get('export_uri')}
+    result.export_verification = verification
+    reference_time = None
+
+    if not verification['uri']:
+        if not (EXPORT_BUCKET and EXPORT_IAM_ROLE_ARN and EXPORT_KMS_KEY_ID):
+            raise ValueError("Snapshot export is not configured (bucket, IAM role and KMS key required)")
+
+        selection = event.get('snapshot_selection', 'latest')
+        with timer.phase('snapshot_lookup'):
+            snapshot = select_snapshot(SnapshotCatalog(cluster_id).load(), selection)
+        if not snapshot:
+            raise ValueError(f"No snapshots found for cluster {cluster_id}")
+
+        result.snapshot_id = snapshot['DBClusterSnapshotIdentifier']
+        result.snapshot_create_time = snapshot['SnapshotCreateTime']
+        reference_time = snapshot['SnapshotCreateTime']
+
+        task_id = export_task_identifier(f"{PROJECT_NAME}-{ENVIRONMENT}", result.snapshot_id)
+        verification['task_id'] = task_id
+
+        with timer.phase('export_wait'):
+            task = start_or_resume_export(
+                rds_client,
+                snapshot['DBClusterSnapshotArn'],
+                task_id,
+                EXPORT_BUCKET,
+                EXPORT_PREFIX,
+                EXPORT_IAM_ROLE_ARN,
+                EXPORT_KMS_KEY_ID,
+                EXPORT_ONLY or None
+            )
+            task = wait_for_export(task_id, int(event.get('max_wait_minutes', EXPORT_MAX_WAIT_MINUTES)))
+
+        verification['uri'] = export_uri(task)
+        if task['Status'] in EXPORT_FAILED_STATUSES:
+            raise RuntimeError(f"Export task {task_id} {task['Status']}: {task.get('FailureCause', 'unknown cause')}")
+        if task['Status'] != 'COMPLETE':
+            logger.info(f"Export task {task_id} still {task['Status']}; the next run resumes it")
+            return
+
+        if export_already_verified(verification['uri']) and not event.get('force'):
+            logger.info(f"Export {verification['uri']} was already verified")
+            verification['status'] = 'already_verified'
+            return
+
+    with timer.phase('export_scan'):
+        stats = scan_export(verification['uri'], EXPORT_READERS, EXPORT_ONLY or None)
+    verification['tables'] = summarize_tables(stats)
+    result.data_integrity_tests = check_expectations(
+        stats,
+        event.get('expectations', EXPORT_EXPECTATIONS),
+        reference_time
+    )
+    verification['status'] = 'verified'
+
+    if verification['task_id']:
+        mark_export_verified(verification['uri'], result.data_integrity_tests)
+
+    failed = [t['test'] for t in result.data_integrity_tests if not t['passed']]
+    if failed:
+        raise RuntimeError(f"Snapshot export verification failed {len(failed)} checks: {', '.join(failed[:5])}")
+
+
+def run_pitr_sweep(result: BackupRestoreTestResult, cluster_id: str, event: Dict[str, Any]):
+    """
+    Restore clones at several times across the retention window in parallel.
+
+    The recovery point lag (now minus the cluster's LatestRestorableTime) is
+    the real RPO: it is how much recent data a restore would lose right now.
+    All parallel restores share the status watcher, so polling cost does not
+    grow with the number of targets.
+    """
+    points = int(event.get('pitr_points', PITR_SWEEP_POINTS))
+    max_concurrency = max(1, int(event.get('max_concurrency', PITR_MAX_CONCURRENCY)))
+    restore_type = event.get('restore_type', PITR_RESTORE_TYPE)
+
+    response = rds_client.describe_db_clusters(DBClusterIdentifier=cluster_id)
+    source = response['DBClusters'][0]
+    earliest = source['EarliestRestorableTime']
+    latest = source['LatestRestorableTime']
+
+    result.rpo_lag_seconds = round((datetime.now(timezone.utc) - latest).total_seconds(), 1)
+    logger.info(
+        f"Restorable window {earliest.isoformat()} - {latest.isoformat()}, "
+        f"recovery point lag {result.rpo_lag_seconds}s"
+    )
+
+    targets = pitr_target_times(earliest, latest, points)
+    if not targets:
+        raise ValueError(f"Cluster {cluster_id} has no restorable window to sweep")
+
+    result.restore_start_time = datetime.now(timezone.utc)
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, len(targets))) as executor:
+        result.pitr_results = list(executor.map(
+            lambda item: verify_point_in_time(cluster_id, item[1], item[0], restore_type),
+            enumerate(targets, start=1)
+        ))
+    result.restore_end_time = datetime.now(timezone.utc)
+
+    failed = [p['target_time'] for p in result.pitr_results if not p['success']]
+    if failed:
+        raise RuntimeError(f"Point-in-time restore failed for {len(failed)} of {len(targets)} targets: {', '.join(failed)}")
+
+
+def find_or_copy_dr_snapshot(
+    source_snapshot: Dict[str, Any],
+    cluster_id: str,
+    region_config: Dict[str, Any],
+    client: Any
+) -> Dict[str, Any]:
+    """
+    Return a snapshot of the cluster in the DR region, copying one if needed.
+
+    An existing copy (ours or one made by AWS Backup) is reused when it is
+    no more than DR_COPY_MAX_AGE_HOURS older than the local source snapshot.
+    Otherwise the source snapshot is copied and the copy is waited for.
+    Returns {'snapshot': ..., 'copy_seconds': ..., 'reused': ...}.
+    """
+    catalog = SnapshotCatalog(cluster_id, client=client).load()
+    existing = catalog.latest()
+    max_lag = timedelta(hours=DR_COPY_MAX_AGE_HOURS)
+
+    if existing and source_snapshot['SnapshotCreateTime'] - existing['SnapshotCreateTime'] <= max_lag:
+        logger.info(f"Reusing DR snapshot {existing['DBClusterSnapshotIdentifier']} in {region_config['region']}")
+        return {'snapshot': existing, 'copy_seconds': 0.0, 'reused': True}
+
+    copy_id = f"{cluster_id}-dr-{source_snapshot['SnapshotCreateTime'].strftime('%Y%m%d%H%M')}"
+    copy_start = clock.time()
+    params = {
+        'SourceDBClusterSnapshotIdentifier': source_snapshot['DBClusterSnapshotArn'],
+        'TargetDBClusterSnapshotIdentifier': copy_id,
+        'SourceRegion': SOURCE_REGION,
+        'CopyTags': False,
+        'Tags': [
+            {'Key': 'Purpose', 'Value': 'DRSnapshotCopy'},
+            {'Key': 'Project', 'Value': PROJECT_NAME},
+            {'Key': 'Environment', 'Value': ENVIRONMENT},
+            {'Key': 'CreatedBy', 'Value': 'backup-restore-test-lambda'}
+        ]
+    }
+    if region_config.get('kms_key_id'):
+        params['KmsKeyId'] = region_config['kms_key_id']
+
+    logger.info(f"Copying snapshot {source_snapshot['DBClusterSnapshotIdentifier']} to {region_config['region']} as {copy_id}")
+    try:
+        client.copy_db_cluster_snapshot(**params)
+    except client.exceptions.DBClusterSnapshotAlreadyExistsFault:
+        logger.info(f"DR copy {copy_id} already in progress, waiting for it")
+
+    max_wait_seconds = DR_COPY_WAIT_MINUTES * 60
+    while clock.time() - copy_start < max_wait_seconds:
+        response = client.describe_db_cluster_snapshots(DBClusterSnapshotIdentifier=copy_id)
+        snapshot = response['DBClusterSnapshots'][0]
+        if snapshot['Status'] == 'available':
+            return {'snapshot': snapshot, 'copy_seconds': round(clock.time() - copy_start, 1), 'reused': False}
+        if snapshot['Status'] in ('failed', 'error'):
+            raise RuntimeError(f"Snapshot copy {copy_id} failed with status: {snapshot['Status']}")
+        clock.sleep(30)
+
+    raise RuntimeError(f"Snapshot copy {copy_id} did not complete within {DR_COPY_WAIT_MINUTES} minutes")
+
+
+def run_dr_region_test(
+    source_snapshot: Dict[str, Any],
+    cluster_id: str,
+    region_config: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Copy (or reuse) the snapshot in a DR region, restore it there, verify and release it"""
+    region = region_config['region']
+    watcher = get_region_watcher(region)
+    test_cluster_id = generate_test_cluster_identifier(suffix=f"-{region_code(region)}")
+    outcome = {
+        'region': region,
+        'test_cluster_id': test_cluster_id,
+        'snapshot_id': None,
+        'copy_reused': False,
+        'copy_seconds': None,
+        'restore_duration_seconds': None,
+        'connectivity_test_passed': False,
+        'integrity_passed': False,
+        'success': False,
+        'error_message': None
+    }
+    restore_submitted = False
+
+    try:
+        copy = find_or_copy_dr_snapshot(source_snapshot, cluster_id, region_config, watcher.client)
+        outcome['snapshot_id'] = copy['snapshot']['DBClusterSnapshotIdentifier']
+        outcome['copy_reused'] = copy['reused']
+        outcome['copy_seconds'] = copy['copy_seconds']
+
+        submit_time = clock.time()
+        restored_cluster = restore_cluster_from_snapshot(
+            copy['snapshot'],
+            test_cluster_id,
+            region_config.get('db_subnet_group', DB_SUBNET_GROUP_NAME),
+            region_config.get('security_group_ids', []),
+            client=watcher.client
+        )
+        if not restored_cluster:
+            raise RuntimeError(f"Failed to initiate cluster restoration in {region}")
+        restore_submitted = True
+
+        timeline = provision_test_cluster_pipelined(
+            test_cluster_id,
+            restored_cluster['Engine'],
+            max_wait_minutes=MAX_WAIT_MINUTES,
+            start_time=submit_time,
+            watcher=watcher
+        )
+        outcome['restore_duration_seconds'] = round(timeline.total_seconds, 1)
+
+        outcome['connectivity_test_passed'] = test_database_connectivity(test_cluster_id, watcher)
+        if not outcome['connectivity_test_passed']:
+            raise RuntimeError("Database connectivity test failed")
+
+        checks = run_data_integrity_tests(test_cluster_id, TEST_QUERIES, watcher)
+        outcome['integrity_passed'] = all(t.get('passed', False) for t in checks)
+        outcome['success'] = True
+
+    except Exception as e:
+        outcome['error_message'] = str(e)
+        logger.error(f"DR restore test in {region} failed: {str(e)}")
+
+    finally:
+        if restore_submitted:
+            if CLEANUP_AFTER_TEST:
+                release_test_resources(test_cluster_id, watcher)
+            else:
+                keep_test_resources(test_cluster_id, watcher)
+
+    return outcome
+
+
+def run_dr_test(result: BackupRestoreTestResult, cluster_id: str, event: Dict[str, Any]):
+    """
+    Test restores of the latest local snapshot in every DR region concurrently.
+
+    Copy time and restore time are reported separately per region, since
+    they fail for different reasons (cross-region copy lag versus restore
+    capacity in the DR region).
+    """
+    regions = event.get('dr_regions')
+    configs = [c for c in DR_REGIONS if not regions or c['region'] in regions]
+    if not configs:
+        raise ValueError("No DR regions configured")
+
+    source_snapshot = SnapshotCatalog(cluster_id).load().latest()
+    if not source_snapshot:
+        raise ValueError(f"No snapshots found for cluster {cluster_id}")
+
+    result.snapshot_id = source_snapshot['DBClusterSnapshotIdentifier']
+    result.snapshot_create_time = source_snapshot['SnapshotCreateTime']
+    result.restore_start_time = datetime.now(timezone.utc)
+
+    with ThreadPoolExecutor(max_workers=len(configs)) as executor:
+        result.dr_results = list(executor.map(
+            lambda config: run_dr_region_test(source_snapshot, cluster_id, config),
+            configs
+        ))
+    result.restore_end_time = datetime.now(timezone.utc)
+
+    failed = [r['region'] for r in result.dr_results if not r['success']]
+    if failed:
+        raise RuntimeError(f"DR restore test failed in: {', '.join(failed)}")
+
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Main Lambda handler for backup restoration testing.
+
+    Event can include:
+    - source: 'scheduled' or 'manual'
+    - test_type: 'full' (snapshot restore), 'quick' (copy-on-write clone),
+      'pitr_sweep' (point-in-time clones across the retention window)
+      'dr' (cross-region snapshot copy and restore) or 'export'
+      (snapshot export to S3 with Parquet verification, no restore)
+    - cluster_identifier: Override the default cluster to test
+    - snapshot_selection: 'latest' (default), 'oldest' or 'random'
+    - snapshot_identifier: Restore this snapshot instead (set by the scheduler)
+    - pitr_points, max_concurrency, restore_type: PITR sweep settings
+    - dr_regions: Subset of the configured DR regions to test
+    - export_uri, expectations, force: export verification settings
+    """
+    logger.info(f"Starting backup restoration test. Event: {json.dumps(event)}")
+
+    result = BackupRestoreTestResult()
+    timer = PhaseTimer()
+
+    try:
+        # Get cluster identifier
+        cluster_id = event.get('cluster_identifier', RDS_CLUSTER_IDENTIFIER)
+
+        if not cluster_id:
+            raise ValueError("No RDS cluster identifier provided")
+
+        test_type = event.get('test_type', 'full')
+        if test_type not in ('full', 'quick', 'pitr_sweep', 'dr', 'export'):
+            raise ValueError(f"Unknown test type: {test_type}")
+
+        result.test_type = test_type
+        result.source_cluster_id = cluster_id
+
+        if test_type == 'pitr_sweep':
+            run_pitr_sweep(result, cluster_id, event)
+        elif test_type == 'dr':
+            run_dr_test(result, cluster_id, event)
+        elif test_type == 'export':
+            run_export_verification(result, timer, cluster_id, event)
+        else:
+            run_restore_test(result, timer, cluster_id, event)
 
         result.success = True
         logger.info("Backup restoration test completed successfully")
@@ -656,22 +2124,180 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         logger.error(f"Backup restoration test failed: {str(e)}")
 
     finally:
-        # Step 7: Cleanup
+        # Step 7: Hand test resources over to the reaper
+        test_cluster_id = result.test_instance_id
         if test_cluster_id and CLEANUP_AFTER_TEST:
-            logger.info("Step 7: Cleaning up test resources")
-            result.cleanup_completed = cleanup_test_resources(test_cluster_id)
+            logger.info("Step 7: Releasing test resources for cleanup")
+            with timer.phase('cleanup'):
+                result.cleanup_completed = release_test_resources(test_cluster_id)
         elif test_cluster_id:
             logger.warning(f"Cleanup disabled. Test cluster {test_cluster_id} was NOT deleted.")
+            keep_test_resources(test_cluster_id)
             result.cleanup_completed = False
+        elif result.pitr_results or result.dr_results:
+            result.cleanup_completed = CLEANUP_AFTER_TEST
 
-        # Publish metrics
-        publish_metrics(result)
+        # Record phase timings and evaluate the RTO SLO against history. An
+        # export that is still running (or already verified) has nothing to
+        # report until a later run completes it.
+        result.phase_timings = timer.to_dict()
+        result.run_duration_seconds = round(timer.elapsed(), 1)
+        export_status = (result.export_verification or {}).get('status')
+        pending = result.success and export_status in ('pending', 'already_verified')
 
-        # Send notification
-        if SNS_TOPIC_ARN:
-            send_notification(result)
+        if not pending:
+            record_run_history(result)
+
+            # Publish metrics
+            publish_metrics(result)
+
+            # Send notification
+            if SNS_TOPIC_ARN:
+                send_notification(result)
 
     return {
-        'statusCode': 200 if result.success else 500,
+        'statusCode': (202 if pending else 200) if result.success else 500,
         'body': json.dumps(result.to_dict(), default=str)
     }
+
+
+def reaper_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Scheduled handler that deletes Purpose=BackupRestoreTest resources.
+
+    The local region and every configured DR region are reaped. In DR
+    regions, Purpose=DRSnapshotCopy snapshots older than
+    DR_COPY_RETENTION_HOURS are deleted as well.
+
+    Event can include:
+    - max_age_minutes: Reap unreleased test clusters older than this
+    """
+    max_age_minutes = int(event.get('max_age_minutes', REAPER_MAX_AGE_MINUTES))
+    regions = [None] + [config['region'] for config in DR_REGIONS]
+
+    # Leave a margin before the Lambda timeout so the summary is always returned
+    if context is not None and hasattr(context, 'get_remaining_time_in_millis'):
+        deadline = clock.time() + context.get_remaining_time_in_millis() / 1000 - 15
+    else:
+        deadline = clock.time() + 240
+
+    try:
+        summary = {}
+        for region in regions:
+            client = get_region_watcher(region).client
+            summary[region or 'local'] = reap_test_resources(
+                max_age_minutes,
+                deadline,
+                max_workers=REAPER_MAX_WORKERS,
+                client=client
+            )
+            if region:
+                summary[region]['dr_snapshot_copies'] = reap_dr_snapshot_copies(DR_COPY_RETENTION_HOURS, deadline, client)
+        return {
+            'statusCode': 200,
+            'body': json.dumps(summary)
+        }
+    except Exception as e:
+        logger.error(f"Reaper run failed: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps({'error': str(e)})
+        }
+
+
+def count_running_restores(client: Any = None) -> int:
+    """This deployment's test clusters that have not been released to the reaper yet"""
+    client = client or rds_client
+    running = 0
+    for page in client.get_paginator('describe_db_clusters').paginate():
+        for cluster in page.get('DBClusters', []):
+            if (
+                is_own_test_cluster(cluster)
+                and not _tag_value(cluster, 'ReapAfter')
+                and cluster.get('Status') != 'deleting'
+            ):
+                running += 1
+    return running
+
+
+def plan_restores(now: Optional[datetime] = None, client: Any = None) -> Dict[str, Any]:
+    """
+    Score every eligible cluster and snapshot and pick the most overdue
+    targets within the concurrency and monthly cost budgets.
+    """
+    client = client or rds_client
+    now = now or datetime.now(timezone.utc)
+
+    clusters = []
+    for page in client.get_paginator('describe_db_clusters').paginate():
+        clusters.extend(c for c in page.get('DBClusters', []) if is_eligible_cluster(c))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        catalogs = list(executor.map(
+            lambda cluster: SnapshotCatalog(cluster['DBClusterIdentifier'], client).load(),
+            clusters
+        ))
+    snapshots_by_cluster = {catalog.cluster_identifier: list(catalog) for catalog in catalogs}
+
+    start_of_month = month_start(now)
+    digest = HistoryDigest.from_store(open_history_store(s3_client), lookback_start(now), start_of_month)
+
+    scheduler = PriorityScheduler(MAX_CONCURRENT_RESTORES, RESTORE_MONTHLY_BUDGET_USD, RESTORE_HOURLY_COST_USD)
+    for target in build_targets(clusters, snapshots_by_cluster, digest, now, RESTORE_DEFAULT_RUN_HOURS):
+        scheduler.push(target)
+
+    month_spend = digest.month_run_hours * RESTORE_HOURLY_COST_USD
+    plan = scheduler.select(count_running_restores(client), month_spend)
+    plan['eligible_clusters'] = len(clusters)
+    plan['month_spend'] = round(month_spend, 2)
+    return plan
+
+
+def scheduler_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Scheduled handler that dispatches restore tests to the most overdue
+    clusters and snapshots across the fleet.
+
+    Each selected target is started as an asynchronous invocation of the
+    test function with test_type 'full' and a fixed snapshot_identifier.
+
+    Event can include:
+    - dry_run: Plan without dispatching
+    """
+    try:
+        plan = plan_restores()
+        dispatched = []
+        for target in plan['selected']:
+            if event.get('dry_run') or not TEST_FUNCTION_NAME:
+                continue
+            lambda_client.invoke(
+                FunctionName=TEST_FUNCTION_NAME,
+                InvocationType='Event',
+                Payload=json.dumps({
+                    'source': 'scheduler',
+                    'test_type': 'full',
+                    'cluster_identifier': target.cluster_id,
+                    'snapshot_identifier': target.snapshot_id
+                }).encode('utf-8')
+            )
+            dispatched.append(target.cluster_id)
+
+        logger.info(
+            f"Scheduler: {len(plan['selected'])} selected, {len(dispatched)} dispatched, "
+            f"{len(plan['skipped'])} over budget, {plan['not_due']} not due, {plan['queued']} still queued, "
+            f"{plan['eligible_clusters']} eligible clusters"
+        )
+        return {
+            'statusCode': 200,
+            'body': json.dumps(dict(
+                plan,
+                selected=[target.to_dict() for target in plan['selected']],
+                dispatched=dispatched
+            ), default=str)
+        }
+    except Exception as e:
+        logger.error(f"Scheduler run failed: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps({'error': str(e)})
+        }
@@ -0,0 +1,311 @@
+"""
+Backup Restoration Test Performance Probe
+
+A restored Aurora cluster reports "available" long before it performs like
+production: its storage volume is hydrated lazily from S3 as blocks are
+first read. This probe runs a configurable read workload against the
+restored cluster and measures how long it takes to reach a target fraction
+of baseline performance, i.e. the real time to full service.
+
+Workload configuration (PERF_PROBE_WORKLOAD, JSON):
+
+    {
+      "seq_scans": [{"table": "patients"}],
+      "point_lookups": [{"table": "patients", "key_column": "id",
+                         "min_key": 1, "max_key": 5000000}],
+      "concurrency": 2
+    }
+
+The workload runs in fixed windows; each window records throughput and
+latency percentiles per workload kind. Baseline throughput comes from
+PERF_PROBE_BASELINE ({"seq_scan": ops/s, "point_lookup": ops/s}) when set,
+otherwise from the steady state reached at the end of the probe.
+
+Database drivers (psycopg2 for aurora-postgresql, pymysql for aurora-mysql)
+are not part of the Lambda runtime and are provided by a Lambda layer; the
+probe is skipped when the driver for the engine is not available.
+
+Author: Unified Health Platform Team
+"""
+
+import re
+import time
+import random
+import logging
+import threading
+from typing import Dict, Any, List, Optional, Callable
+
+from restore_history import percentile
+
+try:
+    import psycopg2
+except ImportError:  # provided by a Lambda layer
+    psycopg2 = None
+
+try:
+    import pymysql
+except ImportError:  # provided by a Lambda layer
+    pymysql = None
+
+logger = logging.getLogger()
+
+IDENTIFIER_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)?$')
+
+DEFAULT_PORTS = {'aurora-postgresql': 5432, 'aurora-mysql': 3306, 'aurora': 3306}
+
+
+class ProbeQuery:
+    """One read in the workload: a SQL statement and a parameter generator"""
+
+    def __init__(self, kind: str, name: str, sql: str, params: Callable[[random.Random], tuple] = None):
+        self.kind = kind
+        self.name = name
+        self.sql = sql
+        self.params = params or (lambda rng: ())
+
+
+def _identifier(value: str) -> str:
+    """Validate a table/column name taken from configuration"""
+    if not isinstance(value, str) or not IDENTIFIER_PATTERN.match(value):
+        raise ValueError(f"Invalid identifier in probe workload: {value!r}")
+    return value
+
+
+def build_workload(config: Dict[str, Any], engine: str = 'aurora-postgresql') -> List[ProbeQuery]:
+    """Turn the workload configuration into probe queries for the engine"""
+    placeholder = '%s'  # psycopg2 and pymysql share the format paramstyle
+    queries = []
+
+    for scan in config.get('seq_scans', []):
+        table = _identifier(scan['table'])
+        queries.append(ProbeQuery('seq_scan', f"scan:{table}", f"SELECT count(*) FROM {table}"))
+
+    for lookup in config.get('point_lookups', []):
+        table = _identifier(lookup['table'])
+        column = _identifier(lookup.get('key_column', 'id'))
+        low = int(lookup.get('min_key', 1))
+        high = int(lookup['max_key'])
+        queries.append(ProbeQuery(
+            'point_lookup',
+            f"lookup:{table}.{column}",
+            f"SELECT * FROM {table} WHERE {column} = {placeholder}",
+            lambda rng, low=low, high=high: (rng.randint(low, high),)
+        ))
+
+    return queries
+
+
+def driver_available(engine: str) -> bool:
+    if engine == 'aurora-postgresql':
+        return psycopg2 is not None
+    return pymysql is not None
+
+
+def connection_factory(
+    engine: str,
+    host: str,
+    credentials: Dict[str, Any],
+    port: Optional[int] = None,
+    connect_timeout: int = 10
+) -> Callable[[], Any]:
+    """Return a zero-argument callable opening a DB-API connection to the cluster"""
+    port = port or int(credentials.get('port') or DEFAULT_PORTS.get(engine, 5432))
+    database = credentials.get('dbname') or credentials.get('database')
+
+    if engine == 'aurora-postgresql':
+        if psycopg2 is None:
+            raise RuntimeError("psycopg2 is not available; attach the database driver layer")
+
+        def connect():
+            conn = psycopg2.connect(
+                host=host,
+                port=port,
+                user=credentials['username'],
+                password=credentials['password'],
+                dbname=database or 'postgres',
+                connect_timeout=connect_timeout
+            )
+            conn.set_session(readonly=True, autocommit=True)
+            return conn
+        return connect
+
+    if pymysql is None:
+        raise RuntimeError("pymysql is not available; attach the database driver layer")
+
+    def connect():
+        return pymysql.connect(
+            host=host,
+            port=port,
+            user=credentials['username'],
+            password=credentials['password'],
+            database=database,
+            connect_timeout=connect_timeout,
+            autocommit=True
+        )
+    return connect
+
+
+class _WindowStats:
+    """Latencies and errors of one measurement window, per workload kind"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def summary(self, index: int, elapsed: float, seconds: float) -> Dict[str, Any]:
+        kinds = {}
+        for kind in sorted(set(self.latencies) | set(self.errors)):
+            latencies = self.latencies.get(kind, [])
+            kinds[kind] = {
+                'ops': len(latencies),
+                'ops_per_second': round(len(latencies) / seconds, 3) if seconds > 0 else 0.0,
+                'p50_ms': _ms(percentile(latencies, 50)),
+                'p95_ms': _ms(percentile(latencies, 95)),
+                'p99_ms': _ms(percentile(latencies, 99)),
+                'errors': self.errors.get(kind, 0)
+            }
+        return {'window': index, 'elapsed_seconds': round(elapsed, 1), 'kinds': kinds}
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+def steady_state_baseline(windows: List[Dict[str, Any]], tail: int = 2) -> Dict[str, float]:
+    """Best throughput per kind over the last `tail` windows of the probe"""
+    baseline: Dict[str, float] = {}
+    for window in windows[-tail:]:
+        for kind, stats in window['kinds'].items():
+            baseline[kind] = max(baseline.get(kind, 0.0), stats['ops_per_second'])
+    return baseline
+
+
+def time_to_target(
+    windows: List[Dict[str, Any]],
+    baseline: Dict[str, float],
+    target_fraction: float
+) -> Optional[float]:
+    """
+    Elapsed seconds at the end of the first window in which every workload
+    kind reached `target_fraction` of its baseline throughput, or None.
+    """
+    kinds = [kind for kind, value in baseline.items() if value > 0]
+    if not kinds:
+        return None
+    for window in windows:
+        if all(
+            window['kinds'].get(kind, {}).get('ops_per_second', 0.0) >= target_fraction * baseline[kind]
+            for kind in kinds
+        ):
+            return window['elapsed_seconds']
+    return None
+
+
+def run_probe(
+    connect: Callable[[], Any],
+    queries: List[ProbeQuery],
+    duration_seconds: float = 300,
+    window_seconds: float = 30,
+    concurrency: int = 2,
+    baseline: Optional[Dict[str, float]] = None,
+    target_fraction: float = 0.8,
+    clock: Any = time,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Run the read workload in windows and report hydration progress.
+
+    `concurrency` workers per workload kind each hold their own connection
+    and cycle through that kind's queries. When an explicit baseline is
+    given the probe stops as soon as the target has been held for two
+    consecutive windows.
+    """
+    by_kind: Dict[str, List[ProbeQuery]] = {}
+    for query in queries:
+        by_kind.setdefault(query.kind, []).append(query)
+
+    start = clock.time()
+    stop = threading.Event()
+    lock = threading.Lock()
+    current = {'stats': _WindowStats()}
+    fatal: List[str] = []
+
+    def worker(kind: str, worker_index: int):
+        rng = random.Random(seed * 1000 + worker_index)
+        try:
+            conn = connect()
+        except Exception as e:
+            with lock:
+                fatal.append(f"{kind}: {str(e)}")
+                current['stats'].errors[kind] = current['stats'].errors.get(kind, 0) + 1
+            return
+        try:
+            cursor = conn.cursor()
+            position = worker_index
+            while not stop.is_set():
+                query = by_kind[kind][position % len(by_kind[kind])]
+                position += 1
+                began = time.perf_counter()
+                try:
+                    cursor.execute(query.sql, query.params(rng))
+                    cursor.fetchall()
+                    latency = time.perf_counter() - began
+                    with lock:
+                        current['stats'].latencies.setdefault(kind, []).append(latency)
+                except Exception as e:
+                    logger.warning(f"Probe query {query.name} failed: {str(e)}")
+                    with lock:
+                        current['stats'].errors[kind] = current['stats'].errors.get(kind, 0) + 1
+        finally:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    threads = [
+        threading.Thread(target=worker, args=(kind, i), daemon=True)
+        for kind in by_kind
+        for i in range(max(1, concurrency))
+    ]
+    for thread in threads:
+        thread.start()
+
+    windows = []
+    consecutive_at_target = 0
+    window_start = start
+    try:
+        while clock.time() - start < duration_seconds:
+            clock.sleep(min(window_seconds, duration_seconds - (clock.time() - start)))
+            now = clock.time()
+            with lock:
+                stats, current['stats'] = current['stats'], _WindowStats()
+            windows.append(stats.summary(len(windows), now - start, now - window_start))
+            window_start = now
+
+            if fatal and len(fatal) == len(threads):
+                break
+            if baseline:
+                reached = time_to_target(windows[-1:], baseline, target_fraction) is not None
+                consecutive_at_target = consecutive_at_target + 1 if reached else 0
+                if consecutive_at_target >= 2:
+                    break
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join(timeout=window_seconds)
+
+    baseline_source = 'configured' if baseline else 'steady_state'
+    effective_baseline = baseline or steady_state_baseline(windows)
+    seconds_to_target = time_to_target(windows, effective_baseline, target_fraction)
+
+    return {
+        'completed': bool(windows) and not (fatal and len(fatal) == len(threads)),
+        'duration_seconds': round(clock.time() - start, 1),
+        'window_seconds': window_seconds,
+        'target_fraction': target_fraction,
+        'baseline_source': baseline_source,
+        'baseline_ops_per_second': effective_baseline,
+        'time_to_target_seconds': seconds_to_target,
+        'connection_errors': fatal,
+        'windows': windows
+    }
@@ -0,0 +1,483 @@
+"""
+Backup Restoration Test History Store
+
+Append-only history of restore test runs used for RTO trend and SLO tracking
+and for querying past results. Each run is stored as one compact NDJSON
+record holding the timing summary and the full test result:
+
+- S3: one immutable object per run, partitioned by date, cluster and status
+  (<prefix>/dt=YYYY-MM-DD/cluster=<id>/status=<pass|fail>/<time>-<id>.ndjson).
+  Appends never rewrite existing data, time-bounded reads skip older
+  partitions, and cluster/status queries list only matching prefixes
+  without fetching other objects.
+- Local: a single NDJSON file, used for testing and ad-hoc analysis
+
+The trend report streams records once and keeps only per-cluster counters
+and fixed-size samples, so it scales to thousands of runs.
+
+Usage:
+    python restore_history.py --path history.ndjson --days 90
+    python restore_history.py --bucket <bucket> --cluster <id> --json
+
+Author: Unified Health Platform Team
+"""
+
+import os
+import json
+import math
+import uuid
+import random
+import logging
+import argparse
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional, Iterator
+
+logger = logging.getLogger()
+
+
+def _compact(record: Dict[str, Any]) -> str:
+    return json.dumps(record, separators=(',', ':'), default=str)
+
+
+def _parse_ts(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+
+def record_status(record: Dict[str, Any]) -> str:
+    return 'pass' if record.get('success') else 'fail'
+
+
+def _matches(
+    record: Dict[str, Any],
+    since: Optional[datetime],
+    cluster_id: Optional[str],
+    status: Optional[str]
+) -> bool:
+    if cluster_id and record.get('cluster') != cluster_id:
+        return False
+    if status and record_status(record) != status:
+        return False
+    if since and _parse_ts(record['ts']) < since:
+        return False
+    return True
+
+
+class HistoryStore(ABC):
+    """Base class for run history backends"""
+
+    @abstractmethod
+    def append(self, record: Dict[str, Any]):
+        """Store one run record"""
+
+    @abstractmethod
+    def iter_records(
+        self,
+        since: Optional[datetime] = None,
+        cluster_id: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Records newer than `since`, optionally for one cluster and status ('pass'/'fail')"""
+
+
+class LocalHistoryStore(HistoryStore):
+    """NDJSON file store for testing and local analysis"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def append(self, record: Dict[str, Any]):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(_compact(record) + '\n')
+
+    def iter_records(
+        self,
+        since: Optional[datetime] = None,
+        cluster_id: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if _matches(record, since, cluster_id, status):
+                    yield record
+
+
+class S3HistoryStore(HistoryStore):
+    """Date/cluster/status-partitioned store with one immutable NDJSON object per run"""
+
+    def __init__(self, s3_client: Any, bucket: str, prefix: str = 'restore-history'):
+        self.s3 = s3_client
+        self.bucket = bucket
+        self.prefix = prefix.rstrip('/')
+
+    def _key(self, record: Dict[str, Any]) -> str:
+        ts = _parse_ts(record['ts'])
+        return (
+            f"{self.prefix}/dt={ts.strftime('%Y-%m-%d')}/"
+            f"cluster={record.get('cluster', 'unknown')}/status={record_status(record)}/"
+            f"{ts.strftime('%H%M%S')}-{uuid.uuid4().hex[:8]}.ndjson"
+        )
+
+    @staticmethod
+    def _key_matches(key: str, cluster_id: Optional[str], status: Optional[str]) -> bool:
+        """Filter on the partitions in the key, so non-matching objects are never fetched"""
+        partitions = dict(p.split('=', 1) for p in key.split('/')[:-1] if '=' in p)
+        if cluster_id and partitions.get('cluster') != cluster_id:
+            return False
+        return not status or partitions.get('status') == status
+
+    def _list(self, **params) -> Iterator[str]:
+        for page in self.s3.get_paginator('list_objects_v2').paginate(Bucket=self.bucket, **params):
+            for obj in page.get('Contents', []):
+                yield obj['Key']
+
+    def append(self, record: Dict[str, Any]):
+        self.s3.put_object(
+            Bucket=self.bucket,
+            Key=self._key(record),
+            Body=(_compact(record) + '\n').encode('utf-8'),
+            ContentType='application/x-ndjson'
+        )
+
+    def iter_keys(
+        self,
+        since: Optional[datetime] = None,
+        cluster_id: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        List record keys in date order, skipping partitions before `since`.
+
+        With a cluster and a start date, only that cluster's prefix is
+        listed in each daily partition instead of every run of the fleet.
+        """
+        if cluster_id and since:
+            day = since.date()
+            today = datetime.now(timezone.utc).date()
+            while day <= today:
+                indexed = f"{self.prefix}/dt={day.isoformat()}/cluster={cluster_id}/" + (f"status={status}/" if status else '')
+                yield from self._list(Prefix=indexed)
+                day += timedelta(days=1)
+            return
+
+        params = {'Prefix': f"{self.prefix}/dt="}
+        if since:
+            # Keys sort lexicographically by partition date, so StartAfter
+            # skips every older partition without listing it
+            params['StartAfter'] = f"{self.prefix}/dt={since.strftime('%Y-%m-%d')}"
+
+        for key in self._list(**params):
+            if self._key_matches(key, cluster_id, status):
+                yield key
+
+    def iter_records(
+        self,
+        since: Optional[datetime] = None,
+        cluster_id: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        for key in self.iter_keys(since, cluster_id, status):
+            body = self.s3.get_object(Bucket=self.bucket, Key=key)['Body']
+            for line in body.iter_lines():
+                if not line:
+                    continue
+                record = json.loads(line)
+                if _matches(record, since, cluster_id, status):
+                    yield record
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Linear-interpolated percentile (pct in 0-100) of a list of values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    if lower == upper:
+        return ordered[lower]
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def rto_summary(
+    store: HistoryStore,
+    cluster_id: str,
+    since: Optional[datetime] = None,
+    test_type: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    p50/p95 restore time over the successful runs of a cluster.
+
+    Only the RTO values are kept in memory, so the summary stays small
+    however many runs the history holds.
+    """
+    durations = []
+    for record in store.iter_records(since=since, cluster_id=cluster_id):
+        if not record.get('success') or record.get('rto_seconds') is None:
+            continue
+        if test_type and record.get('test_type') != test_type:
+            continue
+        durations.append(float(record['rto_seconds']))
+
+    return {
+        'runs': len(durations),
+        'p50_seconds': percentile(durations, 50),
+        'p95_seconds': percentile(durations, 95),
+        'max_seconds': max(durations) if durations else None
+    }
+
+
+def build_timing_record(
+    cluster_id: str,
+    test_type: str,
+    success: bool,
+    rto_seconds: Optional[float],
+    phases: Dict[str, float],
+    ts: Optional[datetime] = None,
+    snapshot_id: Optional[str] = None,
+    result: Optional[Dict[str, Any]] = None,
+    run_seconds: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Run record as stored in the history: a compact timing summary used by
+    the RTO and scheduling queries, plus the full test result when given.
+    """
+    record = {
+        'ts': (ts or datetime.now(timezone.utc)).isoformat(),
+        'cluster': cluster_id,
+        'test_type': test_type,
+        'snapshot': snapshot_id,
+        'success': success,
+        'rto_seconds': round(rto_seconds, 1) if rto_seconds is not None else None,
+        'phases': {name: round(seconds, 1) for name, seconds in phases.items()},
+        'run_seconds': round(run_seconds, 1) if run_seconds is not None else None
+    }
+    if result is not None:
+        record['result'] = result
+    return record
+
+
+def open_history_store(s3_client: Any = None) -> Optional[HistoryStore]:
+    """Build the store configured by HISTORY_BUCKET/HISTORY_PREFIX or HISTORY_PATH"""
+    bucket = os.environ.get('HISTORY_BUCKET', '')
+    if bucket:
+        return S3HistoryStore(s3_client, bucket, os.environ.get('HISTORY_PREFIX', 'restore-history'))
+
+    path = os.environ.get('HISTORY_PATH', '')
+    if path:
+        return LocalHistoryStore(path)
+
+    return None
+
+
+class _Reservoir:
+    """Fixed-size uniform sample of a stream, for percentiles in bounded memory"""
+
+    def __init__(self, size: int, rng: random.Random):
+        self.size = size
+        self.rng = rng
+        self.seen = 0
+        self.values: List[float] = []
+
+    def add(self, value: float):
+        self.seen += 1
+        if len(self.values) < self.size:
+            self.values.append(value)
+            return
+        slot = self.rng.randrange(self.seen)
+        if slot < self.size:
+            self.values[slot] = value
+
+
+class TrendReport:
+    """
+    Streaming aggregation of run records into pass rates, RTO trends and
+    flaky checks.
+
+    Memory is bounded by the number of clusters, checks and trend buckets,
+    not by the number of runs: RTO percentiles per bucket come from a
+    fixed-size reservoir sample.
+
+    A check is flaky when it both passed and failed for the same snapshot
+    (same input, different outcome), or when it fails intermittently
+    without failing consistently.
+    """
+
+    def __init__(self, bucket_days: int = 7, sample_size: int = 256, flaky_min_runs: int = 5, seed: int = 0):
+        self.bucket_days = bucket_days
+        self.sample_size = sample_size
+        self.flaky_min_runs = flaky_min_runs
+        self.rng = random.Random(seed)
+        self.runs = 0
+        self.first_ts: Optional[str] = None
+        self.last_ts: Optional[str] = None
+        self.outcomes: Dict[tuple, Dict[str, int]] = {}
+        self.rto_buckets: Dict[tuple, _Reservoir] = {}
+        self.checks: Dict[tuple, Dict[str, Any]] = {}
+
+    def _bucket(self, ts: datetime) -> str:
+        day = ts.date()
+        start = day - timedelta(days=day.toordinal() % self.bucket_days)
+        return start.isoformat()
+
+    def add(self, record: Dict[str, Any]):
+        self.runs += 1
+        ts = _parse_ts(record['ts'])
+        if self.first_ts is None or record['ts'] < self.first_ts:
+            self.first_ts = record['ts']
+        if self.last_ts is None or record['ts'] > self.last_ts:
+            self.last_ts = record['ts']
+
+        cluster_id = record.get('cluster')
+        test_type = record.get('test_type', 'full')
+        outcome = self.outcomes.setdefault((cluster_id, test_type), {'pass': 0, 'fail': 0})
+        outcome[record_status(record)] += 1
+
+        if record.get('success') and record.get('rto_seconds') is not None:
+            key = (cluster_id, test_type, self._bucket(ts))
+            if key not in self.rto_buckets:
+                self.rto_buckets[key] = _Reservoir(self.sample_size, self.rng)
+            self.rto_buckets[key].add(float(record['rto_seconds']))
+
+        for check in (record.get('result') or {}).get('data_integrity_tests', []):
+            name = check.get('test')
+            if not name:
+                continue
+            stats = self.checks.setdefault((cluster_id, name), {'pass': 0, 'fail': 0, 'snapshots': {}})
+            passed = bool(check.get('passed'))
+            stats['pass' if passed else 'fail'] += 1
+            snapshot = record.get('snapshot')
+            if snapshot:
+                # Bit 1: seen passing, bit 2: seen failing
+                stats['snapshots'][snapshot] = stats['snapshots'].get(snapshot, 0) | (1 if passed else 2)
+
+    def to_dict(self) -> Dict[str, Any]:
+        pass_rates = []
+        for (cluster_id, test_type), counts in sorted(self.outcomes.items(), key=lambda i: (str(i[0][0]), i[0][1])):
+            total = counts['pass'] + counts['fail']
+            pass_rates.append({
+                'cluster': cluster_id,
+                'test_type': test_type,
+                'runs': total,
+                'passed': counts['pass'],
+                'pass_rate': round(counts['pass'] / total, 4) if total else None
+            })
+
+        trends: Dict[tuple, List[Dict[str, Any]]] = {}
+        for (cluster_id, test_type, bucket), reservoir in sorted(self.rto_buckets.items(), key=lambda i: (str(i[0][0]), i[0][1], i[0][2])):
+            trends.setdefault((cluster_id, test_type), []).append({
+                'period_start': bucket,
+                'runs': reservoir.seen,
+                'p50_seconds': percentile(reservoir.values, 50),
+                'p95_seconds': percentile(reservoir.values, 95)
+            })
+        rto_trends = []
+        for (cluster_id, test_type), points in trends.items():
+            first, last = points[0]['p50_seconds'], points[-1]['p50_seconds']
+            rto_trends.append({
+                'cluster': cluster_id,
+                'test_type': test_type,
+                'periods': points,
+                'p50_change_seconds': round(last - first, 1) if len(points) > 1 else None
+            })
+
+        flaky = []
+        for (cluster_id, name), stats in self.checks.items():
+            total = stats['pass'] + stats['fail']
+            inconsistent = sum(1 for bits in stats['snapshots'].values() if bits == 3)
+            intermittent = total >= self.flaky_min_runs and 0 < stats['fail'] < total
+            if inconsistent or intermittent:
+                flaky.append({
+                    'cluster': cluster_id,
+                    'check': name,
+                    'runs': total,
+                    'failures': stats['fail'],
+                    'failure_rate': round(stats['fail'] / total, 4),
+                    'inconsistent_snapshots': inconsistent
+                })
+        flaky.sort(key=lambda f: (-f['inconsistent_snapshots'], -f['failure_rate']))
+
+        return {
+            'runs': self.runs,
+            'first_run': self.first_ts,
+            'last_run': self.last_ts,
+            'bucket_days': self.bucket_days,
+            'pass_rates': pass_rates,
+            'rto_trends': rto_trends,
+            'flaky_checks': flaky
+        }
+
+
+def build_trend_report(
+    store: HistoryStore,
+    since: Optional[datetime] = None,
+    cluster_id: Optional[str] = None,
+    test_type: Optional[str] = None,
+    bucket_days: int = 7
+) -> Dict[str, Any]:
+    """Stream the history once and summarize it"""
+    report = TrendReport(bucket_days=bucket_days)
+    for record in store.iter_records(since=since, cluster_id=cluster_id):
+        if test_type and record.get('test_type') != test_type:
+            continue
+        report.add(record)
+    return report.to_dict()
+
+
+def _format_report(report: Dict[str, Any]) -> str:
+    lines = [f"{report['runs']} runs from {report['first_run']} to {report['last_run']}", "", "Pass rates:"]
+    for row in report['pass_rates']:
+        lines.append(f"  {row['cluster']} [{row['test_type']}]: {row['passed']}/{row['runs']} ({row['pass_rate']:.1%})")
+    lines.extend(["", f"RTO p50 per {report['bucket_days']}-day period:"])
+    for trend in report['rto_trends']:
+        series = ", ".join(f"{p['period_start']}: {p['p50_seconds']:.0f}s" for p in trend['periods'])
+        lines.append(f"  {trend['cluster']} [{trend['test_type']}]: {series}")
+    lines.extend(["", "Flaky checks:"])
+    for check in report['flaky_checks'] or [{'cluster': '-', 'check': 'none', 'failures': 0, 'runs': 0, 'inconsistent_snapshots': 0}]:
+        lines.append(
+            f"  {check['cluster']} {check['check']}: {check['failures']}/{check['runs']} failed, "
+            f"{check['inconsistent_snapshots']} inconsistent snapshots"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Restore test history trend report')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--path', help='Local NDJSON history file')
+    source.add_argument('--bucket', help='S3 history bucket')
+    parser.add_argument('--prefix', default='restore-history', help='S3 history prefix')
+    parser.add_argument('--days', type=int, default=90, help='Days of history to include')
+    parser.add_argument('--cluster', help='Only this cluster')
+    parser.add_argument('--test-type', help='Only this test type')
+    parser.add_argument('--bucket-days', type=int, default=7, help='Days per RTO trend period')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args(argv)
+
+    if args.bucket:
+        import boto3
+        store = S3HistoryStore(boto3.client('s3'), args.bucket, args.prefix)
+    else:
+        store = LocalHistoryStore(args.path)
+
+    report = build_trend_report(
+        store,
+        since=datetime.now(timezone.utc) - timedelta(days=args.days),
+        cluster_id=args.cluster,
+        test_type=args.test_type,
+        bucket_days=args.bucket_days
+    )
+    print(json.dumps(report, indent=2, default=str) if args.json else _format_report(report))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
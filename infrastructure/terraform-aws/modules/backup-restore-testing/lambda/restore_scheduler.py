@@ -0,0 +1,299 @@
+"""
+Backup Restoration Test Scheduler
+
+Chooses which clusters and snapshots to restore next across the fleet.
+Every eligible (cluster, snapshot) pair is scored by how overdue the
+cluster's verification is relative to its criticality, with a bonus for
+older snapshots that are closer to leaving the retention window. A heap
+yields the most overdue targets first, and targets whose verification
+interval has elapsed are dispatched until the concurrent-restore limit or
+the monthly cost budget is reached.
+
+Cluster tags:
+- BackupRestoreTest = "false" opts a cluster out
+- Criticality = critical | high | medium | low (default medium)
+
+Author: Unified Health Platform Team
+"""
+
+import heapq
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+from restore_history import HistoryStore, percentile
+
+logger = logging.getLogger()
+
+CRITICALITY_WEIGHTS = {'critical': 4.0, 'high': 2.0, 'medium': 1.0, 'low': 0.5}
+
+# Target time between successful verifications per criticality
+VERIFICATION_INTERVAL_HOURS = {'critical': 24 * 7, 'high': 24 * 14, 'medium': 24 * 30, 'low': 24 * 60}
+
+# A cluster that was never verified counts as this many intervals overdue
+NEVER_VERIFIED_OVERDUE = 3.0
+
+# Weight of snapshot age (as a fraction of the retention window) in the score
+SNAPSHOT_AGE_WEIGHT = 0.25
+
+
+def _tags(resource: Dict[str, Any]) -> Dict[str, str]:
+    return {tag['Key']: tag['Value'] for tag in resource.get('TagList', [])}
+
+
+def cluster_criticality(cluster: Dict[str, Any]) -> str:
+    value = _tags(cluster).get('Criticality', 'medium').lower()
+    return value if value in CRITICALITY_WEIGHTS else 'medium'
+
+
+def is_eligible_cluster(cluster: Dict[str, Any]) -> bool:
+    """Aurora source clusters that opt in to restore testing (test clusters never do)"""
+    # DocumentDB, Neptune and Multi-AZ DB clusters cannot take the Aurora restore path
+    if not cluster.get('Engine', '').startswith('aurora'):
+        return False
+    tags = _tags(cluster)
+    if tags.get('Purpose') == 'BackupRestoreTest':
+        return False
+    if tags.get('BackupRestoreTest', 'true').lower() == 'false':
+        return False
+    return cluster.get('Status') == 'available'
+
+
+class HistoryDigest:
+    """What the scheduler needs from the run history, gathered in one streaming pass"""
+
+    def __init__(self):
+        self.last_verified: Dict[str, datetime] = {}
+        self.verified_snapshots: set = set()
+        self.durations: Dict[str, List[float]] = {}
+        self.month_run_hours = 0.0
+
+    @classmethod
+    def from_store(cls, store: Optional[HistoryStore], since: datetime, month_start: datetime) -> 'HistoryDigest':
+        digest = cls()
+        if store is None:
+            return digest
+
+        for record in store.iter_records(since=min(since, month_start)):
+            ts = datetime.fromisoformat(record['ts'])
+            if ts >= month_start:
+                digest.month_run_hours += run_hours(record)
+            if not record.get('success'):
+                continue
+            cluster_id = record.get('cluster')
+            if ts > digest.last_verified.get(cluster_id, datetime.min.replace(tzinfo=timezone.utc)):
+                digest.last_verified[cluster_id] = ts
+            if record.get('snapshot'):
+                digest.verified_snapshots.add(record['snapshot'])
+            if record.get('rto_seconds') is not None:
+                digest.durations.setdefault(cluster_id, []).append(run_hours(record))
+
+        return digest
+
+    def expected_hours(self, cluster_id: str, default_hours: float) -> float:
+        """Median billed hours of past runs of the cluster"""
+        return percentile(self.durations.get(cluster_id, []), 50) or default_hours
+
+
+def run_hours(record: Dict[str, Any]) -> float:
+    """
+    Hours a run kept test resources up: its wall-clock span. Phases overlap
+    (instance creation runs during the cluster restore), so records written
+    before the span was stored fall back to the RTO or the longest phase.
+    """
+    seconds = (
+        record.get('run_seconds')
+        or record.get('rto_seconds')
+        or max((record.get('phases') or {}).values(), default=0)
+    )
+    return seconds / 3600
+
+
+class RestoreTarget:
+    """One candidate restore: a cluster, one of its snapshots and its priority"""
+
+    def __init__(
+        self,
+        cluster_id: str,
+        snapshot: Dict[str, Any],
+        criticality: str,
+        last_verified: Optional[datetime],
+        score: float,
+        estimated_hours: float,
+        overdue: float = NEVER_VERIFIED_OVERDUE
+    ):
+        self.cluster_id = cluster_id
+        self.snapshot = snapshot
+        self.criticality = criticality
+        self.last_verified = last_verified
+        self.score = score
+        self.estimated_hours = estimated_hours
+        self.overdue = overdue
+
+    @property
+    def snapshot_id(self) -> str:
+        return self.snapshot['DBClusterSnapshotIdentifier']
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'cluster_id': self.cluster_id,
+            'snapshot_id': self.snapshot_id,
+            'criticality': self.criticality,
+            'last_verified': self.last_verified.isoformat() if self.last_verified else None,
+            'score': round(self.score, 3),
+            'overdue': round(self.overdue, 3),
+            'estimated_hours': round(self.estimated_hours, 2)
+        }
+
+
+def overdue_intervals(now: datetime, criticality: str, last_verified: Optional[datetime]) -> float:
+    """Verification intervals elapsed since the cluster was last verified"""
+    if last_verified is None:
+        return NEVER_VERIFIED_OVERDUE
+    return (now - last_verified).total_seconds() / 3600 / VERIFICATION_INTERVAL_HOURS[criticality]
+
+
+def staleness_score(
+    now: datetime,
+    criticality: str,
+    last_verified: Optional[datetime],
+    snapshot_time: datetime,
+    retention_start: datetime
+) -> float:
+    """
+    Priority of a target: criticality weight x how many verification
+    intervals are overdue, raised for snapshots near the end of retention.
+    """
+    overdue = overdue_intervals(now, criticality, last_verified)
+    window = (now - retention_start).total_seconds()
+    age_fraction = (now - snapshot_time).total_seconds() / window if window > 0 else 0.0
+    return CRITICALITY_WEIGHTS[criticality] * overdue * (1 + SNAPSHOT_AGE_WEIGHT * min(max(age_fraction, 0.0), 1.0))
+
+
+def candidate_snapshots(snapshots: List[Dict[str, Any]], verified: set) -> List[Dict[str, Any]]:
+    """
+    Latest and oldest retained snapshot of a cluster, skipping verified ones.
+    When both are verified, the newest unverified snapshot (or else the
+    latest one again) keeps an overdue cluster in the queue.
+    """
+    if not snapshots:
+        return []
+    candidates = []
+    for snapshot in (snapshots[-1], snapshots[0]):
+        if snapshot['DBClusterSnapshotIdentifier'] in verified or snapshot in candidates:
+            continue
+        candidates.append(snapshot)
+    if not candidates:
+        unverified = [s for s in snapshots if s['DBClusterSnapshotIdentifier'] not in verified]
+        candidates.append(unverified[-1] if unverified else snapshots[-1])
+    return candidates
+
+
+class PriorityScheduler:
+    """Max-heap of restore targets drained within concurrency and cost budgets"""
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        monthly_budget: float,
+        hourly_cost: float
+    ):
+        self.max_concurrent = max_concurrent
+        self.monthly_budget = monthly_budget
+        self.hourly_cost = hourly_cost
+        self._heap: List[Tuple[float, int, RestoreTarget]] = []
+        self._sequence = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, target: RestoreTarget):
+        # Negated score for a max-heap; the sequence keeps ties stable
+        heapq.heappush(self._heap, (-target.score, self._sequence, target))
+        self._sequence += 1
+
+    def select(self, running: int, month_spend: float) -> Dict[str, Any]:
+        """
+        Pop targets in priority order until a budget runs out.
+
+        Targets verified less than one interval ago are not due and are left
+        for a later run. At most one target per cluster is selected; a target
+        that would exceed the remaining cost budget is skipped so a cheaper
+        one further down the queue can still run.
+        """
+        selected: List[RestoreTarget] = []
+        skipped: List[Dict[str, Any]] = []
+        not_due = 0
+        clusters = set()
+        slots = max(0, self.max_concurrent - running)
+        remaining = self.monthly_budget - month_spend
+
+        while self._heap and len(selected) < slots:
+            _, _, target = heapq.heappop(self._heap)
+            if target.cluster_id in clusters:
+                continue
+            if target.overdue < 1:
+                not_due += 1
+                continue
+            cost = target.estimated_hours * self.hourly_cost
+            if cost > remaining:
+                skipped.append(dict(target.to_dict(), reason='monthly budget'))
+                continue
+            selected.append(target)
+            clusters.add(target.cluster_id)
+            remaining -= cost
+
+        return {
+            'selected': selected,
+            'skipped': skipped,
+            'not_due': not_due,
+            'queued': len(self._heap),
+            'slots': slots,
+            'remaining_budget': round(remaining, 2)
+        }
+
+
+def build_targets(
+    clusters: Iterable[Dict[str, Any]],
+    snapshots_by_cluster: Dict[str, List[Dict[str, Any]]],
+    digest: HistoryDigest,
+    now: datetime,
+    default_hours: float
+) -> List[RestoreTarget]:
+    """Score every candidate snapshot of every eligible cluster"""
+    targets = []
+    for cluster in clusters:
+        cluster_id = cluster['DBClusterIdentifier']
+        snapshots = snapshots_by_cluster.get(cluster_id, [])
+        if not snapshots:
+            continue
+
+        criticality = cluster_criticality(cluster)
+        last_verified = digest.last_verified.get(cluster_id)
+        retention_start = cluster.get('EarliestRestorableTime') or snapshots[0]['SnapshotCreateTime']
+        if retention_start.tzinfo is None:
+            retention_start = retention_start.replace(tzinfo=timezone.utc)
+
+        for snapshot in candidate_snapshots(snapshots, digest.verified_snapshots):
+            snapshot_time = snapshot['SnapshotCreateTime']
+            if snapshot_time.tzinfo is None:
+                snapshot_time = snapshot_time.replace(tzinfo=timezone.utc)
+            targets.append(RestoreTarget(
+                cluster_id,
+                snapshot,
+                criticality,
+                last_verified,
+                staleness_score(now, criticality, last_verified, snapshot_time, min(retention_start, snapshot_time)),
+                digest.expected_hours(cluster_id, default_hours),
+                overdue_intervals(now, criticality, last_verified)
+            ))
+    return targets
+
+
+def month_start(now: datetime) -> datetime:
+    return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def lookback_start(now: datetime) -> datetime:
+    """How far back the history is read: the longest verification interval, twice"""
+    return now - timedelta(hours=2 * max(VERIFICATION_INTERVAL_HOURS.values()))
@@ -0,0 +1,584 @@
+"""
+Backup Restoration Test Simulator
+
+Drives backup_restore_test.lambda_handler and reaper_handler against a fake
+RDS backend with a virtual clock, so polling and orchestration changes can
+be exercised and benchmarked in milliseconds instead of an hour of real
+Aurora time.
+
+Each scenario scripts how long restores, instance creation and deletions
+take (and whether they fail or get stuck), runs the test handler, then runs
+the reaper on its schedule until the test resources are gone. The report
+lists per scenario: outcome, API call counts, simulated end-to-end latency
+and whether cleanup left anything behind.
+
+Usage:
+    python restore_simulator.py                  # run all scenarios
+    python restore_simulator.py --scenario quick_clone --json
+
+This module is a development tool and is not packaged into the Lambda zip.
+
+Author: Unified Health Platform Team
+"""
+
+import os
+import sys
+import json
+import heapq
+import random
+import argparse
+import tempfile
+import threading
+import time as real_time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('RDS_CLUSTER_IDENTIFIER', 'sim-source-cluster')
+
+import backup_restore_test as brt  # noqa: E402
+
+
+class VirtualClock:
+    """
+    Discrete-event clock shared by every thread of the pipeline.
+
+    sleep() does not wait in real time: once every running thread is
+    asleep (or, with a single thread, immediately) the clock jumps to the
+    earliest wake-up time. Threads are considered settled after
+    `quiet_seconds` of real time without any clock or backend activity.
+    """
+
+    def __init__(self, start: float = 1_700_000_000.0, quiet_seconds: float = 0.002):
+        self._now = start
+        self.quiet_seconds = quiet_seconds
+        self._cond = threading.Condition()
+        self._sleepers: List[tuple] = []
+        self._sequence = 0
+        self._last_activity = real_time.monotonic()
+
+    def touch(self):
+        self._last_activity = real_time.monotonic()
+
+    def time(self) -> float:
+        with self._cond:
+            self.touch()
+            return self._now
+
+    def sleep(self, seconds: float):
+        with self._cond:
+            self._sequence += 1
+            entry = (self._now + max(0.0, seconds), self._sequence)
+            heapq.heappush(self._sleepers, entry)
+            self.touch()
+
+            while self._now < entry[0]:
+                settled = (
+                    threading.active_count() == 1
+                    or real_time.monotonic() - self._last_activity >= self.quiet_seconds
+                )
+                # Only jump once earlier sleepers have actually woken up
+                if settled and self._sleepers[0][0] > self._now:
+                    self._now = self._sleepers[0][0]
+                    self._cond.notify_all()
+                else:
+                    self._cond.wait(self.quiet_seconds)
+
+            self._sleepers.remove(entry)
+            heapq.heapify(self._sleepers)
+            self.touch()
+            self._cond.notify_all()
+
+
+class FakeRDSExceptions:
+    class DBClusterNotFoundFault(Exception):
+        pass
+
+    class DBInstanceNotFoundFault(Exception):
+        pass
+
+    class InvalidDBClusterStateFault(Exception):
+        pass
+
+    class DBClusterSnapshotAlreadyExistsFault(Exception):
+        pass
+
+
+class _FakePaginator:
+    def __init__(self, backend: 'FakeRDS', operation: str):
+        self.backend = backend
+        self.operation = operation
+
+    def paginate(self, **kwargs):
+        kwargs.pop('PaginationConfig', None)
+        yield getattr(self.backend, self.operation)(**kwargs)
+
+
+class FakeRDS:
+    """
+    In-memory RDS backend with scripted, clock-driven state transitions.
+
+    Script keys (seconds unless noted):
+    - cluster_ready: restore/clone submit until the cluster is available
+    - cluster_status: final cluster status ('available' or 'failed')
+    - instance_ready: instance submit until available (never before the cluster)
+    - instance_status: final instance status
+    - instance_delete / cluster_delete: time a delete takes to finish
+    - snapshot_copy: cross-region snapshot copy time
+    - restore_error: if set, restore/clone calls raise this message
+    """
+
+    DEFAULT_SCRIPT = {
+        'cluster_ready': 1500,
+        'cluster_status': 'available',
+        'instance_ready': 600,
+        'instance_status': 'available',
+        'instance_delete': 300,
+        'cluster_delete': 120,
+        'snapshot_copy': 900,
+        'restore_error': None
+    }
+
+    exceptions = FakeRDSExceptions
+
+    def __init__(self, clock: VirtualClock, script: Optional[Dict[str, Any]] = None, region: str = 'us-east-1'):
+        self.clock = clock
+        self.script = dict(self.DEFAULT_SCRIPT, **(script or {}))
+        self.region = region
+        self.calls: Counter = Counter()
+        self._lock = threading.Lock()
+        self.clusters: Dict[str, Dict[str, Any]] = {}
+        self.instances: Dict[str, Dict[str, Any]] = {}
+        self.snapshots: Dict[str, Dict[str, Any]] = {}
+
+    # ---- setup helpers ----
+
+    def add_source_cluster(self, cluster_id: str, engine: str = 'aurora-postgresql', retention_days: int = 7):
+        now = datetime.fromtimestamp(self.clock.time(), timezone.utc)
+        self.clusters[cluster_id] = {
+            'desc': {
+                'DBClusterIdentifier': cluster_id,
+                'DBClusterArn': self._arn('cluster', cluster_id),
+                'Engine': engine,
+                'Endpoint': f"{cluster_id}.cluster.example",
+                'StorageEncrypted': True,
+                'MultiAZ': True,
+                'EarliestRestorableTime': now - timedelta(days=retention_days),
+                'LatestRestorableTime': now - timedelta(minutes=5),
+                'ClusterCreateTime': now - timedelta(days=365),
+                'TagList': []
+            },
+            'ready_at': 0.0,
+            'final_status': 'available',
+            'deleted_at': None
+        }
+
+    def add_snapshot(self, cluster_id: str, snapshot_id: str, created: datetime,
+                     snapshot_type: str = 'automated', ready_at: float = 0.0,
+                     tags: Optional[List[Dict[str, str]]] = None):
+        self.snapshots[snapshot_id] = {
+            'desc': {
+                'DBClusterSnapshotIdentifier': snapshot_id,
+                'DBClusterSnapshotArn': self._arn('cluster-snapshot', snapshot_id),
+                'DBClusterIdentifier': cluster_id,
+                'SnapshotCreateTime': created,
+                'SnapshotType': snapshot_type,
+                'Engine': 'aurora-postgresql',
+                'EngineVersion': '15.4',
+                'TagList': list(tags or [])
+            },
+            'ready_at': ready_at
+        }
+
+    def _arn(self, kind: str, name: str) -> str:
+        return f"arn:aws:rds:{self.region}:000000000000:{kind}:{name}"
+
+    # ---- views ----
+
+    def _cluster_view(self, record: Dict[str, Any], now: float) -> Optional[Dict[str, Any]]:
+        if record['deleted_at'] is not None and now >= record['deleted_at']:
+            return None
+        view = dict(record['desc'])
+        if record['deleted_at'] is not None:
+            view['Status'] = 'deleting'
+        elif now >= record['ready_at']:
+            view['Status'] = record['final_status']
+        else:
+            view['Status'] = 'creating'
+        view['DBClusterMembers'] = [
+            {'DBInstanceIdentifier': instance_id}
+            for instance_id, instance in self.instances.items()
+            if instance['desc']['DBClusterIdentifier'] == view['DBClusterIdentifier']
+            and self._instance_view(instance, now) is not None
+        ]
+        return view
+
+    def _instance_view(self, record: Dict[str, Any], now: float) -> Optional[Dict[str, Any]]:
+        if record['deleted_at'] is not None and now >= record['deleted_at']:
+            return None
+        view = dict(record['desc'])
+        if record['deleted_at'] is not None:
+            view['DBInstanceStatus'] = 'deleting'
+        elif now >= record['ready_at']:
+            view['DBInstanceStatus'] = record['final_status']
+        else:
+            view['DBInstanceStatus'] = 'creating'
+        return view
+
+    # ---- describe ----
+
+    def _filter_ids(self, filters: Optional[List[Dict[str, Any]]]) -> Optional[set]:
+        for f in filters or []:
+            if f['Name'] == 'db-cluster-id':
+                return set(f['Values'])
+        return None
+
+    def describe_db_clusters(self, DBClusterIdentifier: Optional[str] = None, Filters=None, **_):
+        self.calls['describe_db_clusters'] += 1
+        now = self.clock.time()
+        with self._lock:
+            wanted = {DBClusterIdentifier} if DBClusterIdentifier else self._filter_ids(Filters)
+            views = []
+            for cluster_id, record in self.clusters.items():
+                if wanted is not None and cluster_id not in wanted:
+                    continue
+                view = self._cluster_view(record, now)
+                if view:
+                    views.append(view)
+        if DBClusterIdentifier and not views:
+            raise self.exceptions.DBClusterNotFoundFault(DBClusterIdentifier)
+        return {'DBClusters': views}
+
+    def describe_db_instances(self, DBInstanceIdentifier: Optional[str] = None, Filters=None, **_):
+        self.calls['describe_db_instances'] += 1
+        now = self.clock.time()
+        with self._lock:
+            clusters = self._filter_ids(Filters)
+            views = []
+            for instance_id, record in self.instances.items():
+                if DBInstanceIdentifier and instance_id != DBInstanceIdentifier:
+                    continue
+                if clusters is not None and record['desc']['DBClusterIdentifier'] not in clusters:
+                    continue
+                view = self._instance_view(record, now)
+                if view:
+                    views.append(view)
+        if DBInstanceIdentifier and not views:
+            raise self.exceptions.DBInstanceNotFoundFault(DBInstanceIdentifier)
+        return {'DBInstances': views}
+
+    def describe_db_cluster_snapshots(self, DBClusterIdentifier=None, SnapshotType=None,
+                                      DBClusterSnapshotIdentifier=None, **_):
+        self.calls['describe_db_cluster_snapshots'] += 1
+        now = self.clock.time()
+        views = []
+        for snapshot_id, record in self.snapshots.items():
+            desc = record['desc']
+            if DBClusterSnapshotIdentifier and snapshot_id != DBClusterSnapshotIdentifier:
+                continue
+            if DBClusterIdentifier and desc['DBClusterIdentifier'] != DBClusterIdentifier:
+                continue
+            if SnapshotType and desc['SnapshotType'] != SnapshotType:
+                continue
+            views.append(dict(desc, Status='available' if now >= record['ready_at'] else 'copying'))
+        return {'DBClusterSnapshots': views}
+
+    def get_paginator(self, operation: str) -> _FakePaginator:
+        return _FakePaginator(self, operation)
+
+    # ---- mutations ----
+
+    def _create_cluster(self, cluster_id: str, engine: str, tags: List[Dict[str, str]]) -> Dict[str, Any]:
+        if self.script['restore_error']:
+            raise RuntimeError(self.script['restore_error'])
+        now = self.clock.time()
+        with self._lock:
+            self.clusters[cluster_id] = {
+                'desc': {
+                    'DBClusterIdentifier': cluster_id,
+                    'DBClusterArn': self._arn('cluster', cluster_id),
+                    'Engine': engine,
+                    'Endpoint': f"{cluster_id}.cluster.example",
+                    'StorageEncrypted': True,
+                    'MultiAZ': False,
+                    'ClusterCreateTime': datetime.now(timezone.utc),
+                    'TagList': list(tags)
+                },
+                'ready_at': now + self.script['cluster_ready'],
+                'final_status': self.script['cluster_status'],
+                'deleted_at': None
+            }
+            return {'DBCluster': self._cluster_view(self.clusters[cluster_id], now)}
+
+    def restore_db_cluster_from_snapshot(self, DBClusterIdentifier, Engine, Tags=(), **_):
+        self.calls['restore_db_cluster_from_snapshot'] += 1
+        return self._create_cluster(DBClusterIdentifier, Engine, Tags)
+
+    def restore_db_cluster_to_point_in_time(self, DBClusterIdentifier, SourceDBClusterIdentifier, Tags=(), **_):
+        self.calls['restore_db_cluster_to_point_in_time'] += 1
+        engine = self.clusters[SourceDBClusterIdentifier]['desc']['Engine']
+        return self._create_cluster(DBClusterIdentifier, engine, Tags)
+
+    def create_db_instance(self, DBInstanceIdentifier, DBClusterIdentifier, DBInstanceClass, Engine, Tags=(), **_):
+        self.calls['create_db_instance'] += 1
+        now = self.clock.time()
+        with self._lock:
+            cluster = self.clusters[DBClusterIdentifier]
+            self.instances[DBInstanceIdentifier] = {
+                'desc': {
+                    'DBInstanceIdentifier': DBInstanceIdentifier,
+                    'DBClusterIdentifier': DBClusterIdentifier,
+                    'DBInstanceClass': DBInstanceClass,
+                    'Engine': Engine,
+                    'TagList': list(Tags)
+                },
+                # An instance cannot come up before its cluster storage is restored
+                'ready_at': max(now + self.script['instance_ready'], cluster['ready_at'] + 60),
+                'final_status': self.script['instance_status'],
+                'deleted_at': None
+            }
+
+    def add_tags_to_resource(self, ResourceName, Tags, **_):
+        self.calls['add_tags_to_resource'] += 1
+        with self._lock:
+            for record in self.clusters.values():
+                if record['desc']['DBClusterArn'] == ResourceName:
+                    tags = {t['Key']: t['Value'] for t in record['desc']['TagList']}
+                    tags.update({t['Key']: t['Value'] for t in Tags})
+                    record['desc']['TagList'] = [{'Key': k, 'Value': v} for k, v in tags.items()]
+
+    def delete_db_instance(self, DBInstanceIdentifier, **_):
+        self.calls['delete_db_instance'] += 1
+        now = self.clock.time()
+        with self._lock:
+            record = self.instances.get(DBInstanceIdentifier)
+            if not record or self._instance_view(record, now) is None:
+                raise self.exceptions.DBInstanceNotFoundFault(DBInstanceIdentifier)
+            if record['deleted_at'] is None:
+                record['deleted_at'] = now + self.script['instance_delete']
+
+    def delete_db_cluster(self, DBClusterIdentifier, **_):
+        self.calls['delete_db_cluster'] += 1
+        now = self.clock.time()
+        with self._lock:
+            record = self.clusters.get(DBClusterIdentifier)
+            view = self._cluster_view(record, now) if record else None
+            if view is None:
+                raise self.exceptions.DBClusterNotFoundFault(DBClusterIdentifier)
+            if view['DBClusterMembers']:
+                raise self.exceptions.InvalidDBClusterStateFault(f"{DBClusterIdentifier} still has members")
+            if record['deleted_at'] is None:
+                record['deleted_at'] = now + self.script['cluster_delete']
+
+    def copy_db_cluster_snapshot(self, SourceDBClusterSnapshotIdentifier, TargetDBClusterSnapshotIdentifier, Tags=None, **_):
+        self.calls['copy_db_cluster_snapshot'] += 1
+        if TargetDBClusterSnapshotIdentifier in self.snapshots:
+            raise self.exceptions.DBClusterSnapshotAlreadyExistsFault(TargetDBClusterSnapshotIdentifier)
+        cluster_id = os.environ['RDS_CLUSTER_IDENTIFIER']
+        now = self.clock.time()
+        self.add_snapshot(
+            cluster_id,
+            TargetDBClusterSnapshotIdentifier,
+            datetime.now(timezone.utc),
+            snapshot_type='manual',
+            ready_at=now + self.script['snapshot_copy'],
+            tags=Tags
+        )
+
+    def delete_db_cluster_snapshot(self, DBClusterSnapshotIdentifier):
+        self.calls['delete_db_cluster_snapshot'] += 1
+        self.snapshots.pop(DBClusterSnapshotIdentifier, None)
+
+    # ---- inspection ----
+
+    def leaked_test_resources(self) -> List[str]:
+        """Test clusters and instances still present (deleting counts as present)"""
+        now = self.clock.time()
+        leaked = []
+        for cluster_id, record in self.clusters.items():
+            tags = {t['Key']: t['Value'] for t in record['desc']['TagList']}
+            if tags.get('Purpose') == 'BackupRestoreTest' and self._cluster_view(record, now) is not None:
+                leaked.append(cluster_id)
+        for instance_id, record in self.instances.items():
+            if record['desc']['DBClusterIdentifier'] in self.clusters and self._instance_view(record, now) is not None:
+                leaked.append(instance_id)
+        return leaked
+
+
+class _RecordingClient:
+    """Stand-in for SNS, CloudWatch and S3 that only counts calls"""
+
+    def __init__(self, name: str, calls: Counter):
+        self._name = name
+        self._calls = calls
+
+    def __getattr__(self, operation: str):
+        def call(*args, **kwargs):
+            self._calls[f"{self._name}.{operation}"] += 1
+            return {}
+        return call
+
+
+class _FakeContext:
+    def __init__(self, clock: VirtualClock, timeout_seconds: float):
+        self._deadline = clock.time() + timeout_seconds
+        self._clock = clock
+
+    def get_remaining_time_in_millis(self) -> int:
+        return int(max(0.0, self._deadline - self._clock.time()) * 1000)
+
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    'full_restore': {
+        'event': {'test_type': 'full'},
+        'expect_success': True
+    },
+    'quick_clone': {
+        'event': {'test_type': 'quick'},
+        'script': {'cluster_ready': 240, 'instance_ready': 420},
+        'expect_success': True
+    },
+    'cluster_restore_failed': {
+        'event': {'test_type': 'full'},
+        'script': {'cluster_status': 'incompatible-restore'},
+        'expect_success': False
+    },
+    'restore_submit_error': {
+        'event': {'test_type': 'full'},
+        'script': {'restore_error': 'InsufficientDBClusterCapacityFault'},
+        'expect_success': False
+    },
+    'instance_timeout': {
+        'event': {'test_type': 'full'},
+        'script': {'instance_ready': 5 * 3600},
+        'max_wait_minutes': 60,
+        'expect_success': False
+    },
+    'stuck_instance_deletion': {
+        'event': {'test_type': 'quick'},
+        'script': {'cluster_ready': 240, 'instance_ready': 420, 'instance_delete': 75 * 60},
+        'expect_success': True
+    },
+    'pitr_sweep': {
+        'event': {'test_type': 'pitr_sweep', 'pitr_points': 4, 'max_concurrency': 2},
+        'script': {'cluster_ready': 600, 'instance_ready': 420},
+        'expect_success': True
+    },
+    'dr_two_regions': {
+        'event': {'test_type': 'dr'},
+        'dr_regions': ['eu-west-1', 'ap-southeast-1'],
+        'expect_success': True
+    }
+}
+
+
+def _install(clock: VirtualClock, backend: FakeRDS, scenario: Dict[str, Any], history_path: str) -> Counter:
+    """Point the Lambda module at the fake backend and virtual clock"""
+    other_calls: Counter = Counter()
+    brt.clock = clock
+    brt.rds_client = backend
+    brt.sns_client = _RecordingClient('sns', other_calls)
+    brt.cloudwatch_client = _RecordingClient('cloudwatch', other_calls)
+    brt.s3_client = _RecordingClient('s3', other_calls)
+    brt.status_watcher = brt.ResourceStatusWatcher(backend, ttl_seconds=brt.STATUS_CACHE_TTL_SECONDS)
+    brt._region_watchers.clear()
+    brt.MAX_WAIT_MINUTES = scenario.get('max_wait_minutes', 60)
+    brt.CLEANUP_AFTER_TEST = True
+    brt.SOURCE_REGION = backend.region
+    brt.DR_REGIONS = [
+        {'region': region, 'db_subnet_group': 'dr-subnets', 'security_group_ids': ['sg-dr']}
+        for region in scenario.get('dr_regions', [])
+    ]
+    os.environ.pop('HISTORY_BUCKET', None)
+    os.environ['HISTORY_PATH'] = history_path
+    return other_calls
+
+
+def run_scenario(name: str, scenario: Dict[str, Any], reaper_interval_minutes: int = 15,
+                 max_reaper_runs: int = 12) -> Dict[str, Any]:
+    """Run one scenario end to end and return its report"""
+    random.seed(0)
+    clock = VirtualClock()
+    cluster_id = os.environ['RDS_CLUSTER_IDENTIFIER']
+    backend = FakeRDS(clock, scenario.get('script'))
+    backend.add_source_cluster(cluster_id)
+    now = datetime.fromtimestamp(clock.time(), timezone.utc)
+    for day in range(7):
+        backend.add_snapshot(cluster_id, f"rds:{cluster_id}-day{day}", now - timedelta(days=day, hours=2))
+
+    region_backends = {}
+    for region in scenario.get('dr_regions', []):
+        region_backends[region] = FakeRDS(clock, scenario.get('script'), region=region)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        other_calls = _install(clock, backend, scenario, os.path.join(tmp, 'history.ndjson'))
+        for region, region_backend in region_backends.items():
+            brt._region_watchers[region] = brt.ResourceStatusWatcher(region_backend, ttl_seconds=brt.STATUS_CACHE_TTL_SECONDS)
+
+        wall_start = real_time.perf_counter()
+        sim_start = clock.time()
+        response = brt.lambda_handler(dict(scenario['event']), None)
+        handler_seconds = clock.time() - sim_start
+        body = json.loads(response['body'])
+
+        # Reaper runs on its schedule until everything is gone
+        reaper_runs = 0
+        backends = [backend] + list(region_backends.values())
+        while any(b.leaked_test_resources() for b in backends) and reaper_runs < max_reaper_runs:
+            brt.reaper_handler({}, _FakeContext(clock, 300))
+            reaper_runs += 1
+            if any(b.leaked_test_resources() for b in backends):
+                clock.sleep(reaper_interval_minutes * 60)
+
+        cleanup_seconds = clock.time() - sim_start - handler_seconds
+        wall_ms = (real_time.perf_counter() - wall_start) * 1000
+
+    rds_calls: Counter = Counter()
+    for b in backends:
+        rds_calls.update(b.calls)
+    leaked = [r for b in backends for r in b.leaked_test_resources()]
+
+    return {
+        'scenario': name,
+        'success': body['success'],
+        'as_expected': body['success'] == scenario['expect_success'],
+        'error_message': body.get('error_message'),
+        'simulated_handler_seconds': round(handler_seconds, 1),
+        'simulated_cleanup_seconds': round(cleanup_seconds, 1),
+        'restore_duration_seconds': body.get('restore_duration_seconds'),
+        'rds_api_calls': sum(rds_calls.values()),
+        'rds_api_calls_by_operation': dict(sorted(rds_calls.items())),
+        'other_api_calls': dict(sorted(other_calls.items())),
+        'reaper_runs': reaper_runs,
+        'cleanup_correct': not leaked,
+        'leaked_resources': leaked,
+        'wall_clock_ms': round(wall_ms, 1)
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Simulate the backup restore test pipeline')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS), help='Scenario to run (repeatable)')
+    parser.add_argument('--json', action='store_true', help='Print the full report as JSON')
+    args = parser.parse_args(argv)
+
+    names = args.scenario or list(SCENARIOS)
+    reports = [run_scenario(name, SCENARIOS[name]) for name in names]
+
+    if args.json:
+        print(json.dumps(reports, indent=2, default=str))
+    else:
+        print(f"{'scenario':<26}{'ok':<5}{'sim latency':>12}{'rds calls':>11}{'reaper':>8}{'clean':>7}{'wall ms':>10}")
+        for r in reports:
+            print(
+                f"{r['scenario']:<26}{'yes' if r['as_expected'] else 'NO':<5}"
+                f"{r['simulated_handler_seconds']:>11.0f}s{r['rds_api_calls']:>11}"
+                f"{r['reaper_runs']:>8}{'yes' if r['cleanup_correct'] else 'NO':>7}{r['wall_clock_ms']:>10.1f}"
+            )
+
+    return 0 if all(r['as_expected'] and r['cleanup_correct'] for r in reports) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
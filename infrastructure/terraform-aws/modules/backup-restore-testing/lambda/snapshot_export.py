@@ -0,0 +1,372 @@
+"""
+Backup Restoration Test Snapshot Export Verification
+
+Verifies a cluster snapshot without restoring it: the snapshot is exported
+to S3 as Parquet with an RDS export task, and the exported files are
+streamed to check row counts, null rates and min/max per column against
+expectations.
+
+Export layout (per RDS):
+    <export id>/<database>/<schema.table>/<partition>/part-*.parquet
+
+Files are scanned by a pool of parallel readers. Column statistics come
+from the Parquet footer where the writer recorded them, so most checks read
+no data at all; otherwise a single column of a single row group is read at
+a time, keeping memory bounded by the largest column chunk rather than the
+table size. The same code reads a local directory for testing.
+
+pyarrow is not part of the Lambda runtime and is provided by a Lambda layer
+(e.g. AWS SDK for pandas).
+
+Expectations (EXPORT_EXPECTATIONS, JSON), keyed by "schema.table" or
+"database/schema.table":
+
+    {
+      "public.patients": {
+        "min_rows": 1000,
+        "columns": {
+          "id": {"max_null_rate": 0},
+          "created_at": {"max_within_hours": 48, "min_at_least": "2019-01-01"}
+        }
+      }
+    }
+
+Author: Unified Health Platform Team
+"""
+
+import os
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, date, timedelta, timezone
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    from pyarrow import fs as pafs
+except ImportError:  # provided by a Lambda layer
+    pc = pq = pafs = None
+
+logger = logging.getLogger()
+
+EXPORT_RUNNING_STATUSES = ['STARTING', 'IN_PROGRESS']
+EXPORT_FAILED_STATUSES = ['FAILED', 'CANCELED', 'CANCELING']
+VERIFIED_MARKER = '_verified.json'
+
+
+def export_task_identifier(prefix: str, snapshot_id: str) -> str:
+    """
+    Deterministic export task ID for a snapshot, so a later invocation can
+    resume waiting on the same export instead of starting another one.
+    """
+    digest = hashlib.sha1(snapshot_id.encode('utf-8')).hexdigest()[:10]
+    readable = ''.join(c if c.isalnum() else '-' for c in snapshot_id.split(':')[-1]).strip('-')
+    head = f"{prefix}-verify-"[:60 - len(digest) - 1]
+    return f"{head}{readable}"[:60 - len(digest) - 1].rstrip('-') + f"-{digest}"
+
+
+def start_or_resume_export(
+    client: Any,
+    snapshot_arn: str,
+    task_id: str,
+    bucket: str,
+    prefix: str,
+    iam_role_arn: str,
+    kms_key_id: str,
+    export_only: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Return the export task for `task_id`, starting it if it does not exist yet"""
+    existing = client.describe_export_tasks(ExportTaskIdentifier=task_id).get('ExportTasks', [])
+    if existing:
+        logger.info(f"Resuming export task {task_id} ({existing[0]['Status']})")
+        return existing[0]
+
+    params = {
+        'ExportTaskIdentifier': task_id,
+        'SourceArn': snapshot_arn,
+        'S3BucketName': bucket,
+        'S3Prefix': prefix,
+        'IamRoleArn': iam_role_arn,
+        'KmsKeyId': kms_key_id
+    }
+    if export_only:
+        params['ExportOnly'] = export_only
+
+    logger.info(f"Starting export task {task_id} for {snapshot_arn}")
+    return client.start_export_task(**params)
+
+
+def export_uri(task: Dict[str, Any]) -> str:
+    """S3 URI under which an export task writes its files"""
+    prefix = task.get('S3Prefix', '').strip('/')
+    parts = [task['S3Bucket']] + ([prefix] if prefix else []) + [task['ExportTaskIdentifier']]
+    return 's3://' + '/'.join(parts)
+
+
+def open_export(uri: str) -> Tuple[Any, str]:
+    """Filesystem and root path for an S3 URI or a local directory"""
+    if pafs is None:
+        raise RuntimeError("pyarrow is not available; attach the pyarrow layer")
+    if uri.startswith('s3://'):
+        return pafs.FileSystem.from_uri(uri)
+    return pafs.LocalFileSystem(), os.path.abspath(uri)
+
+
+def list_export_tables(filesystem: Any, root: str) -> Dict[str, List[str]]:
+    """Parquet files of an export grouped by "database/schema.table\""""
+    tables: Dict[str, List[str]] = {}
+    selector = pafs.FileSelector(root, recursive=True)
+    for info in filesystem.get_file_info(selector):
+        if info.type != pafs.FileType.File or not info.path.endswith('.parquet'):
+            continue
+        relative = info.path[len(root):].lstrip('/').split('/')
+        if len(relative) < 3:
+            continue
+        tables.setdefault(f"{relative[0]}/{relative[1]}", []).append(info.path)
+    for files in tables.values():
+        files.sort()
+    return tables
+
+
+def qualified_name(table: str) -> str:
+    """"database/schema.table" key as "database.schema.table", the form ExportOnly uses"""
+    return table.replace('/', '.', 1)
+
+
+def selected_by(table: str, export_only: List[str]) -> bool:
+    """
+    Whether an export table key is selected by ExportOnly entries, which name
+    a database, a schema ("database.schema") or a table
+    ("database.schema.table")
+    """
+    name = qualified_name(table)
+    return any(name == entry or name.startswith(entry + '.') for entry in export_only)
+
+
+class ColumnStats:
+    """Null count and min/max of one column, mergeable across row groups and files"""
+
+    def __init__(self):
+        self.null_count = 0
+        self.min = None
+        self.max = None
+
+    def update(self, null_count: int, minimum: Any, maximum: Any):
+        self.null_count += null_count
+        if minimum is not None and (self.min is None or minimum < self.min):
+            self.min = minimum
+        if maximum is not None and (self.max is None or maximum > self.max):
+            self.max = maximum
+
+    def merge(self, other: 'ColumnStats'):
+        self.update(other.null_count, other.min, other.max)
+
+
+class TableStats:
+    """Row count and per-column statistics of one exported table"""
+
+    def __init__(self):
+        self.rows = 0
+        self.files = 0
+        self.columns: Dict[str, ColumnStats] = {}
+
+    def merge(self, other: 'TableStats'):
+        self.rows += other.rows
+        self.files += other.files
+        for name, stats in other.columns.items():
+            self.columns.setdefault(name, ColumnStats()).merge(stats)
+
+    def null_rate(self, column: str) -> Optional[float]:
+        if column not in self.columns or self.rows == 0:
+            return None
+        return self.columns[column].null_count / self.rows
+
+
+def scan_parquet_file(filesystem: Any, path: str, columns: Optional[List[str]] = None) -> TableStats:
+    """
+    Collect statistics for the top-level columns of one Parquet file.
+
+    Footer statistics are used when present; otherwise the column chunk is
+    read on its own, one row group at a time.
+    """
+    stats = TableStats()
+    with filesystem.open_input_file(path) as source:
+        parquet_file = pq.ParquetFile(source)
+        metadata = parquet_file.metadata
+        stats.rows = metadata.num_rows
+        stats.files = 1
+
+        # Leaf column index for each top-level, non-nested field
+        leaves = {}
+        for index in range(metadata.num_columns):
+            name = metadata.schema.column(index).path
+            if '.' not in name and (columns is None or name in columns):
+                leaves[name] = index
+
+        for name in leaves:
+            stats.columns[name] = ColumnStats()
+
+        for group in range(metadata.num_row_groups):
+            row_group = metadata.row_group(group)
+            for name, index in leaves.items():
+                chunk_stats = row_group.column(index).statistics
+                if chunk_stats is not None and chunk_stats.has_null_count and (
+                    chunk_stats.has_min_max or chunk_stats.null_count == row_group.num_rows
+                ):
+                    stats.columns[name].update(
+                        chunk_stats.null_count,
+                        chunk_stats.min if chunk_stats.has_min_max else None,
+                        chunk_stats.max if chunk_stats.has_min_max else None
+                    )
+                    continue
+
+                values = parquet_file.read_row_group(group, columns=[name]).column(0)
+                extremes = pc.min_max(values)
+                stats.columns[name].update(
+                    values.null_count,
+                    extremes['min'].as_py(),
+                    extremes['max'].as_py()
+                )
+
+    return stats
+
+
+def scan_export(
+    uri: str,
+    max_workers: int = 4,
+    tables: Optional[List[str]] = None
+) -> Dict[str, TableStats]:
+    """
+    Scan every Parquet file of an export with parallel readers, merged per
+    table. `tables` takes ExportOnly entries (database, database.schema or
+    database.schema.table) to limit the scan to.
+    """
+    filesystem, root = open_export(uri)
+    files_by_table = list_export_tables(filesystem, root)
+    if tables:
+        files_by_table = {
+            table: files for table, files in files_by_table.items()
+            if selected_by(table, tables)
+        }
+
+    jobs = [(table, path) for table, files in files_by_table.items() for path in files]
+    results: Dict[str, TableStats] = {table: TableStats() for table in files_by_table}
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        scanned = executor.map(lambda job: scan_parquet_file(filesystem, job[1]), jobs)
+        for (table, _), file_stats in zip(jobs, scanned):
+            results[table].merge(file_stats)
+
+    logger.info(f"Scanned {len(jobs)} Parquet files across {len(results)} tables in {uri}")
+    return results
+
+
+def _coerce(expected: Any, observed: Any) -> Any:
+    """Convert an expectation from JSON to the type of the observed value"""
+    if isinstance(observed, datetime) and isinstance(expected, str):
+        value = datetime.fromisoformat(expected)
+        if observed.tzinfo and not value.tzinfo:
+            value = value.replace(tzinfo=timezone.utc)
+        if value.tzinfo and not observed.tzinfo:
+            value = value.replace(tzinfo=None)
+        return value
+    if isinstance(observed, date) and not isinstance(observed, datetime) and isinstance(expected, str):
+        return date.fromisoformat(expected)
+    return expected
+
+
+def _check(test: str, description: str, passed: bool, value: Any) -> Dict[str, Any]:
+    return {'test': test, 'description': description, 'passed': passed, 'value': value}
+
+
+def check_expectations(
+    stats: Dict[str, TableStats],
+    expectations: Dict[str, Any],
+    reference_time: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """
+    Compare scanned statistics with expectations.
+
+    Results use the same shape as the data integrity tests. Freshness
+    checks (max_within_hours) are relative to `reference_time`, normally
+    the snapshot creation time.
+    """
+    by_name = {}
+    for table, table_stats in stats.items():
+        by_name[table] = table_stats
+        by_name.setdefault(table.split('/', 1)[1], table_stats)
+
+    checks = []
+    for table, expected in expectations.items():
+        table_stats = by_name.get(table)
+        if table_stats is None:
+            checks.append(_check(f"export_{table}_present", f"{table} present in export", False, 'missing'))
+            continue
+
+        if 'min_rows' in expected or 'max_rows' in expected:
+            low = expected.get('min_rows', 0)
+            high = expected.get('max_rows')
+            checks.append(_check(
+                f"export_{table}_rows",
+                f"{table} row count within [{low}, {high if high is not None else 'inf'}]",
+                table_stats.rows >= low and (high is None or table_stats.rows <= high),
+                table_stats.rows
+            ))
+
+        for column, rules in expected.get('columns', {}).items():
+            column_stats = table_stats.columns.get(column)
+            name = f"{table}.{column}"
+            if column_stats is None:
+                checks.append(_check(f"export_{name}_present", f"{name} present in export", False, 'missing'))
+                continue
+
+            if 'max_null_rate' in rules:
+                rate = table_stats.null_rate(column) or 0.0
+                checks.append(_check(
+                    f"export_{name}_null_rate",
+                    f"{name} null rate <= {rules['max_null_rate']}",
+                    rate <= rules['max_null_rate'],
+                    round(rate, 6)
+                ))
+
+            if 'min_at_least' in rules:
+                bound = _coerce(rules['min_at_least'], column_stats.min)
+                checks.append(_check(
+                    f"export_{name}_min",
+                    f"{name} min >= {rules['min_at_least']}",
+                    column_stats.min is not None and column_stats.min >= bound,
+                    str(column_stats.min)
+                ))
+
+            if 'max_at_most' in rules:
+                bound = _coerce(rules['max_at_most'], column_stats.max)
+                checks.append(_check(
+                    f"export_{name}_max",
+                    f"{name} max <= {rules['max_at_most']}",
+                    column_stats.max is not None and column_stats.max <= bound,
+                    str(column_stats.max)
+                ))
+
+            if 'max_within_hours' in rules:
+                reference = reference_time or datetime.now(timezone.utc)
+                latest = column_stats.max
+                if isinstance(latest, datetime) and latest.tzinfo is None:
+                    latest = latest.replace(tzinfo=timezone.utc)
+                fresh = isinstance(latest, datetime) and reference - latest <= timedelta(hours=rules['max_within_hours'])
+                checks.append(_check(
+                    f"export_{name}_freshness",
+                    f"{name} newest value within {rules['max_within_hours']}h of snapshot",
+                    fresh,
+                    str(column_stats.max)
+                ))
+
+    return checks
+
+
+def summarize_tables(stats: Dict[str, TableStats]) -> Dict[str, Any]:
+    """Compact per-table summary for the test result"""
+    return {
+        table: {'rows': table_stats.rows, 'files': table_stats.files, 'columns': len(table_stats.columns)}
+        for table, table_stats in sorted(stats.items())
+    }
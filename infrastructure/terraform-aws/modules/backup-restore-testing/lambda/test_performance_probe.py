@@ -0,0 +1,25 @@
+"""Tests for performance_probe"""
+
+import pytest
+
+from performance_probe import build_workload, steady_state_baseline, time_to_target
+
+
+def test_build_workload_rejects_identifiers_that_are_not_plain_names():
+    with pytest.raises(ValueError):
+        build_workload({'seq_scans': [{'table': 'patients; DROP TABLE patients'}]})
+
+
+def window(elapsed, seq_scan, point_lookup):
+    return {'elapsed_seconds': elapsed, 'kinds': {
+        'seq_scan': {'ops_per_second': seq_scan},
+        'point_lookup': {'ops_per_second': point_lookup},
+    }}
+
+
+def test_time_to_target_waits_for_every_kind_to_warm_up():
+    windows = [window(10, 2.0, 50.0), window(20, 9.0, 80.0), window(30, 9.5, 95.0), window(40, 10.0, 100.0)]
+    baseline = steady_state_baseline(windows)
+
+    assert baseline == {'seq_scan': 10.0, 'point_lookup': 100.0}
+    assert time_to_target(windows, baseline, 0.9) == 30
@@ -0,0 +1,200 @@
+"""Tests for the reaper's scoping and retry policy in backup_restore_test"""
+
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip('boto3')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import backup_restore_test as brt  # noqa: E402
+
+
+class NotFound(Exception):
+    pass
+
+
+class FakeExceptions:
+    DBClusterNotFoundFault = NotFound
+    DBInstanceNotFoundFault = NotFound
+
+
+class FakePaginator:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def paginate(self, **kwargs):
+        return self.pages
+
+
+class FakeRDS:
+    exceptions = FakeExceptions
+
+    def __init__(self, clusters, instances=()):
+        self.clusters = clusters
+        self.instances = list(instances)
+
+    def get_paginator(self, operation):
+        if operation == 'describe_db_clusters':
+            return FakePaginator([{'DBClusters': self.clusters}])
+        return FakePaginator([{'DBInstances': self.instances}])
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class AWSError(Exception):
+    def __init__(self, code):
+        super().__init__(code)
+        self.response = {'Error': {'Code': code}}
+
+
+def cluster(identifier, project=brt.PROJECT_NAME, environment=brt.ENVIRONMENT, **tags):
+    tag_list = [
+        {'Key': 'Purpose', 'Value': 'BackupRestoreTest'},
+        {'Key': 'Project', 'Value': project},
+        {'Key': 'Environment', 'Value': environment},
+        {'Key': 'AutoDelete', 'Value': 'true'},
+        {'Key': 'ReapAfter', 'Value': 'now'},
+    ] + [{'Key': k, 'Value': v} for k, v in tags.items()]
+    return {
+        'DBClusterIdentifier': identifier,
+        'Status': 'available',
+        'ClusterCreateTime': datetime.now(timezone.utc) - timedelta(hours=1),
+        'TagList': tag_list
+    }
+
+
+def test_reaper_only_selects_own_test_clusters():
+    own = f"{brt.test_identifier_prefix()}20240101000000"
+    client = FakeRDS(
+        [
+            cluster(own),
+            cluster('other-staging-restore-test-20240101000000', environment='staging'),
+            cluster(f"{brt.test_identifier_prefix()}x", project='someone-else'),
+            cluster('hand-made-cluster'),
+        ],
+        [{'DBInstanceIdentifier': f"{own}-instance-1", 'DBClusterIdentifier': own, 'DBInstanceStatus': 'available'}]
+    )
+
+    found = brt.find_reapable_test_resources(180, client)
+
+    assert found == {'clusters': [own], 'instances': [f"{own}-instance-1"]}
+
+
+def test_generated_identifiers_carry_the_reaper_prefix():
+    assert brt.generate_test_cluster_identifier('-p1').startswith(brt.test_identifier_prefix())
+
+
+def test_dr_identifiers_keep_the_full_timestamp_for_the_longest_regions(monkeypatch):
+    clock = FakeClock()
+    clock.now = datetime(2026, 10, 19, 12, 0, 0, tzinfo=timezone.utc).timestamp()
+    monkeypatch.setattr(brt, 'clock', clock)
+    regions = ['ap-southeast-1', 'ap-south-1', 'ap-northeast-3', 'us-gov-west-1', 'eu-west-1']
+
+    first = [brt.generate_test_cluster_identifier(f"-{brt.region_code(region)}") for region in regions]
+    clock.sleep(1)
+    second = [brt.generate_test_cluster_identifier(f"-{brt.region_code(region)}") for region in regions]
+
+    assert all(len(identifier) <= 63 for identifier in first)
+    assert first[0] == f"{brt.test_identifier_prefix()}261019120000-apse1"
+    # Unique per region and per second
+    assert len(set(first + second)) == 2 * len(regions)
+
+
+def test_identifiers_that_cannot_fit_are_rejected_rather_than_truncated():
+    with pytest.raises(ValueError):
+        brt.generate_test_cluster_identifier('-' + 'x' * 30)
+
+
+def test_backoff_gives_up_at_once_on_access_denied(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(brt, 'clock', clock)
+
+    def denied():
+        raise AWSError('AccessDenied')
+
+    assert brt._with_backoff(denied, 'Delete cluster x', deadline=600, client=FakeRDS([])) is False
+    assert clock.sleeps == []
+
+
+def test_backoff_retries_invalid_state_until_it_clears(monkeypatch):
+    monkeypatch.setattr(brt, 'clock', FakeClock())
+    attempts = []
+
+    def delete():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise AWSError('InvalidDBClusterStateFault')
+
+    assert brt._with_backoff(delete, 'Delete cluster x', deadline=10_000, client=FakeRDS([])) is True
+    assert len(attempts) == 3
+
+
+class FakeSnapshotRDS(FakeRDS):
+    def __init__(self, snapshots):
+        super().__init__([])
+        self.snapshots = snapshots
+        self.deleted = []
+
+    def get_paginator(self, operation):
+        return FakePaginator([{'DBClusterSnapshots': self.snapshots}])
+
+    def delete_db_cluster_snapshot(self, DBClusterSnapshotIdentifier):
+        self.deleted.append(DBClusterSnapshotIdentifier)
+
+
+def dr_copy(identifier, age_hours, environment=brt.ENVIRONMENT):
+    return {
+        'DBClusterSnapshotIdentifier': identifier,
+        'Status': 'available',
+        'SnapshotCreateTime': datetime.now(timezone.utc) - timedelta(hours=age_hours),
+        'TagList': [
+            {'Key': 'Purpose', 'Value': 'DRSnapshotCopy'},
+            {'Key': 'Project', 'Value': brt.PROJECT_NAME},
+            {'Key': 'Environment', 'Value': environment},
+        ]
+    }
+
+
+def test_reaper_deletes_only_expired_dr_copies_of_this_deployment(monkeypatch):
+    monkeypatch.setattr(brt, 'clock', FakeClock())
+    client = FakeSnapshotRDS([
+        dr_copy('db-dr-old', 72),
+        dr_copy('db-dr-fresh', 2),
+        dr_copy('db-dr-other-env', 72, environment='staging'),
+        {'DBClusterSnapshotIdentifier': 'hand-made', 'Status': 'available',
+         'SnapshotCreateTime': datetime.now(timezone.utc) - timedelta(days=30), 'TagList': []},
+    ])
+
+    summary = brt.reap_dr_snapshot_copies(48, deadline=600, client=client)
+
+    assert client.deleted == ['db-dr-old']
+    assert summary == {'snapshots_deleted': ['db-dr-old'], 'failed': []}
+
+
+def unreleased(test_cluster):
+    test_cluster['TagList'] = [tag for tag in test_cluster['TagList'] if tag['Key'] != 'ReapAfter']
+    return test_cluster
+
+
+def test_running_restores_count_only_this_deployments_test_clusters():
+    prefix = brt.test_identifier_prefix()
+    client = FakeRDS([
+        unreleased(cluster(f"{prefix}a")),
+        cluster(f"{prefix}b"),
+        unreleased(cluster('other-staging-restore-test-c', environment='staging')),
+        unreleased(cluster(f"{prefix}d", project='someone-else')),
+    ])
+    assert brt.count_running_restores(client) == 1
@@ -0,0 +1,69 @@
+"""Tests for restore_history"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from restore_history import HistoryStore, LocalHistoryStore, S3HistoryStore, build_timing_record, rto_summary
+
+
+def test_history_store_is_abstract():
+    with pytest.raises(TypeError):
+        HistoryStore()
+
+
+def test_rto_summary_uses_successful_runs_of_the_cluster(tmp_path):
+    store = LocalHistoryStore(str(tmp_path / 'history.ndjson'))
+    now = datetime.now(timezone.utc)
+    for rto in (600, 900, 1200):
+        store.append(build_timing_record('db-1', 'full', True, rto, {'restore': rto}, ts=now))
+    store.append(build_timing_record('db-1', 'full', False, None, {}, ts=now))
+    store.append(build_timing_record('db-2', 'full', True, 60, {}, ts=now))
+    store.append(build_timing_record('db-1', 'full', True, 5000, {}, ts=now - timedelta(days=200)))
+
+    summary = rto_summary(store, 'db-1', since=now - timedelta(days=90), test_type='full')
+
+    assert summary['runs'] == 3
+    assert summary['max_seconds'] == 1200
+
+
+class FakeBody:
+    def __init__(self, data):
+        self.data = data
+
+    def iter_lines(self):
+        return iter(self.data.splitlines())
+
+
+class FakeS3:
+    def __init__(self):
+        self.objects = {}
+        self.listed = []
+
+    def put_object(self, Bucket, Key, Body, **_):
+        self.objects[Key] = Body
+
+    def get_object(self, Bucket, Key):
+        return {'Body': FakeBody(self.objects[Key])}
+
+    def get_paginator(self, operation):
+        return self
+
+    def paginate(self, Bucket, Prefix='', StartAfter='', **_):
+        self.listed.append(Prefix)
+        keys = sorted(k for k in self.objects if k.startswith(Prefix) and k > StartAfter)
+        yield {'Contents': [{'Key': key} for key in keys]}
+
+
+def test_s3_cluster_queries_list_only_the_cluster_partitions():
+    s3 = FakeS3()
+    store = S3HistoryStore(s3, 'bucket')
+    now = datetime.now(timezone.utc)
+    store.append(build_timing_record('db-1', 'full', True, 600, {}, ts=now))
+    store.append(build_timing_record('db-1', 'full', False, None, {}, ts=now))
+    store.append(build_timing_record('db-2', 'full', True, 60, {}, ts=now))
+
+    records = list(store.iter_records(since=now - timedelta(days=1), cluster_id='db-1', status='pass'))
+
+    assert [(r['cluster'], r['success']) for r in records] == [('db-1', True)]
+    assert all('/cluster=db-1/status=pass/' in prefix for prefix in s3.listed)
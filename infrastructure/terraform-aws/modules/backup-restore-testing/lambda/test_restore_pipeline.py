@@ -0,0 +1,156 @@
+"""Tests for the restore pipeline steps in backup_restore_test"""
+
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip('boto3')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import backup_restore_test as brt  # noqa: E402
+from restore_simulator import FakeRDS, VirtualClock  # noqa: E402
+
+T0 = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+
+class PagedSnapshots:
+    """describe_db_cluster_snapshots paginator returning pages of 20"""
+
+    def __init__(self, snapshots):
+        self.snapshots = snapshots
+        self.pages = 0
+
+    def get_paginator(self, operation):
+        return self
+
+    def paginate(self, DBClusterIdentifier, SnapshotType, **_):
+        matching = [s for s in self.snapshots if s['SnapshotType'] == SnapshotType]
+        for i in range(0, len(matching), 20):
+            self.pages += 1
+            yield {'DBClusterSnapshots': matching[i:i + 20]}
+
+
+def snapshot(name, hours, snapshot_type='automated', status='available'):
+    return {
+        'DBClusterSnapshotIdentifier': name,
+        'SnapshotCreateTime': T0 + timedelta(hours=hours),
+        'SnapshotType': snapshot_type,
+        'Status': status
+    }
+
+
+def test_catalog_pages_past_twenty_snapshots_and_orders_them():
+    snapshots = [snapshot(f"auto-{h}", h) for h in range(45, 0, -1)]
+    snapshots += [snapshot('manual-early', -10, 'manual'), snapshot('manual-late', 100, 'manual')]
+    snapshots.append(snapshot('still-creating', 200, status='creating'))
+    client = PagedSnapshots(snapshots)
+
+    catalog = brt.SnapshotCatalog('db-1', client).load()
+
+    assert client.pages == 4
+    assert len(catalog) == 47
+    assert catalog.oldest()['DBClusterSnapshotIdentifier'] == 'manual-early'
+    assert catalog.latest()['DBClusterSnapshotIdentifier'] == 'manual-late'
+    # Half-open interval: the snapshot at the end time is excluded
+    assert [s['DBClusterSnapshotIdentifier'] for s in catalog.between(T0 + timedelta(hours=10), T0 + timedelta(hours=13))] == [
+        'auto-10', 'auto-11', 'auto-12'
+    ]
+    assert catalog.get('still-creating') is None
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    clock = VirtualClock(start=T0.timestamp())
+    rds = FakeRDS(clock, {'cluster_ready': 1500, 'instance_ready': 600})
+    rds.add_source_cluster('source-db')
+    watcher = brt.ResourceStatusWatcher(rds, ttl_seconds=brt.STATUS_CACHE_TTL_SECONDS)
+    monkeypatch.setattr(brt, 'clock', clock)
+    monkeypatch.setattr(brt, 'rds_client', rds)
+    monkeypatch.setattr(brt, 'status_watcher', watcher)
+    return rds
+
+
+def test_quick_clone_is_a_copy_on_write_restore_released_to_the_reaper(backend):
+    requests = []
+    restore = backend.restore_db_cluster_to_point_in_time
+
+    def recording_restore(**params):
+        requests.append(params)
+        return restore(**params)
+
+    backend.restore_db_cluster_to_point_in_time = recording_restore
+    test_cluster_id = brt.generate_test_cluster_identifier()
+
+    cluster = brt.clone_cluster('source-db', test_cluster_id, 'test-subnets', ['sg-1', ''])
+    brt.provision_test_cluster_pipelined(test_cluster_id, cluster['Engine'])
+
+    params = requests[0]
+    assert params['SourceDBClusterIdentifier'] == 'source-db'
+    assert params['RestoreType'] == 'copy-on-write'
+    assert params['UseLatestRestorableTime'] is True
+    assert 'RestoreToTime' not in params
+    assert params['VpcSecurityGroupIds'] == ['sg-1']
+    assert params['DeletionProtection'] is False
+    assert {'Key': 'Purpose', 'Value': 'BackupRestoreTest'} in params['Tags']
+
+    assert brt.release_test_resources(test_cluster_id)
+    tags = {t['Key'] for t in backend.clusters[test_cluster_id]['desc']['TagList']}
+    assert 'ReapAfter' in tags
+    assert backend.instances[f"{test_cluster_id}-instance-1"]['deleted_at'] is not None
+
+
+def test_clone_at_a_point_in_time_passes_the_target(backend):
+    requests = []
+    backend.restore_db_cluster_to_point_in_time = lambda **params: requests.append(params) or {'DBCluster': {}}
+
+    brt.clone_cluster('source-db', 'clone', 'test-subnets', ['sg-1'], restore_to_time=T0, restore_type='full-copy')
+
+    assert requests[0]['RestoreToTime'] == T0
+    assert requests[0]['RestoreType'] == 'full-copy'
+    assert 'UseLatestRestorableTime' not in requests[0]
+
+
+def test_pipelined_provisioning_creates_the_instance_before_the_cluster_is_available(backend):
+    backend.add_snapshot('source-db', 'snap-1', T0 - timedelta(hours=2))
+    test_cluster_id = brt.generate_test_cluster_identifier()
+    start = brt.clock.time()
+
+    cluster = brt.restore_cluster_from_snapshot(backend.snapshots['snap-1']['desc'], test_cluster_id, 'test-subnets', ['sg-1'])
+    timeline = brt.provision_test_cluster_pipelined(test_cluster_id, cluster['Engine'], start_time=start)
+
+    assert timeline.instance_submitted - start < 60
+    assert timeline.cluster_available - start >= 1500
+    assert timeline.instance_submitted < timeline.cluster_available <= timeline.instance_available
+    # Sequentially the instance's 600s would only start after the cluster's 1500s
+    assert timeline.time_saved_seconds > 0
+    assert backend.calls['create_db_instance'] == 1
+
+
+def test_pitr_targets_are_evenly_spaced_up_to_the_latest_restorable_time():
+    earliest, latest = T0, T0 + timedelta(days=7)
+
+    targets = brt.pitr_target_times(earliest, latest, 4)
+
+    assert targets == [earliest + timedelta(days=7 * i / 4) for i in range(1, 5)]
+    assert brt.pitr_target_times(latest, earliest, 4) == []
+    assert brt.pitr_target_times(earliest, latest, 0) == []
+
+
+def test_pitr_sweep_restores_only_inside_the_restorable_window(backend, monkeypatch):
+    targets = []
+
+    def verify(cluster_id, target_time, index, restore_type):
+        targets.append(target_time)
+        return {'target_time': target_time.isoformat(), 'success': True}
+
+    monkeypatch.setattr(brt, 'verify_point_in_time', verify)
+    source = backend.clusters['source-db']['desc']
+    result = brt.BackupRestoreTestResult()
+
+    brt.run_pitr_sweep(result, 'source-db', {'pitr_points': 5, 'max_concurrency': 2})
+
+    assert len(result.pitr_results) == 5
+    assert all(source['EarliestRestorableTime'] < t <= source['LatestRestorableTime'] for t in targets)
+    assert max(targets) == source['LatestRestorableTime']
+    assert result.rpo_lag_seconds is not None
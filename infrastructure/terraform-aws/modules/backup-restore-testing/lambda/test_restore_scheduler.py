@@ -0,0 +1,65 @@
+"""Tests for restore_scheduler"""
+
+from datetime import datetime, timedelta, timezone
+
+from restore_scheduler import (
+    PriorityScheduler, RestoreTarget, candidate_snapshots, is_eligible_cluster, overdue_intervals, run_hours
+)
+
+NOW = datetime(2026, 6, 15, tzinfo=timezone.utc)
+
+
+def target(cluster_id, last_verified, criticality='medium'):
+    overdue = overdue_intervals(NOW, criticality, last_verified)
+    return RestoreTarget(
+        cluster_id,
+        {'DBClusterSnapshotIdentifier': f"{cluster_id}-snap"},
+        criticality,
+        last_verified,
+        score=overdue,
+        estimated_hours=1.0,
+        overdue=overdue
+    )
+
+
+def test_select_leaves_targets_that_are_not_due_yet():
+    scheduler = PriorityScheduler(max_concurrent=5, monthly_budget=1000, hourly_cost=1)
+    scheduler.push(target('overdue', NOW - timedelta(days=45)))
+    scheduler.push(target('never-verified', None))
+    scheduler.push(target('verified-last-week', NOW - timedelta(days=7)))
+
+    plan = scheduler.select(running=0, month_spend=0)
+
+    assert [t.cluster_id for t in plan['selected']] == ['never-verified', 'overdue']
+    assert plan['not_due'] == 1
+
+
+def test_run_hours_is_the_wall_clock_span_not_the_sum_of_overlapping_phases():
+    record = {
+        'rto_seconds': 1800,
+        'run_seconds': 3600,
+        'phases': {'cluster_available': 1800, 'instance_available': 1500, 'verification': 300}
+    }
+    assert run_hours(record) == 1.0
+    assert run_hours(dict(record, run_seconds=None)) == 0.5
+
+
+def snapshots(*names):
+    return [{'DBClusterSnapshotIdentifier': name} for name in names]
+
+
+def test_candidates_fall_back_when_both_ends_are_verified():
+    retained = snapshots('oldest', 'middle', 'newer', 'latest')
+
+    assert candidate_snapshots(retained, {'latest'}) == snapshots('oldest')
+    assert candidate_snapshots(retained, {'oldest', 'latest'}) == snapshots('newer')
+    assert candidate_snapshots(retained, {'oldest', 'middle', 'newer', 'latest'}) == snapshots('latest')
+
+
+def test_only_aurora_clusters_are_eligible():
+    def cluster(engine):
+        return {'DBClusterIdentifier': engine, 'Engine': engine, 'Status': 'available', 'TagList': []}
+
+    eligible = [c['Engine'] for c in map(cluster, ['aurora-postgresql', 'aurora-mysql', 'docdb', 'neptune', 'postgres'])
+                if is_eligible_cluster(c)]
+    assert eligible == ['aurora-postgresql', 'aurora-mysql']
@@ -0,0 +1,44 @@
+"""Runs the restore_simulator scenarios against the fake RDS backend"""
+
+import os
+
+import pytest
+
+pytest.importorskip('boto3')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import backup_restore_test as brt  # noqa: E402
+import restore_simulator  # noqa: E402
+
+# Module state the simulator points at its fake backend and virtual clock
+PATCHED = (
+    'clock', 'rds_client', 'sns_client', 'cloudwatch_client', 's3_client', 'status_watcher',
+    'MAX_WAIT_MINUTES', 'CLEANUP_AFTER_TEST', 'SOURCE_REGION', 'DR_REGIONS'
+)
+
+
+@pytest.fixture(autouse=True)
+def restore_module_state(monkeypatch):
+    for name in PATCHED:
+        monkeypatch.setattr(brt, name, getattr(brt, name))
+    monkeypatch.setattr(brt, 'RDS_CLUSTER_IDENTIFIER', os.environ['RDS_CLUSTER_IDENTIFIER'])
+    monkeypatch.setattr(brt, '_region_watchers', {})
+    monkeypatch.delenv('HISTORY_PATH', raising=False)
+    monkeypatch.delenv('HISTORY_BUCKET', raising=False)
+
+
+@pytest.mark.parametrize('name', sorted(restore_simulator.SCENARIOS))
+def test_scenario_ends_as_expected_and_leaves_nothing_behind(name):
+    report = restore_simulator.run_scenario(name, restore_simulator.SCENARIOS[name])
+
+    assert report['success'] == restore_simulator.SCENARIOS[name]['expect_success'], report['error_message']
+    assert report['cleanup_correct'], report['leaked_resources']
+
+
+def test_quick_clone_restores_faster_than_a_full_restore():
+    full = restore_simulator.run_scenario('full_restore', restore_simulator.SCENARIOS['full_restore'])
+    quick = restore_simulator.run_scenario('quick_clone', restore_simulator.SCENARIOS['quick_clone'])
+
+    assert quick['rds_api_calls_by_operation'].get('restore_db_cluster_to_point_in_time') == 1
+    assert 'restore_db_cluster_to_point_in_time' not in full['rds_api_calls_by_operation']
+    assert quick['simulated_handler_seconds'] < full['simulated_handler_seconds']
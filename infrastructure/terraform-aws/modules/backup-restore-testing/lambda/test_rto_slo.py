@@ -0,0 +1,70 @@
+"""Tests for the RTO SLO evaluation in backup_restore_test"""
+
+import os
+
+import pytest
+
+pytest.importorskip('boto3')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import backup_restore_test as brt  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def no_history(monkeypatch):
+    monkeypatch.setattr(brt, 'open_history_store', lambda s3_client=None: None)
+
+
+def result(test_type='full', success=True, duration=None):
+    r = brt.BackupRestoreTestResult()
+    r.test_type = test_type
+    r.success = success
+    r.restore_duration_seconds = duration
+    return r
+
+
+def test_slow_restore_breaches():
+    r = result(duration=brt.RTO_SLO_MINUTES * 60 + 1)
+    brt.record_run_history(r)
+    assert r.slo_breached
+
+
+def test_restore_within_slo_is_met():
+    r = result(duration=60)
+    brt.record_run_history(r)
+    assert not r.slo_breached
+
+
+def test_failed_restore_breaches():
+    r = result(success=False)
+    brt.record_run_history(r)
+    assert r.slo_breached
+
+
+def test_failed_export_is_not_an_rto_event():
+    r = result(test_type='export', success=False)
+    brt.record_run_history(r)
+    assert not r.slo_breached
+
+
+class FakeCloudWatch:
+    def __init__(self):
+        self.metrics = []
+
+    def put_metric_data(self, Namespace, MetricData):
+        self.metrics.extend(MetricData)
+
+
+@pytest.mark.parametrize('test_type', ['full', 'quick'])
+def test_rto_metrics_carry_the_test_type(monkeypatch, test_type):
+    cloudwatch = FakeCloudWatch()
+    monkeypatch.setattr(brt, 'cloudwatch_client', cloudwatch)
+    r = result(test_type=test_type, duration=300)
+    brt.record_run_history(r)
+
+    brt.publish_metrics(r)
+
+    rto = {m['MetricName']: m['Dimensions'] for m in cloudwatch.metrics
+           if m['MetricName'] in ('RestoreTimeMinutes', 'RestoreTimeSeconds', 'RestoreSLOBreach')}
+    assert sorted(rto) == ['RestoreSLOBreach', 'RestoreTimeMinutes', 'RestoreTimeSeconds']
+    assert all({'Name': 'TestType', 'Value': test_type} in dimensions for dimensions in rto.values())
@@ -0,0 +1,31 @@
+"""Tests for snapshot_export"""
+
+import pytest
+
+from snapshot_export import scan_export, selected_by
+
+
+@pytest.mark.parametrize('entry, selected', [
+    ('appdb', True),
+    ('appdb.public', True),
+    ('appdb.public.patients', True),
+    ('appdb.public.pat', False),
+    ('appdb.audit', False),
+    ('otherdb', False),
+])
+def test_export_only_entries_select_database_schema_or_table(entry, selected):
+    assert selected_by('appdb/public.patients', [entry]) is selected
+
+
+def test_scan_export_keeps_only_selected_tables(tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    pq = pytest.importorskip('pyarrow.parquet')
+    for table in ('public.patients', 'public.visits', 'audit.events'):
+        directory = tmp_path / 'appdb' / table / '1'
+        directory.mkdir(parents=True)
+        pq.write_table(pa.table({'id': [1, 2, 3]}), str(directory / 'part-00000.parquet'))
+
+    stats = scan_export(str(tmp_path), tables=['appdb.public'])
+
+    assert sorted(stats) == ['appdb/public.patients', 'appdb/public.visits']
+    assert stats['appdb/public.patients'].rows == 3
@@ -0,0 +1,82 @@
+"""Tests for the request coalescing of ResourceStatusWatcher in backup_restore_test"""
+
+import os
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('boto3')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import backup_restore_test as brt  # noqa: E402
+
+
+class FakePaginator:
+    def __init__(self, rds, operation):
+        self.rds = rds
+        self.operation = operation
+
+    def paginate(self, Filters):
+        wanted = Filters[0]['Values']
+        if self.operation == 'describe_db_instances':
+            yield {'DBInstances': []}
+            return
+        self.rds.cluster_calls.append(wanted)
+        if len(self.rds.cluster_calls) == 1:
+            self.rds.started.set()
+            self.rds.release.wait(5)
+        yield {'DBClusters': [{'DBClusterIdentifier': c, 'Status': 'available'} for c in wanted if c in self.rds.existing]}
+
+
+class FakeRDS:
+    """Describes the clusters named in the filter; the first cluster describe blocks until released"""
+
+    def __init__(self, existing):
+        self.existing = existing
+        self.cluster_calls = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def get_paginator(self, operation):
+        return FakePaginator(self, operation)
+
+
+def test_concurrent_readers_share_one_refresh():
+    rds = FakeRDS({'a'})
+    watcher = brt.ResourceStatusWatcher(rds, ttl_seconds=60)
+    results = []
+    readers = [threading.Thread(target=lambda: results.append(watcher.cluster('a'))) for _ in range(4)]
+
+    readers[0].start()
+    rds.started.wait(5)
+    for reader in readers[1:]:
+        reader.start()
+    time.sleep(0.05)
+    rds.release.set()
+    for reader in readers:
+        reader.join(5)
+
+    assert len(rds.cluster_calls) == 1
+    assert [r['DBClusterIdentifier'] for r in results] == ['a'] * 4
+
+
+def test_follower_watching_a_new_cluster_does_not_take_the_older_refresh():
+    rds = FakeRDS({'a', 'b'})
+    watcher = brt.ResourceStatusWatcher(rds, ttl_seconds=60)
+    results = {}
+    leader = threading.Thread(target=lambda: results.update(a=watcher.cluster('a')))
+    follower = threading.Thread(target=lambda: results.update(b=watcher.cluster('b')))
+
+    leader.start()
+    rds.started.wait(5)
+    # 'b' is watched after the leader built its filter for 'a' alone
+    follower.start()
+    time.sleep(0.05)
+    rds.release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert results['a']['DBClusterIdentifier'] == 'a'
+    assert results['b'] is not None and results['b']['DBClusterIdentifier'] == 'b'
+    assert rds.cluster_calls == [['a'], ['a', 'b']]
@@ -9,11 +9,64 @@
 locals {
   name = var.region_name != "" ? "${var.project_name}-${var.environment}-${var.region_name}" : "${var.project_name}-${var.environment}"
 
-  lambda_function_name = "${local.name}-backup-restore-test"
+  lambda_function_name    = "${local.name}-backup-restore-test"
+  reaper_function_name    = "${local.name}-backup-restore-reaper"
+  scheduler_function_name = "${local.name}-backup-restore-scheduler"
 
   tags = merge(var.tags, {
     Module = "backup-restore-testing"
   })
+
+  # Restore-test permissions in each DR region (cross-region copy and restore)
+  dr_policy_statements = length(var.dr_regions) == 0 ? [] : concat([
+    {
+      Sid    = "RDSDRRestorePermissions"
+      Effect = "Allow"
+      Action = [
+        "rds:CopyDBClusterSnapshot",
+        "rds:RestoreDBClusterFromSnapshot",
+        "rds:CreateDBInstance",
+        "rds:DeleteDBCluster",
+        "rds:DeleteDBInstance",
+        "rds:AddTagsToResource"
+      ]
+      Resource = flatten([
+        for dr in var.dr_regions : [
+          "arn:${data.aws_partition.current.partition}:rds:${dr.region}:${data.aws_caller_identity.current.account_id}:cluster:${local.name}-restore-test-*",
+          "arn:${data.aws_partition.current.partition}:rds:${dr.region}:${data.aws_caller_identity.current.account_id}:db:${local.name}-restore-test-*",
+          "arn:${data.aws_partition.current.partition}:rds:${dr.region}:${data.aws_caller_identity.current.account_id}:cluster-snapshot:*",
+          "arn:${data.aws_partition.current.partition}:rds:${dr.region}:${data.aws_caller_identity.current.account_id}:subgrp:*",
+          "arn:${data.aws_partition.current.partition}:rds:${dr.region}:${data.aws_caller_identity.current.account_id}:cluster-pg:*",
+          "arn:${data.aws_partition.current.partition}:rds:${dr.region}:${data.aws_caller_identity.current.account_id}:pg:*"
+        ]
+      ])
+    },
+    {
+      # The reaper deletes expired DR snapshot copies; only copies this module tagged
+      Sid      = "RDSDRSnapshotCopyCleanup"
+      Effect   = "Allow"
+      Action   = ["rds:DeleteDBClusterSnapshot"]
+      Resource = [for dr in var.dr_regions : "arn:${data.aws_partition.current.partition}:rds:${dr.region}:${data.aws_caller_identity.current.account_id}:cluster-snapshot:*"]
+      Condition = {
+        StringEquals = {
+          "aws:ResourceTag/Purpose"     = "DRSnapshotCopy"
+          "aws:ResourceTag/Project"     = var.project_name
+          "aws:ResourceTag/Environment" = var.environment
+        }
+      }
+    }
+    ], [for dr in var.dr_regions : {
+      Sid    = "KMSDRPermissions${replace(title(dr.region), "-", "")}"
+      Effect = "Allow"
+      Action = [
+        "kms:Decrypt",
+        "kms:Encrypt",
+        "kms:GenerateDataKey",
+        "kms:DescribeKey",
+        "kms:CreateGrant"
+      ]
+      Resource = [dr.kms_key_id]
+  } if dr.kms_key_id != ""])
 }
 
 # ============================================
@@ -179,6 +232,140 @@ resource "aws_kms_alias" "backup_test" {
   target_key_id = aws_kms_key.backup_test[0].key_id
 }
 
+# ============================================
+# S3 Bucket for Restore Test History
+# ============================================
+
+resource "aws_s3_bucket" "restore_history" {
+  bucket = "${local.name}-backup-restore-history-${data.aws_caller_identity.current.account_id}"
+
+  tags = merge(local.tags, {
+    Name    = "${local.name}-backup-restore-history"
+    Purpose = "Backup Restore Test History"
+  })
+}
+
+resource "aws_s3_bucket_server_side_encryption_configuration" "restore_history" {
+  bucket = aws_s3_bucket.restore_history.id
+
+  rule {
+    apply_server_side_encryption_by_default {
+      kms_master_key_id = var.kms_key_arn != "" ? var.kms_key_arn : aws_kms_key.backup_test[0].arn
+      sse_algorithm     = "aws:kms"
+    }
+    bucket_key_enabled = true
+  }
+}
+
+resource "aws_s3_bucket_public_access_block" "restore_history" {
+  bucket = aws_s3_bucket.restore_history.id
+
+  block_public_acls       = true
+  block_public_policy     = true
+  ignore_public_acls      = true
+  restrict_public_buckets = true
+}
+
+resource "aws_s3_bucket_lifecycle_configuration" "restore_history" {
+  bucket = aws_s3_bucket.restore_history.id
+
+  rule {
+    id     = "restore-history-retention"
+    status = "Enabled"
+
+    filter {}
+
+    transition {
+      days          = 90
+      storage_class = "STANDARD_IA"
+    }
+
+    expiration {
+      days = var.history_retention_days
+    }
+  }
+
+  # Snapshot exports are only needed until they have been verified
+  rule {
+    id     = "snapshot-export-retention"
+    status = "Enabled"
+
+    filter {
+      prefix = "snapshot-exports/"
+    }
+
+    expiration {
+      days = var.export_retention_days
+    }
+  }
+}
+
+# ============================================
+# IAM Role for Snapshot Export
+# ============================================
+# Assumed by the RDS export service to write snapshot exports as Parquet
+# into the history bucket.
+
+resource "aws_iam_role" "snapshot_export" {
+  name = "${local.name}-snapshot-export-role"
+
+  assume_role_policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Action = "sts:AssumeRole"
+        Effect = "Allow"
+        Principal = {
+          Service = "export.rds.amazonaws.com"
+        }
+      }
+    ]
+  })
+
+  tags = local.tags
+}
+
+resource "aws_iam_role_policy" "snapshot_export" {
+  name = "${local.name}-snapshot-export-policy"
+  role = aws_iam_role.snapshot_export.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Sid    = "ExportWrite"
+        Effect = "Allow"
+        Action = [
+          "s3:PutObject*",
+          "s3:GetObject*",
+          "s3:DeleteObject*"
+        ]
+        Resource = "${aws_s3_bucket.restore_history.arn}/snapshot-exports/*"
+      },
+      {
+        Sid    = "ExportBucket"
+        Effect = "Allow"
+        Action = [
+          "s3:ListBucket",
+          "s3:GetBucketLocation"
+        ]
+        Resource = aws_s3_bucket.restore_history.arn
+      },
+      {
+        Sid    = "ExportEncryption"
+        Effect = "Allow"
+        Action = [
+          "kms:Encrypt",
+          "kms:GenerateDataKey",
+          "kms:Decrypt",
+          "kms:DescribeKey"
+        ]
+        Resource = var.kms_key_arn != "" ? [var.kms_key_arn] : [aws_kms_key.backup_test[0].arn]
+      }
+    ]
+  })
+}
+
 # ============================================
 # IAM Role for Lambda Function
 # ============================================
@@ -208,7 +395,7 @@ resource "aws_iam_role_policy" "backup_restore_test" {
 
   policy = jsonencode({
     Version = "2012-10-17"
-    Statement = [
+    Statement = concat([
       # RDS Permissions for snapshot restoration
       {
         Sid    = "RDSReadPermissions"
@@ -230,7 +417,9 @@ resource "aws_iam_role_policy" "backup_restore_test" {
         Effect = "Allow"
         Action = [
           "rds:RestoreDBClusterFromSnapshot",
+          "rds:RestoreDBClusterToPointInTime",
           "rds:RestoreDBInstanceFromDBSnapshot",
+          "rds:CopyDBClusterSnapshot",
           "rds:CreateDBInstance",
           "rds:CreateDBCluster",
           "rds:DeleteDBCluster",
@@ -242,6 +431,7 @@ resource "aws_iam_role_policy" "backup_restore_test" {
         Resource = [
           "arn:${data.aws_partition.current.partition}:rds:${data.aws_region.current.name}:${data.aws_caller_identity.current.account_id}:cluster:${local.name}-restore-test-*",
           "arn:${data.aws_partition.current.partition}:rds:${data.aws_region.current.name}:${data.aws_caller_identity.current.account_id}:db:${local.name}-restore-test-*",
+          "arn:${data.aws_partition.current.partition}:rds:${data.aws_region.current.name}:${data.aws_caller_identity.current.account_id}:cluster:${var.rds_cluster_identifier}",
           "arn:${data.aws_partition.current.partition}:rds:${data.aws_region.current.name}:${data.aws_caller_identity.current.account_id}:cluster-snapshot:*",
           "arn:${data.aws_partition.current.partition}:rds:${data.aws_region.current.name}:${data.aws_caller_identity.current.account_id}:snapshot:*",
           "arn:${data.aws_partition.current.partition}:rds:${data.aws_region.current.name}:${data.aws_caller_identity.current.account_id}:subgrp:*",
@@ -309,8 +499,57 @@ resource "aws_iam_role_policy" "backup_restore_test" {
         ]
         Resource = [
           "arn:${data.aws_partition.current.partition}:logs:${data.aws_region.current.name}:${data.aws_caller_identity.current.account_id}:log-group:/aws/lambda/${local.lambda_function_name}",
-          "arn:${data.aws_partition.current.partition}:logs:${data.aws_region.current.name}:${data.aws_caller_identity.current.account_id}:log-group:/aws/lambda/${local.lambda_function_name}:*"
+          "arn:${data.aws_partition.current.partition}:logs:${data.aws_region.current.name}:${data.aws_caller_identity.current.account_id}:log-group:/aws/lambda/${local.lambda_function_name}:*",
+          "arn:${data.aws_partition.current.partition}:logs:${data.aws_region.current.name}:${data.aws_caller_identity.current.account_id}:log-group:/aws/lambda/${local.reaper_function_name}",
+          "arn:${data.aws_partition.current.partition}:logs:${data.aws_region.current.name}:${data.aws_caller_identity.current.account_id}:log-group:/aws/lambda/${local.reaper_function_name}:*",
+          "arn:${data.aws_partition.current.partition}:logs:${data.aws_region.current.name}:${data.aws_caller_identity.current.account_id}:log-group:/aws/lambda/${local.scheduler_function_name}",
+          "arn:${data.aws_partition.current.partition}:logs:${data.aws_region.current.name}:${data.aws_caller_identity.current.account_id}:log-group:/aws/lambda/${local.scheduler_function_name}:*"
+        ]
+      },
+      # Scheduler dispatches restore tests to the test function
+      {
+        Sid      = "SchedulerInvokeTest"
+        Effect   = "Allow"
+        Action   = "lambda:InvokeFunction"
+        Resource = "arn:${data.aws_partition.current.partition}:lambda:${data.aws_region.current.name}:${data.aws_caller_identity.current.account_id}:function:${local.lambda_function_name}"
+      },
+      # Snapshot export to S3 for restore-free verification
+      {
+        Sid    = "SnapshotExportPermissions"
+        Effect = "Allow"
+        Action = [
+          "rds:StartExportTask",
+          "rds:DescribeExportTasks",
+          "rds:CancelExportTask"
+        ]
+        Resource = "*"
+      },
+      {
+        Sid      = "SnapshotExportPassRole"
+        Effect   = "Allow"
+        Action   = "iam:PassRole"
+        Resource = aws_iam_role.snapshot_export.arn
+        Condition = {
+          StringEquals = {
+            "iam:PassedToService" = "export.rds.amazonaws.com"
+          }
+        }
+      },
+      # S3 Permissions for the run history store
+      {
+        Sid    = "HistoryStorePermissions"
+        Effect = "Allow"
+        Action = [
+          "s3:PutObject",
+          "s3:GetObject"
         ]
+        Resource = "${aws_s3_bucket.restore_history.arn}/*"
+      },
+      {
+        Sid      = "HistoryStoreList"
+        Effect   = "Allow"
+        Action   = "s3:ListBucket"
+        Resource = aws_s3_bucket.restore_history.arn
       },
       # CloudWatch Metrics Permissions
       {
@@ -352,7 +591,7 @@ resource "aws_iam_role_policy" "backup_restore_test" {
           }
         }
       }
-    ]
+    ], local.dr_policy_statements)
   })
 }
 
@@ -368,6 +607,24 @@ resource "aws_cloudwatch_log_group" "backup_restore_test" {
   tags = local.tags
 }
 
+resource "aws_cloudwatch_log_group" "backup_restore_reaper" {
+  name              = "/aws/lambda/${local.reaper_function_name}"
+  retention_in_days = var.log_retention_days
+  kms_key_id        = var.kms_key_arn != "" ? var.kms_key_arn : aws_kms_key.backup_test[0].arn
+
+  tags = local.tags
+}
+
+resource "aws_cloudwatch_log_group" "backup_restore_scheduler" {
+  count = var.enable_priority_scheduling ? 1 : 0
+
+  name              = "/aws/lambda/${local.scheduler_function_name}"
+  retention_in_days = var.log_retention_days
+  kms_key_id        = var.kms_key_arn != "" ? var.kms_key_arn : aws_kms_key.backup_test[0].arn
+
+  tags = local.tags
+}
+
 # ============================================
 # Lambda Function
 # ============================================
@@ -380,6 +637,26 @@ data "archive_file" "backup_restore_test" {
     content  = file("${path.module}/lambda/backup_restore_test.py")
     filename = "backup_restore_test.py"
   }
+
+  source {
+    content  = file("${path.module}/lambda/restore_history.py")
+    filename = "restore_history.py"
+  }
+
+  source {
+    content  = file("${path.module}/lambda/performance_probe.py")
+    filename = "performance_probe.py"
+  }
+
+  source {
+    content  = file("${path.module}/lambda/snapshot_export.py")
+    filename = "snapshot_export.py"
+  }
+
+  source {
+    content  = file("${path.module}/lambda/restore_scheduler.py")
+    filename = "restore_scheduler.py"
+  }
 }
 
 resource "aws_lambda_function" "backup_restore_test" {
@@ -404,9 +681,35 @@ resource "aws_lambda_function" "backup_restore_test" {
       TEST_QUERIES           = jsonencode(var.test_queries)
       CLEANUP_AFTER_TEST     = tostring(var.cleanup_after_test)
       MAX_WAIT_MINUTES       = tostring(var.max_wait_minutes)
+      TEST_INSTANCE_CLASS    = var.test_instance_class
+      HISTORY_BUCKET         = aws_s3_bucket.restore_history.id
+      HISTORY_PREFIX         = "restore-history"
+      RTO_SLO_MINUTES        = tostring(var.restore_time_alarm_threshold)
+      RTO_HISTORY_DAYS       = tostring(var.rto_history_days)
+      PITR_SWEEP_POINTS      = tostring(var.pitr_sweep_points)
+      PITR_MAX_CONCURRENCY   = tostring(var.pitr_max_concurrency)
+      DR_REGIONS             = jsonencode(var.dr_regions)
+
+      DB_CREDENTIALS_SECRET       = var.db_credentials_secret_name
+      PERF_PROBE_ENABLED          = tostring(var.enable_performance_probe)
+      PERF_PROBE_WORKLOAD         = jsonencode(var.performance_probe_workload)
+      PERF_PROBE_BASELINE         = jsonencode(var.performance_probe_baseline)
+      PERF_PROBE_TARGET_FRACTION  = tostring(var.performance_probe_target_fraction)
+      PERF_PROBE_DURATION_SECONDS = tostring(var.performance_probe_duration_seconds)
+
+      EXPORT_BUCKET           = aws_s3_bucket.restore_history.id
+      EXPORT_PREFIX           = "snapshot-exports"
+      EXPORT_IAM_ROLE_ARN     = aws_iam_role.snapshot_export.arn
+      EXPORT_KMS_KEY_ID       = var.kms_key_arn != "" ? var.kms_key_arn : aws_kms_key.backup_test[0].arn
+      EXPORT_ONLY             = jsonencode(var.export_only_tables)
+      EXPORT_EXPECTATIONS     = jsonencode(var.export_expectations)
+      EXPORT_MAX_WAIT_MINUTES = tostring(var.export_max_wait_minutes)
     }
   }
 
+  # Database drivers for the performance probe and pyarrow for export checks
+  layers = concat(var.db_driver_layer_arns, var.pyarrow_layer_arns)
+
   # VPC configuration for database connectivity testing
   dynamic "vpc_config" {
     for_each = length(var.vpc_subnet_ids) > 0 ? [1] : []
@@ -426,6 +729,142 @@ resource "aws_lambda_function" "backup_restore_test" {
   })
 }
 
+# ============================================
+# Reaper Lambda Function
+# ============================================
+# Deletes released or abandoned restore-test clusters by tag on its own
+# schedule, so test runs do not block on resource deletion.
+
+resource "aws_lambda_function" "backup_restore_reaper" {
+  filename         = data.archive_file.backup_restore_test.output_path
+  function_name    = local.reaper_function_name
+  role             = aws_iam_role.backup_restore_test.arn
+  handler          = "backup_restore_test.reaper_handler"
+  source_code_hash = data.archive_file.backup_restore_test.output_base64sha256
+  runtime          = "python3.11"
+  timeout          = 300
+  memory_size      = 256
+
+  environment {
+    variables = {
+      PROJECT_NAME           = var.project_name
+      ENVIRONMENT            = var.environment
+      REGION_NAME            = var.region_name
+      REAPER_MAX_AGE_MINUTES = tostring(var.reaper_max_age_minutes)
+      DR_REGIONS             = jsonencode(var.dr_regions)
+    }
+  }
+
+  depends_on = [
+    aws_cloudwatch_log_group.backup_restore_reaper,
+    aws_iam_role_policy.backup_restore_test
+  ]
+
+  tags = merge(local.tags, {
+    Name = local.reaper_function_name
+  })
+}
+
+resource "aws_cloudwatch_event_rule" "backup_restore_reaper" {
+  name                = "${local.name}-backup-restore-reaper-schedule"
+  description         = "Periodic cleanup of backup restoration test resources"
+  schedule_expression = var.reaper_schedule
+
+  tags = local.tags
+}
+
+resource "aws_cloudwatch_event_target" "backup_restore_reaper" {
+  rule      = aws_cloudwatch_event_rule.backup_restore_reaper.name
+  target_id = "backup-restore-reaper-lambda"
+  arn       = aws_lambda_function.backup_restore_reaper.arn
+
+  input = jsonencode({
+    source = "scheduled"
+  })
+}
+
+resource "aws_lambda_permission" "backup_restore_reaper" {
+  statement_id  = "AllowCloudWatchEvents"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.backup_restore_reaper.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.backup_restore_reaper.arn
+}
+
+# ============================================
+# Scheduler Lambda Function
+# ============================================
+# Picks the most overdue clusters and snapshots across the fleet and
+# dispatches restore tests to them within the concurrency and cost budgets.
+
+resource "aws_lambda_function" "backup_restore_scheduler" {
+  count = var.enable_priority_scheduling ? 1 : 0
+
+  filename         = data.archive_file.backup_restore_test.output_path
+  function_name    = local.scheduler_function_name
+  role             = aws_iam_role.backup_restore_test.arn
+  handler          = "backup_restore_test.scheduler_handler"
+  source_code_hash = data.archive_file.backup_restore_test.output_base64sha256
+  runtime          = "python3.11"
+  timeout          = 300
+  memory_size      = 256
+
+  environment {
+    variables = {
+      PROJECT_NAME               = var.project_name
+      ENVIRONMENT                = var.environment
+      REGION_NAME                = var.region_name
+      TEST_FUNCTION_NAME         = aws_lambda_function.backup_restore_test.function_name
+      HISTORY_BUCKET             = aws_s3_bucket.restore_history.id
+      HISTORY_PREFIX             = "restore-history"
+      MAX_CONCURRENT_RESTORES    = tostring(var.max_concurrent_restores)
+      RESTORE_MONTHLY_BUDGET_USD = tostring(var.restore_monthly_budget_usd)
+      RESTORE_HOURLY_COST_USD    = tostring(var.restore_hourly_cost_usd)
+    }
+  }
+
+  depends_on = [
+    aws_cloudwatch_log_group.backup_restore_scheduler,
+    aws_iam_role_policy.backup_restore_test
+  ]
+
+  tags = merge(local.tags, {
+    Name = local.scheduler_function_name
+  })
+}
+
+resource "aws_cloudwatch_event_rule" "backup_restore_scheduler" {
+  count = var.enable_priority_scheduling ? 1 : 0
+
+  name                = "${local.name}-backup-restore-scheduler-schedule"
+  description         = "Staleness-priority dispatch of backup restoration tests"
+  schedule_expression = var.priority_schedule
+
+  tags = local.tags
+}
+
+resource "aws_cloudwatch_event_target" "backup_restore_scheduler" {
+  count = var.enable_priority_scheduling ? 1 : 0
+
+  rule      = aws_cloudwatch_event_rule.backup_restore_scheduler[0].name
+  target_id = "backup-restore-scheduler-lambda"
+  arn       = aws_lambda_function.backup_restore_scheduler[0].arn
+
+  input = jsonencode({
+    source = "scheduled"
+  })
+}
+
+resource "aws_lambda_permission" "backup_restore_scheduler" {
+  count = var.enable_priority_scheduling ? 1 : 0
+
+  statement_id  = "AllowCloudWatchEvents"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.backup_restore_scheduler[0].function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.backup_restore_scheduler[0].arn
+}
+
 # ============================================
 # CloudWatch Events Rule (Monthly Schedule)
 # ============================================
@@ -458,6 +897,119 @@ resource "aws_lambda_permission" "backup_restore_test" {
   source_arn    = aws_cloudwatch_event_rule.backup_restore_test.arn
 }
 
+# ============================================
+# CloudWatch Events Rule (Quick Clone Schedule)
+# ============================================
+
+resource "aws_cloudwatch_event_rule" "backup_restore_quick_test" {
+  count = var.enable_quick_testing ? 1 : 0
+
+  name                = "${local.name}-backup-restore-quick-test-schedule"
+  description         = "Frequent trigger for copy-on-write clone verification"
+  schedule_expression = var.quick_test_schedule
+
+  tags = local.tags
+}
+
+resource "aws_cloudwatch_event_target" "backup_restore_quick_test" {
+  count = var.enable_quick_testing ? 1 : 0
+
+  rule      = aws_cloudwatch_event_rule.backup_restore_quick_test[0].name
+  target_id = "backup-restore-quick-test-lambda"
+  arn       = aws_lambda_function.backup_restore_test.arn
+
+  input = jsonencode({
+    source    = "scheduled"
+    test_type = "quick"
+  })
+}
+
+resource "aws_lambda_permission" "backup_restore_quick_test" {
+  count = var.enable_quick_testing ? 1 : 0
+
+  statement_id  = "AllowCloudWatchEventsQuickTest"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.backup_restore_test.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.backup_restore_quick_test[0].arn
+}
+
+# ============================================
+# CloudWatch Events Rule (Point-in-Time Restore Sweep)
+# ============================================
+
+resource "aws_cloudwatch_event_rule" "backup_restore_pitr_sweep" {
+  count = var.enable_pitr_sweep ? 1 : 0
+
+  name                = "${local.name}-backup-restore-pitr-sweep-schedule"
+  description         = "Trigger for point-in-time restore sweeps across the retention window"
+  schedule_expression = var.pitr_sweep_schedule
+
+  tags = local.tags
+}
+
+resource "aws_cloudwatch_event_target" "backup_restore_pitr_sweep" {
+  count = var.enable_pitr_sweep ? 1 : 0
+
+  rule      = aws_cloudwatch_event_rule.backup_restore_pitr_sweep[0].name
+  target_id = "backup-restore-pitr-sweep-lambda"
+  arn       = aws_lambda_function.backup_restore_test.arn
+
+  input = jsonencode({
+    source    = "scheduled"
+    test_type = "pitr_sweep"
+  })
+}
+
+resource "aws_lambda_permission" "backup_restore_pitr_sweep" {
+  count = var.enable_pitr_sweep ? 1 : 0
+
+  statement_id  = "AllowCloudWatchEventsPitrSweep"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.backup_restore_test.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.backup_restore_pitr_sweep[0].arn
+}
+
+# ============================================
+# Snapshot Export Verification Schedule
+# ============================================
+# Exports usually take longer than one invocation; each run resumes the
+# export of the selected snapshot and verifies it once it is complete.
+
+resource "aws_cloudwatch_event_rule" "backup_restore_export" {
+  count = var.enable_export_verification ? 1 : 0
+
+  name                = "${local.name}-backup-restore-export-schedule"
+  description         = "Trigger for snapshot export verification"
+  schedule_expression = var.export_verification_schedule
+
+  tags = local.tags
+}
+
+resource "aws_cloudwatch_event_target" "backup_restore_export" {
+  count = var.enable_export_verification ? 1 : 0
+
+  rule      = aws_cloudwatch_event_rule.backup_restore_export[0].name
+  target_id = "backup-restore-export-lambda"
+  arn       = aws_lambda_function.backup_restore_test.arn
+
+  input = jsonencode({
+    source    = "scheduled"
+    test_type = "export"
+  })
+}
+
+resource "aws_lambda_permission" "backup_restore_export" {
+  count = var.enable_export_verification ? 1 : 0
+
+  statement_id  = "AllowCloudWatchEventsExport"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.backup_restore_test.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.backup_restore_export[0].arn
+}
+
 # ============================================
 # CloudWatch Alarms
 # ============================================
@@ -523,10 +1075,37 @@ resource "aws_cloudwatch_metric_alarm" "restore_time_high" {
   alarm_actions       = [aws_sns_topic.backup_test_notifications.arn]
   treat_missing_data  = "notBreaching"
 
+  # Full snapshot restores only; quick clones are not a measure of the RTO
+  dimensions = {
+    Project     = var.project_name
+    Environment = var.environment
+    Region      = var.region_name
+    TestType    = "full"
+  }
+
+  tags = local.tags
+}
+
+# Alarm for RTO SLO breaches (slow or failed full restores)
+resource "aws_cloudwatch_metric_alarm" "restore_slo_breach" {
+  alarm_name          = "${local.name}-backup-restore-slo-breach"
+  comparison_operator = "GreaterThanThreshold"
+  evaluation_periods  = 1
+  metric_name         = "RestoreSLOBreach"
+  namespace           = "UnifiedHealth/BackupRestoreTesting"
+  period              = 86400 # 24 hours
+  statistic           = "Sum"
+  threshold           = 0
+  alarm_description   = "Backup restoration missed the RTO SLO - the recovery time objective is not being met"
+  alarm_actions       = [aws_sns_topic.backup_test_notifications.arn]
+  ok_actions          = [aws_sns_topic.backup_test_notifications.arn]
+  treat_missing_data  = "notBreaching"
+
   dimensions = {
     Project     = var.project_name
     Environment = var.environment
     Region      = var.region_name
+    TestType    = "full"
   }
 
   tags = local.tags
@@ -597,7 +1176,7 @@ resource "aws_cloudwatch_dashboard" "backup_restore_testing" {
           stacked = false
           region  = data.aws_region.current.name
           metrics = [
-            ["UnifiedHealth/BackupRestoreTesting", "RestoreTimeMinutes", "Project", var.project_name, "Environment", var.environment, "Region", var.region_name]
+            ["UnifiedHealth/BackupRestoreTesting", "RestoreTimeMinutes", "Project", var.project_name, "Environment", var.environment, "Region", var.region_name, "TestType", "full"]
           ]
           period = 86400
           stat   = "Average"
@@ -643,6 +1222,7 @@ resource "aws_cloudwatch_dashboard" "backup_restore_testing" {
             aws_cloudwatch_metric_alarm.restore_test_failure.arn,
             aws_cloudwatch_metric_alarm.restore_test_missed.arn,
             aws_cloudwatch_metric_alarm.restore_time_high.arn,
+            aws_cloudwatch_metric_alarm.restore_slo_breach.arn,
             aws_cloudwatch_metric_alarm.data_integrity_failure.arn
           ]
         }
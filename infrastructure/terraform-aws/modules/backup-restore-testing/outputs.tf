@@ -16,11 +16,26 @@ output "lambda_function_name" {
   value       = aws_lambda_function.backup_restore_test.function_name
 }
 
+output "reaper_function_name" {
+  description = "Name of the test resource reaper Lambda function"
+  value       = aws_lambda_function.backup_restore_reaper.function_name
+}
+
+output "scheduler_function_name" {
+  description = "Name of the priority scheduler Lambda function (null when disabled)"
+  value       = var.enable_priority_scheduling ? aws_lambda_function.backup_restore_scheduler[0].function_name : null
+}
+
 output "lambda_role_arn" {
   description = "ARN of the Lambda IAM role"
   value       = aws_iam_role.backup_restore_test.arn
 }
 
+output "history_bucket_name" {
+  description = "S3 bucket holding the restore test run history"
+  value       = aws_s3_bucket.restore_history.id
+}
+
 # ============================================
 # SNS Topic Outputs
 # ============================================
@@ -64,6 +79,7 @@ output "alarm_arns" {
     restore_test_failure = aws_cloudwatch_metric_alarm.restore_test_failure.arn
     restore_test_missed  = aws_cloudwatch_metric_alarm.restore_test_missed.arn
     restore_time_high    = aws_cloudwatch_metric_alarm.restore_time_high.arn
+    restore_slo_breach   = aws_cloudwatch_metric_alarm.restore_slo_breach.arn
     data_integrity       = aws_cloudwatch_metric_alarm.data_integrity_failure.arn
   }
 }
@@ -74,6 +90,7 @@ output "alarm_names" {
     restore_test_failure = aws_cloudwatch_metric_alarm.restore_test_failure.alarm_name
     restore_test_missed  = aws_cloudwatch_metric_alarm.restore_test_missed.alarm_name
     restore_time_high    = aws_cloudwatch_metric_alarm.restore_time_high.alarm_name
+    restore_slo_breach   = aws_cloudwatch_metric_alarm.restore_slo_breach.alarm_name
     data_integrity       = aws_cloudwatch_metric_alarm.data_integrity_failure.alarm_name
   }
 }
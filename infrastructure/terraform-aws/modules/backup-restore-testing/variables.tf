@@ -49,6 +49,17 @@ variable "vpc_security_group_ids" {
   default     = []
 }
 
+variable "dr_regions" {
+  description = "DR regions to copy snapshots to and test restores in (test_type = dr)"
+  type = list(object({
+    region             = string
+    db_subnet_group    = string
+    security_group_ids = list(string)
+    kms_key_id         = optional(string, "")
+  }))
+  default = []
+}
+
 # ============================================
 # Testing Configuration
 # ============================================
@@ -65,6 +76,89 @@ variable "enable_scheduled_testing" {
   default     = true
 }
 
+variable "enable_quick_testing" {
+  description = "Enable scheduled quick tests using copy-on-write clones of the live cluster"
+  type        = bool
+  default     = false
+}
+
+variable "quick_test_schedule" {
+  description = "CloudWatch Events schedule expression for quick clone tests"
+  type        = string
+  default     = "rate(1 hour)"
+}
+
+variable "enable_pitr_sweep" {
+  description = "Enable scheduled point-in-time restore sweeps"
+  type        = bool
+  default     = false
+}
+
+variable "pitr_sweep_schedule" {
+  description = "CloudWatch Events schedule expression for point-in-time restore sweeps"
+  type        = string
+  default     = "cron(0 4 ? * SUN *)" # 4 AM UTC every Sunday
+}
+
+variable "pitr_sweep_points" {
+  description = "Number of restore target times spread across the retention window"
+  type        = number
+  default     = 4
+}
+
+variable "pitr_max_concurrency" {
+  description = "Maximum number of point-in-time restores running in parallel"
+  type        = number
+  default     = 2
+
+  validation {
+    condition     = var.pitr_max_concurrency >= 1 && var.pitr_max_concurrency <= 10
+    error_message = "PITR max concurrency must be between 1 and 10."
+  }
+}
+
+variable "enable_export_verification" {
+  description = "Enable scheduled snapshot export verification (test_type = export)"
+  type        = bool
+  default     = false
+}
+
+variable "export_verification_schedule" {
+  description = "Schedule for export verification; runs resume an in-progress export, so it should repeat while one is running"
+  type        = string
+  default     = "rate(1 hour)"
+}
+
+variable "export_only_tables" {
+  description = "Tables to export (database, database.schema or database.schema.table); empty exports everything"
+  type        = list(string)
+  default     = []
+}
+
+variable "export_expectations" {
+  description = "Per-table expectations for export verification: min_rows, max_rows and per-column max_null_rate, min_at_least, max_at_most, max_within_hours"
+  type        = any
+  default     = {}
+}
+
+variable "export_max_wait_minutes" {
+  description = "Minutes a single run waits for an export before leaving it to the next run"
+  type        = number
+  default     = 10
+}
+
+variable "export_retention_days" {
+  description = "Days to keep snapshot exports in S3"
+  type        = number
+  default     = 7
+}
+
+variable "pyarrow_layer_arns" {
+  description = "Lambda layer ARNs providing pyarrow for Parquet export verification"
+  type        = list(string)
+  default     = []
+}
+
 variable "test_queries" {
   description = "List of SQL queries to run for data integrity verification"
   type        = list(string)
@@ -77,12 +171,129 @@ variable "test_queries" {
   ]
 }
 
+variable "db_credentials_secret_name" {
+  description = "Secrets Manager secret (JSON with username/password/dbname) for connecting to restored clusters"
+  type        = string
+  default     = ""
+}
+
+variable "enable_performance_probe" {
+  description = "Run the post-restore cold-read performance probe after full and quick tests"
+  type        = bool
+  default     = false
+}
+
+variable "performance_probe_workload" {
+  description = "Probe read workload: seq_scans [{table}], point_lookups [{table, key_column, min_key, max_key}] and concurrency"
+  type = object({
+    seq_scans = optional(list(object({
+      table = string
+    })), [])
+    point_lookups = optional(list(object({
+      table      = string
+      key_column = optional(string, "id")
+      min_key    = optional(number, 1)
+      max_key    = number
+    })), [])
+    concurrency = optional(number, 2)
+  })
+  default = {
+    seq_scans = [
+      { table = "appointments" }
+    ]
+    point_lookups = [
+      { table = "patients", key_column = "id", max_key = 1000000 }
+    ]
+  }
+}
+
+variable "performance_probe_baseline" {
+  description = "Baseline throughput in ops/s per workload kind (seq_scan, point_lookup); empty uses the probe's own steady state"
+  type        = map(number)
+  default     = {}
+}
+
+variable "performance_probe_target_fraction" {
+  description = "Fraction of baseline throughput that counts as full service"
+  type        = number
+  default     = 0.8
+
+  validation {
+    condition     = var.performance_probe_target_fraction > 0 && var.performance_probe_target_fraction <= 1
+    error_message = "Target fraction must be between 0 and 1."
+  }
+}
+
+variable "performance_probe_duration_seconds" {
+  description = "Maximum duration of the performance probe in seconds"
+  type        = number
+  default     = 300
+}
+
+variable "db_driver_layer_arns" {
+  description = "Lambda layer ARNs providing psycopg2/pymysql for database connections"
+  type        = list(string)
+  default     = []
+}
+
 variable "cleanup_after_test" {
   description = "Automatically delete temporary resources after testing"
   type        = bool
   default     = true
 }
 
+variable "reaper_schedule" {
+  description = "CloudWatch Events schedule expression for the test resource reaper"
+  type        = string
+  default     = "rate(15 minutes)"
+}
+
+variable "reaper_max_age_minutes" {
+  description = "Age after which unreleased test clusters are reaped (covers crashed test runs)"
+  type        = number
+  default     = 180
+
+  validation {
+    condition     = var.reaper_max_age_minutes >= 60
+    error_message = "Reaper max age must be at least 60 minutes so in-progress tests are not deleted."
+  }
+}
+
+variable "enable_priority_scheduling" {
+  description = "Dispatch restore tests fleet-wide to the most overdue clusters and snapshots (tag clusters with Criticality; BackupRestoreTest = false opts out)"
+  type        = bool
+  default     = false
+}
+
+variable "priority_schedule" {
+  description = "CloudWatch Events schedule expression for the priority scheduler"
+  type        = string
+  default     = "cron(0 2 * * ? *)" # 2 AM UTC daily
+}
+
+variable "max_concurrent_restores" {
+  description = "Maximum number of restore tests running at the same time"
+  type        = number
+  default     = 2
+
+  validation {
+    condition     = var.max_concurrent_restores >= 1
+    error_message = "At least one concurrent restore is required."
+  }
+}
+
+variable "restore_monthly_budget_usd" {
+  description = "Estimated monthly spend allowed for scheduled restore tests"
+  type        = number
+  default     = 200
+}
+
+variable "restore_hourly_cost_usd" {
+  description = "Estimated all-in hourly cost of a test cluster, used for the budget"
+  type        = number
+  default     = 0.5
+}
+
 variable "max_wait_minutes" {
   description = "Maximum minutes to wait for restoration to complete"
   type        = number
@@ -94,6 +305,12 @@ variable "max_wait_minutes" {
   }
 }
 
+variable "test_instance_class" {
+  description = "Instance class for the restored test instance (leave empty to choose from the cluster engine)"
+  type        = string
+  default     = ""
+}
+
 # ============================================
 # Lambda Configuration
 # ============================================
@@ -151,6 +368,18 @@ variable "restore_time_alarm_threshold" {
   }
 }
 
+variable "rto_history_days" {
+  description = "Days of run history used for RTO p50/p95 tracking"
+  type        = number
+  default     = 90
+}
+
+variable "history_retention_days" {
+  description = "Days to retain restore test history records in S3"
+  type        = number
+  default     = 730
+}
+
 # ============================================
 # Encryption Configuration
 # ============================================
@@ -0,0 +1,274 @@
+"""
+Cost Optimizer Anomaly Drill-Down
+Explains Cost Explorer anomalies with the cost dimensions that drove them.
+
+Daily grouped costs are kept in a local SQLite cost cube that lives in S3
+between runs (like the recommendation store, see sqlite_sync). Only days missing from the cube,
+or too recent to be final, are fetched from Cost Explorer, so a daily run
+usually costs a couple of GetCostAndUsage requests instead of one set per
+anomaly. GetCostAndUsage groups by at most two dimensions, so the cube holds
+two groupings: service x usage type and linked account x service.
+
+Drivers are the cells whose average daily cost during the anomaly rose most
+over the average of the baseline days before it.
+"""
+
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Any, Optional, Tuple
+
+from sqlite_sync import SyncedDatabase, download_database, upload_database
+
+# Cube groupings: name -> Cost Explorer dimensions (key1, key2)
+GROUPINGS = {
+    'service_usage_type': ('SERVICE', 'USAGE_TYPE'),
+    'account_service': ('LINKED_ACCOUNT', 'SERVICE'),
+}
+
+COST_METRIC = 'UnblendedCost'
+
+# Cost Explorer keeps revising the most recent days; they are re-fetched until final
+SETTLE_DAYS = 3
+BASELINE_DAYS = 14
+RETENTION_DAYS = 120
+MAX_DRIVERS = 5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_cost (
+    grouping TEXT NOT NULL,
+    day TEXT NOT NULL,
+    key1 TEXT NOT NULL,
+    key2 TEXT NOT NULL,
+    cost REAL NOT NULL,
+    PRIMARY KEY (grouping, day, key1, key2)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS cached_days (
+    grouping TEXT NOT NULL,
+    day TEXT NOT NULL,
+    final INTEGER NOT NULL,
+    fetched_at TEXT NOT NULL,
+    PRIMARY KEY (grouping, day)
+) WITHOUT ROWID;
+"""
+
+
+def _days(start: date, end: date) -> List[date]:
+    """Days in [start, end)."""
+    return [start + timedelta(days=offset) for offset in range((end - start).days)]
+
+
+def _ranges(days: List[date]) -> List[Tuple[date, date]]:
+    """Contiguous [start, end) ranges covering the sorted days."""
+    ranges: List[Tuple[date, date]] = []
+    for day in days:
+        if ranges and ranges[-1][1] == day:
+            ranges[-1] = (ranges[-1][0], day + timedelta(days=1))
+        else:
+            ranges.append((day, day + timedelta(days=1)))
+    return ranges
+
+
+class CostCube(SyncedDatabase):
+    """Daily cost per (grouping, day, key1, key2) with per-day fetch tracking."""
+
+    def __init__(self, path: str):
+        super().__init__(path, SCHEMA)
+        self.requests = 0
+
+    def missing_days(self, grouping: str, start: date, end: date) -> List[date]:
+        """Days in [start, end) without final data for the grouping."""
+        final = {
+            row['day'] for row in self.conn.execute(
+                'SELECT day FROM cached_days WHERE grouping = ? AND final = 1 AND day >= ? AND day < ?',
+                (grouping, start.isoformat(), end.isoformat())
+            )
+        }
+        return [day for day in _days(start, end) if day.isoformat() not in final]
+
+    def fill(self, ce_client: Any, start: date, end: date, today: Optional[date] = None) -> int:
+        """Fetch the missing days of [start, end) for every grouping; returns the Cost Explorer request count."""
+        today = today or datetime.now(timezone.utc).date()
+        end = min(end, today)
+        settled = today - timedelta(days=SETTLE_DAYS)
+        fetched_at = datetime.now(timezone.utc).isoformat()
+        requests = 0
+
+        for grouping, dimensions in GROUPINGS.items():
+            for range_start, range_end in _ranges(self.missing_days(grouping, start, end)):
+                rows = []
+                params = {
+                    'TimePeriod': {'Start': range_start.isoformat(), 'End': range_end.isoformat()},
+                    'Granularity': 'DAILY',
+                    'Metrics': [COST_METRIC],
+                    'GroupBy': [{'Type': 'DIMENSION', 'Key': key} for key in dimensions]
+                }
+                while True:
+                    response = ce_client.get_cost_and_usage(**params)
+                    requests += 1
+                    for result in response.get('ResultsByTime', []):
+                        day = result['TimePeriod']['Start'][:10]
+                        for group in result.get('Groups', []):
+                            key1, key2 = (group['Keys'] + ['', ''])[:2]
+                            cost = float(group['Metrics'][COST_METRIC]['Amount'])
+                            if cost:
+                                rows.append((grouping, day, key1, key2, cost))
+                    if not response.get('NextPageToken'):
+                        break
+                    params['NextPageToken'] = response['NextPageToken']
+
+                days = [(grouping, day.isoformat()) for day in _days(range_start, range_end)]
+                with self.conn:
+                    self.conn.executemany('DELETE FROM daily_cost WHERE grouping = ? AND day = ?', days)
+                    # A day's groups can span pages; amounts for the same cell are summed
+                    self.conn.executemany("""
+                        INSERT INTO daily_cost VALUES (?, ?, ?, ?, ?)
+                        ON CONFLICT (grouping, day, key1, key2) DO UPDATE SET cost = cost + excluded.cost
+                    """, rows)
+                    self.conn.executemany("""
+                        INSERT OR REPLACE INTO cached_days VALUES (?, ?, ?, ?)
+                    """, [(g, day, int(day < settled.isoformat()), fetched_at) for g, day in days])
+
+        self.requests += requests
+        return requests
+
+    def prune(self, before: date) -> None:
+        with self.conn:
+            self.conn.execute('DELETE FROM daily_cost WHERE day < ?', (before.isoformat(),))
+            self.conn.execute('DELETE FROM cached_days WHERE day < ?', (before.isoformat(),))
+
+    def drivers(
+        self,
+        grouping: str,
+        start: date,
+        end: date,
+        baseline_days: int = BASELINE_DAYS,
+        services: Optional[List[str]] = None,
+        limit: int = MAX_DRIVERS
+    ) -> List[Dict[str, Any]]:
+        """
+        Cells of the grouping ranked by the rise of their average daily cost in
+        [start, end) over the `baseline_days` before start, optionally limited
+        to the given services. Each driver's share is of the total rise.
+        """
+        baseline_start = start - timedelta(days=baseline_days)
+        anomaly_days = max(1, (end - start).days)
+        service_column = 'key1' if GROUPINGS[grouping][0] == 'SERVICE' else 'key2'
+        service_filter = ''
+        params: List[Any] = [start.isoformat(), anomaly_days, start.isoformat(), baseline_days,
+                             grouping, baseline_start.isoformat(), end.isoformat()]
+        if services:
+            service_filter = f"AND {service_column} IN ({', '.join('?' for _ in services)})"
+            params.extend(services)
+
+        rows = self.conn.execute(f"""
+            SELECT key1, key2,
+                   SUM(CASE WHEN day >= ? THEN cost ELSE 0 END) / ? AS anomaly_daily,
+                   SUM(CASE WHEN day < ? THEN cost ELSE 0 END) / ? AS baseline_daily
+            FROM daily_cost
+            WHERE grouping = ? AND day >= ? AND day < ? {service_filter}
+            GROUP BY key1, key2
+        """, params).fetchall()
+
+        rises = [(row, row['anomaly_daily'] - row['baseline_daily']) for row in rows]
+        total_rise = sum(rise for _, rise in rises if rise > 0)
+        ranked = sorted((item for item in rises if item[1] > 0), key=lambda item: item[1], reverse=True)[:limit]
+
+        names = [dimension.lower() for dimension in GROUPINGS[grouping]]
+        return [
+            {
+                names[0]: row['key1'],
+                names[1]: row['key2'],
+                'daily_increase': round(rise, 2),
+                'anomaly_daily_cost': round(row['anomaly_daily'], 2),
+                'baseline_daily_cost': round(row['baseline_daily'], 2),
+                'share': round(rise / total_rise, 4) if total_rise else 0.0
+            }
+            for row, rise in ranked
+        ]
+
+
+def get_all_anomalies(ce_client: Any, start: date, end: date) -> List[Dict[str, Any]]:
+    """Every anomaly detected in [start, end], following NextPageToken."""
+    anomalies = []
+    params = {'DateInterval': {'StartDate': start.isoformat(), 'EndDate': end.isoformat()}}
+    while True:
+        response = ce_client.get_anomalies(**params)
+        anomalies.extend(response.get('Anomalies', []))
+        if not response.get('NextPageToken'):
+            break
+        params['NextPageToken'] = response['NextPageToken']
+    return anomalies
+
+
+def anomaly_window(anomaly: Dict[str, Any], today: date) -> Tuple[date, date]:
+    """[start, end) days of an anomaly; ongoing anomalies run through yesterday."""
+    start = date.fromisoformat(anomaly['AnomalyStartDate'][:10])
+    end_date = anomaly.get('AnomalyEndDate')
+    end = date.fromisoformat(end_date[:10]) + timedelta(days=1) if end_date else today
+    return start, max(start + timedelta(days=1), min(end, today))
+
+
+def root_cause_services(anomaly: Dict[str, Any]) -> List[str]:
+    services = {cause['Service'] for cause in anomaly.get('RootCauses', []) if cause.get('Service')}
+    return sorted(services)
+
+
+def drill_down(
+    ce_client: Any,
+    cube: CostCube,
+    anomalies: List[Dict[str, Any]],
+    baseline_days: int = BASELINE_DAYS,
+    today: Optional[date] = None
+) -> List[Dict[str, Any]]:
+    """
+    Fill the cube once for the span of all anomalies plus their baselines and
+    return each anomaly with its drivers per grouping.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    if not anomalies:
+        return []
+
+    windows = [anomaly_window(anomaly, today) for anomaly in anomalies]
+    needed_from = min(start for start, _ in windows) - timedelta(days=baseline_days)
+    cube.fill(ce_client, needed_from, max(end for _, end in windows), today)
+    # Never prune days this run still reads, however long the anomalies or baselines are
+    cube.prune(min(needed_from, today - timedelta(days=RETENTION_DAYS)))
+
+    results = []
+    for anomaly, (start, end) in zip(anomalies, windows):
+        services = root_cause_services(anomaly)
+        drivers = {
+            grouping: cube.drivers(grouping, start, end, baseline_days, services)
+            for grouping in GROUPINGS
+        }
+        # Root causes may name a service the cube spells differently; fall back to all services
+        if services and not any(drivers.values()):
+            drivers = {grouping: cube.drivers(grouping, start, end, baseline_days) for grouping in GROUPINGS}
+        results.append({'anomaly': anomaly, 'start': start, 'end': end, 'drivers': drivers})
+    return results
+
+
+def open_cost_cube(s3_client: Any = None) -> CostCube:
+    """
+    Open the cube at COST_CUBE_PATH, first downloading COST_CUBE_BUCKET/KEY
+    when a bucket is configured.
+    """
+    path = os.environ.get('COST_CUBE_PATH', '/tmp/cost-cube.sqlite')
+    bucket = os.environ.get('COST_CUBE_BUCKET', '')
+    key = os.environ.get('COST_CUBE_KEY', 'cost-optimizer/cost-cube.sqlite')
+
+    if bucket:
+        download_database(s3_client, bucket, key, path)
+
+    return CostCube(path)
+
+
+def save_cost_cube(cube: CostCube, s3_client: Any = None) -> None:
+    """Close the cube and upload it back to S3 when one is configured."""
+    upload_database(
+        cube,
+        s3_client,
+        os.environ.get('COST_CUBE_BUCKET', ''),
+        os.environ.get('COST_CUBE_KEY', 'cost-optimizer/cost-cube.sqlite')
+    )
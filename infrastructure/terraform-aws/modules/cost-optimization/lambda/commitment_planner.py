@@ -0,0 +1,174 @@
+"""
+Cost Optimizer Commitment Planner
+Recommends a Compute Savings Plan commitment from hourly usage that is not yet
+covered by Savings Plans or Reserved Instances.
+
+Hourly on-demand-equivalent spend for the lookback window is loaded into a NumPy
+array, from the Cost and Usage Report when configured (true hourly shape) or from
+daily Cost Explorer coverage otherwise (spread evenly across each day). Every
+(commitment level, term/payment option) pair on the grid is then evaluated in
+one vectorized pass: the hourly usage is sorted once, so the usage a commitment
+covers is read off prefix sums instead of re-scanning every hour per candidate.
+
+A commitment of c $/hour at discount d covers up to c / (1 - d) of on-demand
+spend per hour, so it breaks even at (1 - d) utilization. The simulation
+assumes the lookback usage repeats over the term.
+
+numpy (and pyarrow for CUR input) are provided by a Lambda layer.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Optional
+
+try:
+    import numpy as np
+except ImportError:  # provided by a Lambda layer
+    np = None
+
+from cur_ingestion import scan_cur
+
+HOURS_PER_MONTH = 730
+
+# Approximate Compute Savings Plan discounts off on-demand; override with real rates per account
+DEFAULT_DISCOUNT_RATES = {
+    'compute-1yr-no-upfront': 0.27,
+    'compute-1yr-partial-upfront': 0.30,
+    'compute-1yr-all-upfront': 0.32,
+    'compute-3yr-no-upfront': 0.47,
+    'compute-3yr-partial-upfront': 0.51,
+    'compute-3yr-all-upfront': 0.53,
+}
+
+
+def hourly_usage_from_cur(location: str, days: int, now: Optional[datetime] = None) -> Any:
+    """Uncovered, Savings Plan eligible on-demand spend per hour from CUR Parquet files."""
+    return scan_cur(location, usage_days=days, now=now)['hourly_usage']
+
+
+def hourly_usage_from_cost_explorer(ce_client: Any, days: int, now: Optional[datetime] = None) -> Any:
+    """Uncovered on-demand spend per hour from daily Savings Plans coverage, spread evenly over each day."""
+    if np is None:
+        raise RuntimeError("numpy is not available; attach the numpy layer")
+
+    end = (now or datetime.now(timezone.utc)).date()
+    start = end - timedelta(days=days)
+    usage = np.zeros(days * 24)
+    params = {
+        'TimePeriod': {'Start': start.isoformat(), 'End': end.isoformat()},
+        'Granularity': 'DAILY'
+    }
+
+    while True:
+        response = ce_client.get_savings_plans_coverage(**params)
+        for item in response.get('SavingsPlansCoverages', []):
+            day = datetime.strptime(item['TimePeriod']['Start'][:10], '%Y-%m-%d').date()
+            offset = (day - start).days
+            if 0 <= offset < days:
+                on_demand = float(item.get('Coverage', {}).get('OnDemandCost', 0) or 0)
+                usage[offset * 24:(offset + 1) * 24] += on_demand / 24
+        if not response.get('NextToken'):
+            break
+        params['NextToken'] = response['NextToken']
+
+    return usage
+
+
+def evaluate_commitments(
+    usage: Any,
+    discount_rates: Dict[str, float],
+    grid_points: int = 2000
+) -> Dict[str, Any]:
+    """
+    Net savings for every commitment level on the grid and every option.
+
+    Commitment levels are expressed as the on-demand spend they cover per hour
+    (0 .. peak hourly usage); the $/hour commitment for an option is that
+    times (1 - discount).
+    """
+    usage = np.asarray(usage, dtype=float)
+    hours = usage.size
+    options = list(discount_rates)
+    discounts = np.array([discount_rates[o] for o in options])
+
+    sorted_usage = np.sort(usage)
+    prefix = np.concatenate(([0.0], np.cumsum(sorted_usage)))
+    capacity = np.linspace(0.0, sorted_usage[-1] if hours else 0.0, grid_points)
+
+    # Covered spend at each capacity: hours below it count in full, the rest up to the capacity
+    below = np.searchsorted(sorted_usage, capacity, side='right')
+    covered = prefix[below] + capacity * (hours - below)
+
+    commitment = capacity[None, :] * (1.0 - discounts[:, None])
+    net_savings = covered[None, :] - hours * commitment
+
+    return {
+        'options': options,
+        'discounts': discounts,
+        'capacity': capacity,
+        'covered': covered,
+        'commitment': commitment,
+        'net_savings': net_savings,
+        'hours': hours,
+        'total_usage': float(usage.sum())
+    }
+
+
+def best_commitment(evaluation: Dict[str, Any]) -> Dict[str, Any]:
+    """Most profitable option and level, with per-option bests for comparison."""
+    net_savings = evaluation['net_savings']
+    hours = evaluation['hours']
+    best_levels = net_savings.argmax(axis=1)
+
+    per_option = []
+    for row, option in enumerate(evaluation['options']):
+        level = best_levels[row]
+        capacity = evaluation['capacity'][level]
+        commitment = evaluation['commitment'][row, level]
+        covered = evaluation['covered'][level]
+        per_option.append({
+            'option': option,
+            'discount': float(evaluation['discounts'][row]),
+            'hourly_commitment': round(float(commitment), 4),
+            'monthly_savings': round(float(net_savings[row, level]) / hours * HOURS_PER_MONTH, 2) if hours else 0.0,
+            'utilization': round(float(covered / (capacity * hours)), 4) if capacity > 0 else 0.0,
+            'break_even_utilization': round(1.0 - float(evaluation['discounts'][row]), 4),
+            'coverage': round(float(covered / evaluation['total_usage']), 4) if evaluation['total_usage'] else 0.0
+        })
+
+    best = max(per_option, key=lambda o: o['monthly_savings'])
+    return {
+        'recommended': best if best['monthly_savings'] > 0 else None,
+        'options': per_option,
+        'candidates_evaluated': int(net_savings.size),
+        'average_hourly_on_demand': round(evaluation['total_usage'] / hours, 4) if hours else 0.0
+    }
+
+
+def plan_commitment(
+    ce_client: Any,
+    days: int,
+    discount_rates: Optional[Dict[str, float]] = None,
+    cur_location: str = '',
+    grid_points: int = 2000,
+    now: Optional[datetime] = None,
+    cur_usage: Any = None
+) -> Dict[str, Any]:
+    """
+    Load hourly usage (CUR when configured, otherwise Cost Explorer) and pick
+    the best commitment. `cur_usage` is hourly usage already read from the
+    CUR in a shared pass.
+    """
+    if cur_usage is not None:
+        usage = cur_usage
+        source = 'cur'
+    elif cur_location:
+        usage = hourly_usage_from_cur(cur_location, days, now)
+        source = 'cur'
+    else:
+        usage = hourly_usage_from_cost_explorer(ce_client, days, now)
+        source = 'cost_explorer_daily'
+
+    plan = best_commitment(evaluate_commitments(usage, discount_rates or DEFAULT_DISCOUNT_RATES, grid_points))
+    plan['usage_source'] = source
+    plan['lookback_days'] = days
+    return plan
@@ -6,8 +6,24 @@ Analyzes resources and sends recommendations for cost savings
 import boto3
 import json
 import os
-from datetime import datetime, timedelta
-from typing import Dict, List, Any
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Any, Set, Tuple
+
+from anomaly_drilldown import get_all_anomalies, drill_down, open_cost_cube, save_cost_cube
+from commitment_planner import plan_commitment
+from cur_ingestion import scan_cur, candidate_resource_ids, apply_actual_spend
+from ecs_rightsizing import per_task_peaks, right_size_service
+from idle_detector import detect_idle, describe_signals
+from metrics import metric_query, get_metric_data
+from recommendation_store import open_recommendation_store, save_recommendation_store
+from rule_engine import ResourceTable, RuleEngine, load_rule_engine
+from storage_performance import analyze_storage
+
+try:
+    import numpy  # noqa: F401
+except ImportError:  # provided by a Lambda layer
+    numpy = None
 
 # Initialize AWS clients
 ec2 = boto3.client('ec2')
@@ -22,27 +38,75 @@ elasticache = boto3.client('elasticache')
 SNS_TOPIC_ARN = os.environ.get('SNS_TOPIC_ARN', '')
 ENVIRONMENT = os.environ.get('ENVIRONMENT', 'production')
 COST_CENTER = os.environ.get('COST_CENTER', 'healthcare-platform')
+CUR_LOCATION = os.environ.get('CUR_LOCATION', '')
+CUR_LOOKBACK_DAYS = int(os.environ.get('CUR_LOOKBACK_DAYS', '30'))
+COMMITMENT_LOOKBACK_DAYS = int(os.environ.get('COMMITMENT_LOOKBACK_DAYS', '60'))
+COMMITMENT_DISCOUNT_RATES = json.loads(os.environ.get('COMMITMENT_DISCOUNT_RATES', '{}') or '{}')
+IDLE_LOOKBACK_DAYS = int(os.environ.get('IDLE_LOOKBACK_DAYS', '14'))
+STORAGE_LOOKBACK_DAYS = int(os.environ.get('STORAGE_LOOKBACK_DAYS', '14'))
+STORAGE_METRIC_PERIOD = int(os.environ.get('STORAGE_METRIC_PERIOD', '300'))
+ANOMALY_LOOKBACK_DAYS = int(os.environ.get('ANOMALY_LOOKBACK_DAYS', '7'))
+ANOMALY_BASELINE_DAYS = int(os.environ.get('ANOMALY_BASELINE_DAYS', '14'))
+# Rules of the idle detector and the resource type each covers; an idle
+# resource's other recommendations are superseded
+IDLE_RULES = {'ec2-idle': 'EC2', 'rds-idle': 'RDS', 'elasticache-idle': 'ElastiCache'}
+STORAGE_RULES = {'ebs-provisioned-iops': 'EBS', 'rds-provisioned-iops': 'RDS'}
+
+RULES_LOCATION = os.environ.get('RULES_LOCATION') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rules.json')
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Main Lambda handler for cost optimization analysis."""
+    # Without numpy every resource analyzer fails; fail the invocation rather than report nothing
+    if numpy is None and not event.get('acknowledge'):
+        raise RuntimeError("numpy is not available; attach the numpy layer (cost_optimizer_layer_arns)")
+
     try:
-        recommendations = []
+        # Acknowledge recommendations, e.g. {"acknowledge": [{"resource_type": "EBS", "resource_id": "vol-1", "rule": "ebs-unattached"}]}
+        if event.get('acknowledge'):
+            return acknowledge_recommendations(event['acknowledge'])
 
-        # Analyze different resource types
-        recommendations.extend(analyze_ec2_instances())
-        recommendations.extend(analyze_rds_instances())
-        recommendations.extend(analyze_ebs_volumes())
-        recommendations.extend(analyze_elastic_ips())
-        recommendations.extend(analyze_s3_buckets())
-        recommendations.extend(analyze_elasticache())
-        recommendations.extend(get_cost_anomalies())
+        recommendations = []
+        completed_rules = set()
+
+        # Analyze different resource types; each analyzer logs its own errors
+        # Rules over a resource type that could not be listed did not complete either
+        inventory, failed_types = timed('inventory', collect_inventory)
+        analyzers = [
+            ('rules', lambda: analyze_resources(inventory), lambda: collected_rules(
+                {rule.rule: rule.resource_type for rule in get_rule_engine().rules}, failed_types)),
+            ('idle', lambda: analyze_idle_resources(inventory), lambda: collected_rules(IDLE_RULES, failed_types)),
+            ('storage', lambda: analyze_storage_performance(inventory), lambda: collected_rules(STORAGE_RULES, failed_types)),
+            ('elastic_ips', analyze_elastic_ips, lambda: {'eip-unassociated'}),
+            ('s3', analyze_s3_buckets, lambda: {'s3-lifecycle', 's3-intelligent-tiering'}),
+            ('ecs', analyze_ecs_services, lambda: {'ecs-task-size', 'ecs-desired-count'}),
+            ('anomalies', get_cost_anomalies, lambda: {'cost-anomaly'}),
+        ]
+        for stage, analyze, rules in analyzers:
+            run_analyzer(stage, analyze, rules, recommendations, completed_rules)
+        recommendations = drop_superseded_by_idle(recommendations)
+
+        # One CUR pass: actual spend replaces estimated savings, and its hourly
+        # usage feeds the commitment planner
+        cur_usage = timed('cur', lambda: apply_cur_spend(recommendations)) if CUR_LOCATION else None
+        run_analyzer(
+            'commitments',
+            lambda: analyze_commitments(cur_usage),
+            lambda: {'savings-plan-commitment'},
+            recommendations,
+            completed_rules
+        )
 
         # Calculate total potential savings
         total_savings = sum(r.get('estimated_monthly_savings', 0) for r in recommendations)
 
-        # Send notification if there are significant recommendations
-        if total_savings > 50:  # Threshold of $50/month
+        # Compare with the recommendation history so only changes are reported
+        delta = timed('store', lambda: record_recommendations(recommendations, completed_rules))
+
+        if delta is not None:
+            if any(delta.values()):
+                send_notification(recommendations, total_savings, delta)
+        elif total_savings > 50:  # Threshold of $50/month
             send_notification(recommendations, total_savings)
 
         return {
@@ -50,6 +114,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'body': json.dumps({
                 'recommendations_count': len(recommendations),
                 'total_potential_savings': round(total_savings, 2),
+                'changes': {k: len(v) for k, v in delta.items()} if delta is not None else None,
                 'recommendations': recommendations
             })
         }
@@ -61,185 +126,375 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         }
 
 
-def analyze_ec2_instances() -> List[Dict[str, Any]]:
-    """Analyze EC2 instances for optimization opportunities."""
+def timed(stage: str, function: Callable[[], Any]) -> Any:
+    """Run one stage of the analysis and log how long it took."""
+    started = time.monotonic()
+    try:
+        return function()
+    finally:
+        print(f"Stage {stage} took {time.monotonic() - started:.1f}s")
+
+
+def run_analyzer(
+    stage: str,
+    analyze: Callable[[], List[Dict[str, Any]]],
+    rules: Callable[[], Set[str]],
+    recommendations: List[Dict[str, Any]],
+    completed_rules: Set[str]
+) -> None:
+    """Add an analyzer's recommendations; its rules only count as completed if it did not fail."""
+    try:
+        recommendations.extend(timed(stage, analyze))
+        completed_rules |= rules()
+    except Exception:
+        # Already logged; open items of a failed analyzer stay open rather than resolve
+        pass
+
+
+def drop_superseded_by_idle(recommendations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Keep only the idle recommendation for resources flagged as idle: resizing
+    or tuning a resource that should be stopped or deleted would conflict
+    with it and count its savings twice.
+    """
+    idle = {(r['resource_type'], str(r['resource_id'])) for r in recommendations if r.get('rule') in IDLE_RULES}
+    return [
+        r for r in recommendations
+        if r.get('rule') in IDLE_RULES or (r['resource_type'], str(r['resource_id'])) not in idle
+    ]
+
+
+def apply_cur_spend(recommendations: List[Dict[str, Any]]) -> Any:
+    """
+    Base savings on each resource's actual monthly spend from the CUR, in the
+    same pass that reads hourly usage for commitment planning. Returns that
+    hourly usage (None if the pass failed).
+    """
+    try:
+        cur = scan_cur(
+            CUR_LOCATION,
+            spend_days=CUR_LOOKBACK_DAYS,
+            usage_days=COMMITMENT_LOOKBACK_DAYS,
+            resource_ids=candidate_resource_ids(recommendations)
+        )
+        updated = apply_actual_spend(recommendations, cur['monthly_spend'])
+        print(f"Applied actual spend to {updated} of {len(recommendations)} recommendations")
+        return cur['hourly_usage']
+    except Exception as e:
+        print(f"Error applying CUR spend: {str(e)}")
+        return None
+
+
+def record_recommendations(recommendations: List[Dict[str, Any]], completed_rules: Set[str]) -> Dict[str, List[Dict[str, Any]]] | None:
+    """Merge this run into the recommendation store and return new/escalated/resolved items."""
+    try:
+        store = open_recommendation_store(s3)
+        if store is None:
+            return None
+        try:
+            return store.record_run(recommendations, completed_rules=completed_rules)
+        finally:
+            save_recommendation_store(store, s3)
+    except Exception as e:
+        print(f"Error updating recommendation store: {str(e)}")
+        return None
+
+
+def acknowledge_recommendations(keys: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Acknowledge recommendations so they are only reported again if they escalate."""
+    store = open_recommendation_store(s3)
+    if store is None:
+        return {
+            'statusCode': 400,
+            'body': json.dumps({'error': 'Recommendation store is not configured'})
+        }
+    try:
+        acknowledged = store.acknowledge(keys)
+    finally:
+        save_recommendation_store(store, s3)
+
+    return {
+        'statusCode': 200,
+        'body': json.dumps({'acknowledged': acknowledged})
+    }
+
+
+# Metrics loaded into the resource table per resource type:
+# column -> (namespace, metric, dimension, lookback days, rows that need it)
+INVENTORY_METRICS = {
+    'EC2': {
+        'cpu_avg': ('AWS/EC2', 'CPUUtilization', 'InstanceId', 14, None)
+    },
+    'RDS': {
+        'cpu_avg': ('AWS/RDS', 'CPUUtilization', 'DBInstanceIdentifier', 14, None)
+    },
+    'ElastiCache': {
+        'cpu_avg': ('AWS/ElastiCache', 'CPUUtilization', 'CacheClusterId', 7, None)
+    },
+}
+
+_rule_engine = None
+
+
+def get_rule_engine() -> RuleEngine:
+    """Rules from RULES_LOCATION (file or s3:// URI), loaded once per container."""
+    global _rule_engine
+    if _rule_engine is None:
+        _rule_engine = load_rule_engine(RULES_LOCATION, s3)
+    return _rule_engine
+
+
+def collect_inventory() -> Tuple[List[Dict[str, Any]], Set[str]]:
+    """EC2, RDS, EBS and ElastiCache resources as table rows, and the resource types that could not be listed."""
+    rows = []
+    failed_types = set()
+    collectors = [
+        ('EC2', collect_ec2_instances),
+        ('RDS', collect_rds_instances),
+        ('EBS', collect_ebs_volumes),
+        ('ElastiCache', collect_elasticache_clusters),
+    ]
+    for resource_type, collect in collectors:
+        try:
+            rows.extend(collect())
+        except Exception:
+            # Already logged; a partial listing must not resolve the type's open items
+            failed_types.add(resource_type)
+    return rows, failed_types
+
+
+def collected_rules(rules: Dict[str, str], failed_types: Set[str]) -> Set[str]:
+    """Rules (rule -> resource type) whose resource type was listed completely."""
+    return {rule for rule, resource_type in rules.items() if resource_type not in failed_types}
+
+
+def analyze_resources(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Evaluate the configured rules over EC2, RDS, EBS and ElastiCache in one pass."""
     recommendations = []
 
     try:
-        # Get all running instances
-        instances = ec2.describe_instances(
-            Filters=[
-                {'Name': 'instance-state-name', 'Values': ['running']},
-                {'Name': 'tag:CostCenter', 'Values': [COST_CENTER]}
-            ]
-        )
+        if not rows:
+            return recommendations
 
-        for reservation in instances.get('Reservations', []):
-            for instance in reservation.get('Instances', []):
-                instance_id = instance['InstanceId']
-                instance_type = instance['InstanceType']
-
-                # Check CPU utilization
-                cpu_util = get_average_metric(
-                    'AWS/EC2',
-                    'CPUUtilization',
-                    [{'Name': 'InstanceId', 'Value': instance_id}],
-                    14  # Last 14 days
-                )
-
-                # Recommend downsizing for underutilized instances
-                if cpu_util and cpu_util < 10:
-                    recommendations.append({
-                        'resource_type': 'EC2',
-                        'resource_id': instance_id,
-                        'recommendation': f'Instance {instance_id} has low CPU utilization ({cpu_util:.1f}%). Consider downsizing or using Spot instances.',
-                        'current_type': instance_type,
-                        'priority': 'high',
-                        'estimated_monthly_savings': estimate_ec2_savings(instance_type)
-                    })
-                elif cpu_util and cpu_util < 25:
-                    recommendations.append({
-                        'resource_type': 'EC2',
-                        'resource_id': instance_id,
-                        'recommendation': f'Instance {instance_id} has moderate CPU utilization ({cpu_util:.1f}%). Consider right-sizing.',
-                        'current_type': instance_type,
-                        'priority': 'medium',
-                        'estimated_monthly_savings': estimate_ec2_savings(instance_type) * 0.3
-                    })
+        load_inventory_metrics(rows)
+        table = ResourceTable.from_rows(rows)
+        recommendations = get_rule_engine().evaluate(table)
+        print(f"Rule engine matched {len(recommendations)} recommendations across {len(table)} resources")
 
-                # Check for instances without Savings Plans coverage
-                # (Would require additional API calls to Savings Plans)
+    except Exception as e:
+        print(f"Error evaluating resource rules: {str(e)}")
+        raise
+
+    return recommendations
+
+
+def analyze_idle_resources(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Recommend stopping or deleting EC2, RDS and ElastiCache resources that are idle on every signal."""
+    recommendations = []
+    labels = {'EC2': 'EC2 instance', 'RDS': 'RDS instance', 'ElastiCache': 'ElastiCache cluster'}
+    actions = {'stop': 'Consider stopping it', 'delete': 'Consider deleting it after a final snapshot'}
+
+    try:
+        for candidate in detect_idle(cloudwatch, rows, IDLE_LOOKBACK_DAYS):
+            resource = candidate['resource']
+            resource_type = resource['resource_type']
+            recommendations.append({
+                'resource_type': resource_type,
+                'resource_id': resource['resource_id'],
+                'rule': f"{resource_type.lower()}-idle",
+                'recommendation': (
+                    f"{labels[resource_type]} {resource['resource_id']} looks idle over {IDLE_LOOKBACK_DAYS} days "
+                    f"(score {candidate['score']:.2f}, {candidate['confidence']} confidence: {describe_signals(candidate['signals'])}). "
+                    f"{actions[candidate['action']]}."
+                ),
+                'priority': 'high' if candidate['confidence'] == 'high' else 'medium',
+                'estimated_monthly_savings': round(resource.get('monthly_cost') or 0, 2),
+                'action': candidate['action'],
+                'confidence': candidate['confidence'],
+                'idle_signals': candidate['signals']
+            })
+        print(f"Idle detector flagged {len(recommendations)} resources")
 
     except Exception as e:
-        print(f"Error analyzing EC2 instances: {str(e)}")
+        print(f"Error detecting idle resources: {str(e)}")
+        raise
 
     return recommendations
 
 
-def analyze_rds_instances() -> List[Dict[str, Any]]:
-    """Analyze RDS instances for optimization opportunities."""
+def analyze_storage_performance(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Recommend gp3 IOPS/throughput settings from p99 and peak storage utilization."""
     recommendations = []
 
     try:
-        instances = rds.describe_db_instances()
-
-        for instance in instances.get('DBInstances', []):
-            db_id = instance['DBInstanceIdentifier']
-            db_class = instance['DBInstanceClass']
-
-            # Check if using Provisioned IOPS when not needed
-            if instance.get('Iops') and instance.get('Iops') > 0:
-                iops_util = get_average_metric(
-                    'AWS/RDS',
-                    'ReadIOPS',
-                    [{'Name': 'DBInstanceIdentifier', 'Value': db_id}],
-                    7
-                )
-
-                if iops_util and iops_util < 1000:
-                    recommendations.append({
-                        'resource_type': 'RDS',
-                        'resource_id': db_id,
-                        'recommendation': f'RDS {db_id} has low IOPS usage. Consider switching to gp3 storage.',
-                        'priority': 'medium',
-                        'estimated_monthly_savings': 50  # Approximate
+        for result in analyze_storage(cloudwatch, rows, STORAGE_LOOKBACK_DAYS, STORAGE_METRIC_PERIOD):
+            resource = result['resource']
+            utilization = result['utilization']
+            target = result['target']
+            is_ebs = resource['resource_type'] == 'EBS'
+            current_type = resource['volume_type'] if is_ebs else resource['storage_type']
+            label = f"EBS volume {resource['resource_id']}" if is_ebs else f"RDS {resource['resource_id']} storage"
+
+            used = f"p99 {utilization['p99_iops']:.0f} IOPS / {utilization['p99_mibps']:.1f} MiB/s, peak {utilization['peak_iops']:.0f} IOPS"
+            if utilization['p99_iops_utilization'] is not None:
+                used += f" ({utilization['p99_iops_utilization'] * 100:.1f}% p99, {utilization['peak_iops_utilization'] * 100:.1f}% peak of {resource.get('iops') or 'baseline'} provisioned IOPS)"
+            if 'throughput' in target:
+                change = f"{target.get('volume_type') or target.get('storage_type')} with {target['iops']} IOPS and {target['throughput']} MiB/s"
+                if 'allocated_gb' in target:
+                    change += f" at {target['allocated_gb']} GB (the smallest size where gp3 IOPS can be set; growth is priced in)"
+            else:
+                change = f"{target['iops']} provisioned IOPS"
+
+            recommendation = {
+                'resource_type': resource['resource_type'],
+                'resource_id': resource['resource_id'],
+                'rule': 'ebs-provisioned-iops' if is_ebs else 'rds-provisioned-iops',
+                'recommendation': f"{label} ({current_type}) uses {used}. Change to {change}.",
+                'priority': 'high' if result['monthly_savings'] >= 100 else 'medium',
+                'estimated_monthly_savings': round(result['monthly_savings'], 2),
+                'utilization': utilization,
+                'target': target
+            }
+            # Share of actual CUR spend saved, from list prices. A volume's spend is all
+            # storage; an RDS instance's also covers compute, so it keeps the estimate.
+            if is_ebs:
+                recommendation['savings_fraction'] = round(result['monthly_savings'] / result['current_monthly_cost'], 4)
+            recommendations.append(recommendation)
+
+    except Exception as e:
+        print(f"Error analyzing storage performance: {str(e)}")
+        raise
+
+    return recommendations
+
+
+def collect_ec2_instances() -> List[Dict[str, Any]]:
+    """Running EC2 instances of the cost center."""
+    rows = []
+
+    try:
+        pages = ec2.get_paginator('describe_instances').paginate(
+            Filters=[
+                {'Name': 'instance-state-name', 'Values': ['running']},
+                {'Name': 'tag:CostCenter', 'Values': [COST_CENTER]}
+            ]
+        )
+        for page in pages:
+            for reservation in page.get('Reservations', []):
+                for instance in reservation.get('Instances', []):
+                    rows.append({
+                        'resource_type': 'EC2',
+                        'resource_id': instance['InstanceId'],
+                        'instance_type': instance['InstanceType'],
+                        'monthly_cost': estimate_ec2_cost(instance['InstanceType']),
+                        'rightsizing_savings': estimate_ec2_savings(instance['InstanceType'])
                     })
 
-            # Check CPU utilization for right-sizing
-            cpu_util = get_average_metric(
-                'AWS/RDS',
-                'CPUUtilization',
-                [{'Name': 'DBInstanceIdentifier', 'Value': db_id}],
-                14
-            )
+    except Exception as e:
+        print(f"Error collecting EC2 instances: {str(e)}")
+        raise
 
-            if cpu_util and cpu_util < 20:
-                recommendations.append({
-                    'resource_type': 'RDS',
-                    'resource_id': db_id,
-                    'recommendation': f'RDS {db_id} has low CPU ({cpu_util:.1f}%). Consider downsizing from {db_class}.',
-                    'priority': 'high',
-                    'estimated_monthly_savings': estimate_rds_savings(db_class)
-                })
+    return rows
 
-            # Check for single-AZ deployments in production
-            if ENVIRONMENT == 'production' and not instance.get('MultiAZ'):
-                recommendations.append({
+
+def collect_rds_instances() -> List[Dict[str, Any]]:
+    """All RDS DB instances."""
+    rows = []
+
+    try:
+        for page in rds.get_paginator('describe_db_instances').paginate():
+            for instance in page.get('DBInstances', []):
+                rows.append({
                     'resource_type': 'RDS',
-                    'resource_id': db_id,
-                    'recommendation': f'RDS {db_id} is not Multi-AZ. Consider enabling for HA.',
-                    'priority': 'low',
-                    'estimated_monthly_savings': 0  # This is a reliability recommendation
+                    'resource_id': instance['DBInstanceIdentifier'],
+                    'db_class': instance['DBInstanceClass'],
+                    'engine': instance.get('Engine', ''),
+                    'storage_type': instance.get('StorageType'),
+                    'allocated_gb': instance.get('AllocatedStorage'),
+                    'iops': instance.get('Iops'),
+                    'throughput': instance.get('StorageThroughput'),
+                    'multi_az': bool(instance.get('MultiAZ')),
+                    'environment': ENVIRONMENT,
+                    'monthly_cost': estimate_rds_cost(instance['DBInstanceClass']) * (2 if instance.get('MultiAZ') else 1),
+                    'rightsizing_savings': estimate_rds_savings(instance['DBInstanceClass'])
                 })
 
     except Exception as e:
-        print(f"Error analyzing RDS instances: {str(e)}")
+        print(f"Error collecting RDS instances: {str(e)}")
+        raise
 
-    return recommendations
+    return rows
 
 
-def analyze_ebs_volumes() -> List[Dict[str, Any]]:
-    """Analyze EBS volumes for optimization opportunities."""
-    recommendations = []
+def collect_ebs_volumes() -> List[Dict[str, Any]]:
+    """Available and in-use EBS volumes."""
+    rows = []
 
     try:
-        volumes = ec2.describe_volumes(
+        pages = ec2.get_paginator('describe_volumes').paginate(
             Filters=[
                 {'Name': 'status', 'Values': ['available', 'in-use']}
             ]
         )
-
-        for volume in volumes.get('Volumes', []):
-            volume_id = volume['VolumeId']
-            volume_type = volume['VolumeType']
-            size = volume['Size']
-            state = volume['State']
-
-            # Unattached volumes
-            if state == 'available':
-                recommendations.append({
+        for page in pages:
+            for volume in page.get('Volumes', []):
+                rows.append({
                     'resource_type': 'EBS',
-                    'resource_id': volume_id,
-                    'recommendation': f'EBS volume {volume_id} ({size}GB) is not attached. Consider deleting if unused.',
-                    'priority': 'high',
-                    'estimated_monthly_savings': size * 0.10  # Approximate gp2 pricing
+                    'resource_id': volume['VolumeId'],
+                    'volume_type': volume['VolumeType'],
+                    'size_gb': volume['Size'],
+                    'state': volume['State'],
+                    'iops': volume.get('Iops'),
+                    'throughput': volume.get('Throughput')
                 })
 
-            # gp2 to gp3 migration
-            if volume_type == 'gp2' and size >= 100:
-                recommendations.append({
-                    'resource_type': 'EBS',
-                    'resource_id': volume_id,
-                    'recommendation': f'EBS volume {volume_id} is gp2. Migrate to gp3 for 20% savings.',
-                    'priority': 'medium',
-                    'estimated_monthly_savings': size * 0.02  # Approximate 20% savings
-                })
+    except Exception as e:
+        print(f"Error collecting EBS volumes: {str(e)}")
+        raise
+
+    return rows
 
-            # io1/io2 optimization
-            if volume_type in ['io1', 'io2']:
-                read_ops = get_average_metric(
-                    'AWS/EBS',
-                    'VolumeReadOps',
-                    [{'Name': 'VolumeId', 'Value': volume_id}],
-                    7
-                )
-
-                provisioned_iops = volume.get('Iops', 0)
-                if read_ops and provisioned_iops > 0:
-                    iops_usage = (read_ops / provisioned_iops) * 100
-                    if iops_usage < 30:
-                        recommendations.append({
-                            'resource_type': 'EBS',
-                            'resource_id': volume_id,
-                            'recommendation': f'EBS volume {volume_id} is using only {iops_usage:.1f}% of provisioned IOPS. Reduce IOPS or switch to gp3.',
-                            'priority': 'high',
-                            'estimated_monthly_savings': provisioned_iops * 0.065 * 0.7  # 70% savings on unused IOPS
-                        })
+
+def collect_elasticache_clusters() -> List[Dict[str, Any]]:
+    """All ElastiCache clusters."""
+    rows = []
+
+    try:
+        for page in elasticache.get_paginator('describe_cache_clusters').paginate(ShowCacheNodeInfo=True):
+            for cluster in page.get('CacheClusters', []):
+                rows.append({
+                    'resource_type': 'ElastiCache',
+                    'resource_id': cluster['CacheClusterId'],
+                    'node_type': cluster['CacheNodeType'],
+                    'monthly_cost': estimate_elasticache_cost(cluster['CacheNodeType']) * cluster.get('NumCacheNodes', 1)
+                })
 
     except Exception as e:
-        print(f"Error analyzing EBS volumes: {str(e)}")
+        print(f"Error collecting ElastiCache clusters: {str(e)}")
+        raise
 
-    return recommendations
+    return rows
+
+
+def load_inventory_metrics(rows: List[Dict[str, Any]]) -> None:
+    """Add the average of daily metric averages to each row, in batched GetMetricData requests."""
+    # One request batch per lookback window
+    by_days: Dict[int, List[tuple]] = {}
+    for row in rows:
+        for column, (namespace, metric_name, dimension, days, needed) in INVENTORY_METRICS.get(row['resource_type'], {}).items():
+            if needed is None or needed(row):
+                by_days.setdefault(days, []).append((row, column, namespace, metric_name, dimension))
+
+    end_time = datetime.utcnow()
+    for days, wanted in by_days.items():
+        queries = [
+            metric_query(f"q{index}", namespace, metric_name, [{'Name': dimension, 'Value': row['resource_id']}], 'Average', 86400)
+            for index, (row, _, namespace, metric_name, dimension) in enumerate(wanted)
+        ]
+        series = get_metric_data(cloudwatch, queries, end_time - timedelta(days=days), end_time)
+        for index, (row, column, _, _, _) in enumerate(wanted):
+            values = series[f"q{index}"]['values']
+            row[column] = sum(values) / len(values) if values else None
 
 
 def analyze_elastic_ips() -> List[Dict[str, Any]]:
@@ -254,6 +509,7 @@ def analyze_elastic_ips() -> List[Dict[str, Any]]:
                 recommendations.append({
                     'resource_type': 'ElasticIP',
                     'resource_id': address['AllocationId'],
+                    'rule': 'eip-unassociated',
                     'recommendation': f'Elastic IP {address["PublicIp"]} is not associated. Release if unused.',
                     'priority': 'high',
                     'estimated_monthly_savings': 3.60  # $0.005/hour for unattached EIP
@@ -261,6 +517,7 @@ def analyze_elastic_ips() -> List[Dict[str, Any]]:
 
     except Exception as e:
         print(f"Error analyzing Elastic IPs: {str(e)}")
+        raise
 
     return recommendations
 
@@ -283,6 +540,7 @@ def analyze_s3_buckets() -> List[Dict[str, Any]]:
                     recommendations.append({
                         'resource_type': 'S3',
                         'resource_id': bucket_name,
+                        'rule': 's3-lifecycle',
                         'recommendation': f'S3 bucket {bucket_name} has no lifecycle policy. Consider adding for cost optimization.',
                         'priority': 'medium',
                         'estimated_monthly_savings': 10  # Variable based on usage
@@ -295,6 +553,7 @@ def analyze_s3_buckets() -> List[Dict[str, Any]]:
                     recommendations.append({
                         'resource_type': 'S3',
                         'resource_id': bucket_name,
+                        'rule': 's3-intelligent-tiering',
                         'recommendation': f'S3 bucket {bucket_name} could benefit from S3 Intelligent-Tiering.',
                         'priority': 'low',
                         'estimated_monthly_savings': 5
@@ -304,111 +563,196 @@ def analyze_s3_buckets() -> List[Dict[str, Any]]:
 
     except Exception as e:
         print(f"Error analyzing S3 buckets: {str(e)}")
+        raise
 
     return recommendations
 
 
-def analyze_elasticache() -> List[Dict[str, Any]]:
-    """Analyze ElastiCache clusters for optimization."""
+# Container Insights service metrics per query id suffix: (metric, statistic, period)
+ECS_SERVICE_METRICS = {
+    # Per-task peaks: the service Maximum is the largest single task's value
+    'cpu_max': ('CpuUtilized', 'Maximum', 3600),
+    'mem_max': ('MemoryUtilized', 'Maximum', 3600),
+    # Total across tasks: one data point per task per minute, summed per minute
+    'cpu_total': ('CpuUtilized', 'Sum', 60),
+}
+
+
+def list_ecs_services() -> List[Dict[str, Any]]:
+    """All active services with running tasks, across every cluster."""
+    services = []
+    for page in ecs.get_paginator('list_clusters').paginate():
+        for cluster_arn in page.get('clusterArns', []):
+            for service_page in ecs.get_paginator('list_services').paginate(cluster=cluster_arn):
+                arns = service_page.get('serviceArns', [])
+                # DescribeServices accepts at most 10 services per call
+                for i in range(0, len(arns), 10):
+                    described = ecs.describe_services(cluster=cluster_arn, services=arns[i:i + 10])
+                    services.extend(
+                        dict(service, clusterName=cluster_arn.split('/')[-1])
+                        for service in described.get('services', [])
+                        if service.get('status') == 'ACTIVE' and service.get('desiredCount', 0) > 0
+                    )
+    return services
+
+
+def analyze_ecs_services() -> List[Dict[str, Any]]:
+    """Analyze ECS/Fargate services for task right-sizing using Container Insights."""
     recommendations = []
 
     try:
-        clusters = elasticache.describe_cache_clusters(ShowCacheNodeInfo=True)
-
-        for cluster in clusters.get('CacheClusters', []):
-            cluster_id = cluster['CacheClusterId']
-            node_type = cluster['CacheNodeType']
-
-            # Check CPU utilization
-            cpu_util = get_average_metric(
-                'AWS/ElastiCache',
-                'CPUUtilization',
-                [{'Name': 'CacheClusterId', 'Value': cluster_id}],
-                7
-            )
+        services = list_ecs_services()
+        if not services:
+            return recommendations
 
-            if cpu_util and cpu_util < 10:
+        # Metrics for every service in batched GetMetricData requests (one-minute data is kept for 15 days)
+        end_time = datetime.utcnow()
+        start_time = end_time - timedelta(days=14)
+        queries = []
+        for index, service in enumerate(services):
+            dimensions = [
+                {'Name': 'ClusterName', 'Value': service['clusterName']},
+                {'Name': 'ServiceName', 'Value': service['serviceName']}
+            ]
+            for suffix, (metric_name, stat, period) in ECS_SERVICE_METRICS.items():
+                queries.append(metric_query(f"s{index}_{suffix}", 'ECS/ContainerInsights', metric_name, dimensions, stat, period))
+        series = get_metric_data(cloudwatch, queries, start_time, end_time)
+
+        task_definitions = {}
+        for index, service in enumerate(services):
+            peaks = per_task_peaks(series, f"s{index}")
+            if peaks is None:
+                continue  # Container Insights not enabled for the cluster
+
+            # Services often share task definitions; describe each one once
+            arn = service['taskDefinition']
+            if arn not in task_definitions:
+                task_definitions[arn] = ecs.describe_task_definition(taskDefinition=arn)['taskDefinition']
+
+            service_id = f"{service['clusterName']}/{service['serviceName']}"
+            for change in right_size_service(service, task_definitions[arn], peaks):
+                if change['rule'] == 'ecs-task-size':
+                    text = (
+                        f"ECS service {service_id} tasks peak at {peaks['cpu_per_task']:.0f} CPU units and "
+                        f"{peaks['memory_per_task']:.0f} MiB. Reduce task size from "
+                        f"{change['current']['cpu']} CPU/{change['current']['memory']} MiB to "
+                        f"{change['recommended']['cpu']} CPU/{change['recommended']['memory']} MiB."
+                    )
+                else:
+                    text = (
+                        f"ECS service {service_id} peaks at {peaks['peak_total_cpu']:.0f} CPU units in total. "
+                        f"Reduce desired tasks (or the auto scaling minimum) from "
+                        f"{change['current']['desired_count']} to {change['recommended']['desired_count']}."
+                    )
                 recommendations.append({
-                    'resource_type': 'ElastiCache',
-                    'resource_id': cluster_id,
-                    'recommendation': f'ElastiCache {cluster_id} has low CPU ({cpu_util:.1f}%). Consider downsizing from {node_type}.',
-                    'priority': 'medium',
-                    'estimated_monthly_savings': 20  # Approximate
+                    'resource_type': 'ECS',
+                    'resource_id': service_id,
+                    'rule': change['rule'],
+                    'recommendation': text,
+                    'priority': 'high' if change['monthly_savings'] >= 100 else 'medium',
+                    'estimated_monthly_savings': round(change['monthly_savings'], 2)
                 })
 
     except Exception as e:
-        print(f"Error analyzing ElastiCache: {str(e)}")
+        print(f"Error analyzing ECS services: {str(e)}")
+        raise
 
     return recommendations
 
 
-def get_cost_anomalies() -> List[Dict[str, Any]]:
-    """Get recent cost anomalies from AWS Cost Explorer."""
+def analyze_commitments(cur_usage: Any = None) -> List[Dict[str, Any]]:
+    """Recommend a Compute Savings Plan commitment for uncovered on-demand usage."""
     recommendations = []
 
     try:
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=7)
-
-        anomalies = ce.get_anomalies(
-            DateInterval={
-                'StartDate': start_date.strftime('%Y-%m-%d'),
-                'EndDate': end_date.strftime('%Y-%m-%d')
-            },
-            MaxResults=10
+        plan = plan_commitment(
+            ce,
+            COMMITMENT_LOOKBACK_DAYS,
+            discount_rates=COMMITMENT_DISCOUNT_RATES or None,
+            cur_location=CUR_LOCATION,
+            cur_usage=cur_usage
         )
-
-        for anomaly in anomalies.get('Anomalies', []):
-            if anomaly['AnomalyScore']['CurrentScore'] > 0.7:
-                impact = anomaly.get('Impact', {})
-                recommendations.append({
-                    'resource_type': 'CostAnomaly',
-                    'resource_id': anomaly['AnomalyId'],
-                    'recommendation': f'Cost anomaly detected: {impact.get("TotalImpact", 0):.2f} USD impact',
-                    'priority': 'critical',
-                    'estimated_monthly_savings': float(impact.get('TotalImpact', 0))
-                })
+        print(f"Commitment planner evaluated {plan['candidates_evaluated']} candidates from {plan['usage_source']}")
+
+        best = plan['recommended']
+        if best:
+            recommendations.append({
+                'resource_type': 'SavingsPlan',
+                'resource_id': 'compute',
+                'rule': 'savings-plan-commitment',
+                'recommendation': (
+                    f"Purchase a {best['option']} Savings Plan at ${best['hourly_commitment']:.2f}/hour. "
+                    f"Expected utilization {best['utilization'] * 100:.1f}% (break-even {best['break_even_utilization'] * 100:.1f}%), "
+                    f"covering {best['coverage'] * 100:.1f}% of uncovered on-demand usage."
+                ),
+                'priority': 'high' if best['monthly_savings'] >= 1000 else 'medium',
+                'estimated_monthly_savings': best['monthly_savings'],
+                'commitment_options': plan['options']
+            })
 
     except Exception as e:
-        print(f"Error getting cost anomalies: {str(e)}")
+        print(f"Error analyzing commitments: {str(e)}")
+        raise
 
     return recommendations
 
 
-def get_average_metric(
-    namespace: str,
-    metric_name: str,
-    dimensions: List[Dict[str, str]],
-    days: int
-) -> float | None:
-    """Get average CloudWatch metric value over specified days."""
-    try:
-        end_time = datetime.utcnow()
-        start_time = end_time - timedelta(days=days)
-
-        response = cloudwatch.get_metric_statistics(
-            Namespace=namespace,
-            MetricName=metric_name,
-            Dimensions=dimensions,
-            StartTime=start_time,
-            EndTime=end_time,
-            Period=86400,  # 1 day
-            Statistics=['Average']
-        )
+def get_cost_anomalies() -> List[Dict[str, Any]]:
+    """Get recent cost anomalies from AWS Cost Explorer with the cost drivers behind them."""
+    recommendations = []
 
-        datapoints = response.get('Datapoints', [])
-        if datapoints:
-            return sum(dp['Average'] for dp in datapoints) / len(datapoints)
-        return None
+    try:
+        end_date = datetime.now(timezone.utc).date()
+        start_date = end_date - timedelta(days=ANOMALY_LOOKBACK_DAYS)
+
+        anomalies = [
+            anomaly for anomaly in get_all_anomalies(ce, start_date, end_date)
+            if anomaly['AnomalyScore']['CurrentScore'] > 0.7
+        ]
+        if not anomalies:
+            return recommendations
+
+        cube = open_cost_cube(s3)
+        try:
+            results = drill_down(ce, cube, anomalies, ANOMALY_BASELINE_DAYS, end_date)
+            print(f"Drilled into {len(anomalies)} anomalies with {cube.requests} Cost Explorer requests")
+        finally:
+            save_cost_cube(cube, s3)
+
+        for result in results:
+            anomaly = result['anomaly']
+            impact = anomaly.get('Impact', {})
+            drivers = result['drivers']
+            explained = [
+                f"{d['service']} {d['usage_type']} +${d['daily_increase']:.2f}/day ({d['share'] * 100:.0f}%)"
+                for d in drivers['service_usage_type'][:3]
+            ]
+            explained += [
+                f"account {d['linked_account']} +${d['daily_increase']:.2f}/day"
+                for d in drivers['account_service'][:1]
+            ]
+            message = f'Cost anomaly detected: {impact.get("TotalImpact", 0):.2f} USD impact since {result["start"].isoformat()}'
+            if explained:
+                message += f'. Drivers: {"; ".join(explained)}'
+            recommendations.append({
+                'resource_type': 'CostAnomaly',
+                'resource_id': anomaly['AnomalyId'],
+                'rule': 'cost-anomaly',
+                'recommendation': message,
+                'priority': 'critical',
+                'estimated_monthly_savings': float(impact.get('TotalImpact', 0)),
+                'drivers': drivers
+            })
 
     except Exception as e:
-        print(f"Error getting metric {metric_name}: {str(e)}")
-        return None
+        print(f"Error getting cost anomalies: {str(e)}")
+        raise
 
+    return recommendations
 
-def estimate_ec2_savings(instance_type: str) -> float:
-    """Estimate monthly savings from EC2 right-sizing."""
-    # Approximate on-demand pricing (us-east-1)
+
+def estimate_ec2_cost(instance_type: str) -> float:
+    """Approximate monthly on-demand cost of an EC2 instance (us-east-1)."""
     prices = {
         't3.micro': 7.56,
         't3.small': 15.12,
@@ -422,12 +766,17 @@ def estimate_ec2_savings(instance_type: str) -> float:
         'r5.xlarge': 181.44,
     }
 
+    return prices.get(instance_type, 100)
+
+
+def estimate_ec2_savings(instance_type: str) -> float:
+    """Estimate monthly savings from EC2 right-sizing."""
     # Estimate 50% savings from downsizing
-    return prices.get(instance_type, 100) * 0.5
+    return estimate_ec2_cost(instance_type) * 0.5
 
 
-def estimate_rds_savings(db_class: str) -> float:
-    """Estimate monthly savings from RDS right-sizing."""
+def estimate_rds_cost(db_class: str) -> float:
+    """Approximate monthly on-demand cost of a Single-AZ RDS instance (us-east-1)."""
     prices = {
         'db.t3.micro': 12.41,
         'db.t3.small': 24.82,
@@ -439,21 +788,74 @@ def estimate_rds_savings(db_class: str) -> float:
         'db.r5.xlarge': 365.00,
     }
 
-    return prices.get(db_class, 150) * 0.5
+    return prices.get(db_class, 150)
+
+
+def estimate_rds_savings(db_class: str) -> float:
+    """Estimate monthly savings from RDS right-sizing."""
+    return estimate_rds_cost(db_class) * 0.5
+
+
+def estimate_elasticache_cost(node_type: str) -> float:
+    """Approximate monthly on-demand cost of one ElastiCache node (us-east-1)."""
+    prices = {
+        'cache.t3.micro': 12.41,
+        'cache.t3.small': 24.82,
+        'cache.t3.medium': 49.64,
+        'cache.m5.large': 113.15,
+        'cache.m5.xlarge': 226.30,
+        'cache.r5.large': 157.68,
+        'cache.r5.xlarge': 315.36,
+    }
+
+    return prices.get(node_type, 100)
 
 
-def send_notification(recommendations: List[Dict[str, Any]], total_savings: float) -> None:
-    """Send cost optimization recommendations via SNS."""
+def send_notification(
+    recommendations: List[Dict[str, Any]],
+    total_savings: float,
+    delta: Dict[str, List[Dict[str, Any]]] | None = None
+) -> None:
+    """Send cost optimization recommendations via SNS.
+
+    With a delta from the recommendation store only new, escalated and
+    resolved items are listed; otherwise all recommendations are grouped by priority.
+    """
     if not SNS_TOPIC_ARN:
         return
 
     try:
-        # Group by priority
-        critical = [r for r in recommendations if r['priority'] == 'critical']
-        high = [r for r in recommendations if r['priority'] == 'high']
-        medium = [r for r in recommendations if r['priority'] == 'medium']
+        if delta is not None:
+            new_savings = sum(r.get('estimated_monthly_savings', 0) for r in delta['new'])
+            message = f"""
+AWS Cost Optimization Report
+============================
+Environment: {ENVIRONMENT}
+Date: {datetime.now().strftime('%Y-%m-%d')}
+Total Potential Monthly Savings: ${total_savings:.2f} ({len(recommendations)} open recommendations)
+
+New ({len(delta['new'])} items, ${new_savings:.2f}/month):
+{format_recommendations(sort_by_priority(delta['new']))}
+
+Escalated ({len(delta['escalated'])} items):
+{format_recommendations(sort_by_priority(delta['escalated']))}
 
-        message = f"""
+Resolved ({len(delta['resolved'])} items):
+{format_recommendations(delta['resolved'])}
+
+Unchanged recommendations are not repeated. Full report available in CloudWatch Logs.
+"""
+            subject = (
+                f'[{ENVIRONMENT.upper()}] AWS Cost Optimization: {len(delta["new"])} new, '
+                f'{len(delta["escalated"])} escalated, {len(delta["resolved"])} resolved'
+            )
+        else:
+            # Group by priority
+            critical = [r for r in recommendations if r['priority'] == 'critical']
+            high = [r for r in recommendations if r['priority'] == 'high']
+            medium = [r for r in recommendations if r['priority'] == 'medium']
+
+            message = f"""
 AWS Cost Optimization Report
 ============================
 Environment: {ENVIRONMENT}
@@ -471,10 +873,11 @@ Medium Priority ({len(medium)} items):
 
 Full report available in CloudWatch Logs.
 """
+            subject = f'[{ENVIRONMENT.upper()}] AWS Cost Optimization: ${total_savings:.2f} potential savings'
 
         sns.publish(
             TopicArn=SNS_TOPIC_ARN,
-            Subject=f'[{ENVIRONMENT.upper()}] AWS Cost Optimization: ${total_savings:.2f} potential savings',
+            Subject=subject[:100],
             Message=message
         )
 
@@ -482,6 +885,15 @@ Full report available in CloudWatch Logs.
         print(f"Error sending notification: {str(e)}")
 
 
+def sort_by_priority(recommendations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Most urgent, then most valuable, recommendations first."""
+    order = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
+    return sorted(
+        recommendations,
+        key=lambda r: (order.get(r.get('priority'), 4), -r.get('estimated_monthly_savings', 0))
+    )
+
+
 def format_recommendations(recommendations: List[Dict[str, Any]]) -> str:
     """Format recommendations for notification."""
     if not recommendations:
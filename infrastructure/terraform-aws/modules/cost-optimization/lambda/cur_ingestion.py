@@ -0,0 +1,423 @@
+"""
+Cost Optimizer CUR Ingestion
+Streams Cost and Usage Report Parquet files and aggregates actual monthly spend
+per resource, so recommendation savings reflect real rates and discounts, and
+(for the commitment planner) uncovered Savings Plan eligible spend per hour.
+Both come from a single pass: each file is opened once and every record batch
+feeds every aggregator.
+
+Only the needed columns are read, row groups outside the lookback window (or with
+no resource IDs, when only spend is aggregated) are skipped from footer
+statistics, and data is processed in record batches, so memory stays bounded
+regardless of the report size.
+
+CUR_LOCATION is an S3 URI or local directory and may contain {year}, {month}
+(unpadded, as in legacy CUR paths) and {billing_period} (YYYY-MM, CUR 2.0):
+
+    s3://billing-bucket/cur/report/year={year}/month={month}
+    s3://billing-bucket/cur/report/data/BILLING_PERIOD={billing_period}
+
+pyarrow (and numpy, for hourly usage) are not part of the Lambda runtime and
+are provided by a Lambda layer.
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # provided by a Lambda layer
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    from pyarrow import fs as pafs
+except ImportError:  # provided by a Lambda layer
+    pa = pc = pq = pafs = None
+
+RESOURCE_ID = 'line_item_resource_id'
+USAGE_START = 'line_item_usage_start_date'
+LINE_ITEM_TYPE = 'line_item_line_item_type'
+USAGE_TYPE = 'line_item_usage_type'
+
+# Effective cost column per line item type; net_* variants include EDP/private rate discounts
+COST_COLUMNS = {
+    'Usage': ('line_item_net_unblended_cost', 'line_item_unblended_cost'),
+    'DiscountedUsage': ('reservation_net_effective_cost', 'reservation_effective_cost'),
+    'SavingsPlanCoveredUsage': ('savings_plan_net_savings_plan_effective_cost', 'savings_plan_savings_plan_effective_cost'),
+}
+
+# Usage types Compute Savings Plans apply to (EC2 instances, Fargate, Lambda duration)
+ELIGIBLE_USAGE_PATTERN = r'BoxUsage|DedicatedUsage|HostUsage|Fargate-(vCPU|GB)-Hours|Lambda-GB-Second'
+ON_DEMAND_COLUMNS = ('pricing_public_on_demand_cost', 'line_item_unblended_cost')
+
+DAYS_PER_MONTH = 30.4
+
+BATCH_SIZE = 65536
+
+# Share of a resource's actual spend each rule saves when the recommendation is applied.
+# rds-provisioned-iops is absent: it saves on storage, but an instance's spend also covers compute.
+RULE_SAVINGS_FRACTION = {
+    'ec2-rightsizing': 0.5,
+    'rds-rightsizing': 0.5,
+    'elasticache-rightsizing': 0.5,
+    'ebs-unattached': 1.0,
+    'ec2-idle': 1.0,
+    'rds-idle': 1.0,
+    'elasticache-idle': 1.0,
+    'eip-unassociated': 1.0,
+    'ebs-gp2-to-gp3': 0.2,
+    'ebs-provisioned-iops': 0.5,
+    's3-lifecycle': 0.3,
+    's3-intelligent-tiering': 0.1,
+}
+
+
+def resolve_locations(location: str, start: datetime, end: datetime) -> List[str]:
+    """Expand the location template for every billing period overlapping [start, end)."""
+    if '{' not in location:
+        return [location]
+
+    locations = []
+    period = start.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    while period < end:
+        resolved = location.format(
+            year=period.year,
+            month=period.month,
+            billing_period=period.strftime('%Y-%m')
+        )
+        if resolved not in locations:
+            locations.append(resolved)
+        period = (period + timedelta(days=32)).replace(day=1)
+    return locations
+
+
+def open_location(location: str) -> Tuple[Any, str]:
+    """Filesystem and root path for an S3 URI or a local directory."""
+    if pafs is None:
+        raise RuntimeError("pyarrow is not available; attach the pyarrow layer")
+    if location.startswith('s3://'):
+        return pafs.FileSystem.from_uri(location)
+    return pafs.LocalFileSystem(), os.path.abspath(location)
+
+
+def list_parquet_files(filesystem: Any, root: str) -> List[str]:
+    selector = pafs.FileSelector(root, recursive=True, allow_not_found=True)
+    return sorted(
+        info.path for info in filesystem.get_file_info(selector)
+        if info.type == pafs.FileType.File and info.path.endswith('.parquet')
+    )
+
+
+def _as_utc(value: Any) -> Any:
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def select_row_groups(metadata: Any, start: datetime, end: datetime, resource_level: bool = True) -> List[int]:
+    """
+    Row groups that may hold usage inside [start, end), from footer
+    statistics; with `resource_level`, only those with resource IDs.
+    """
+    columns = {metadata.schema.column(i).path: i for i in range(metadata.num_columns)}
+    selected = []
+    for group in range(metadata.num_row_groups):
+        row_group = metadata.row_group(group)
+
+        if resource_level and RESOURCE_ID in columns:
+            resource_stats = row_group.column(columns[RESOURCE_ID]).statistics
+            if resource_stats is not None and resource_stats.has_null_count and resource_stats.null_count == row_group.num_rows:
+                continue
+
+        if USAGE_START in columns:
+            time_stats = row_group.column(columns[USAGE_START]).statistics
+            if time_stats is not None and time_stats.has_min_max and isinstance(time_stats.max, datetime):
+                if _as_utc(time_stats.max) < start or _as_utc(time_stats.min) >= end:
+                    continue
+
+        selected.append(group)
+    return selected
+
+
+def _projection(schema: Any) -> Tuple[List[str], Dict[str, str]]:
+    """Columns to read and the cost column used for each line item type."""
+    names = set(schema.names)
+    cost_columns = {}
+    for line_item_type, candidates in COST_COLUMNS.items():
+        for candidate in candidates:
+            if candidate in names:
+                cost_columns[line_item_type] = candidate
+                break
+
+    columns = [RESOURCE_ID, LINE_ITEM_TYPE] + ([USAGE_START] if USAGE_START in names else [])
+    columns += sorted(set(cost_columns.values()))
+    return columns, cost_columns
+
+
+def _effective_cost(batch: Any, cost_columns: Dict[str, str]) -> Any:
+    """Per-row effective cost; zero for line item types that are not resource usage."""
+    line_item_type = batch.column(LINE_ITEM_TYPE)
+    cost = pa.scalar(0.0)
+    for type_name, column in cost_columns.items():
+        values = pc.fill_null(pc.cast(batch.column(column), pa.float64()), 0.0)
+        cost = pc.if_else(pc.equal(line_item_type, type_name), values, cost)
+    return cost
+
+
+class SpendAggregator:
+    """Running per-resource cost totals over [start, end), merged batch by batch."""
+
+    resource_level = True
+
+    def __init__(self, start: datetime, end: datetime, resource_ids: Optional[Iterable[str]] = None):
+        self.start = start
+        self.end = end
+        self.totals: Dict[str, float] = {}
+        self.value_set = pa.array(sorted(set(resource_ids))) if resource_ids is not None else None
+        self.rows = 0
+
+    def projection(self, schema: Any) -> Tuple[List[str], Dict[str, str]]:
+        """Columns to read and the cost column per line item type; no columns when the file has no spend."""
+        if RESOURCE_ID not in schema.names:
+            return [], {}
+        columns, cost_columns = _projection(schema)
+        return (columns, cost_columns) if cost_columns else ([], {})
+
+    def add_batch(self, batch: Any, cost_columns: Dict[str, str]):
+        resource_id = batch.column(RESOURCE_ID)
+        mask = pc.and_(pc.is_valid(resource_id), pc.not_equal(resource_id, ''))
+        mask = pc.and_(mask, pc.is_in(batch.column(LINE_ITEM_TYPE), value_set=pa.array(list(cost_columns))))
+        if self.value_set is not None:
+            # Match on the final ARN segment so short names (RDS, ElastiCache) find their ARNs
+            names = pc.replace_substring_regex(resource_id, pattern=r'^.*[:/]', replacement='')
+            mask = pc.and_(mask, pc.is_in(names, value_set=self.value_set))
+        if USAGE_START in batch.schema.names and pa.types.is_timestamp(batch.schema.field(USAGE_START).type):
+            usage_start = batch.column(USAGE_START)
+            bound_type = usage_start.type
+            low = pa.scalar(self.start if bound_type.tz else self.start.replace(tzinfo=None), type=bound_type)
+            high = pa.scalar(self.end if bound_type.tz else self.end.replace(tzinfo=None), type=bound_type)
+            mask = pc.and_(mask, pc.and_(pc.greater_equal(usage_start, low), pc.less(usage_start, high)))
+
+        mask = pc.fill_null(mask, False)
+        filtered = batch.filter(mask)
+        if filtered.num_rows == 0:
+            return
+
+        table = pa.table({
+            'resource_id': filtered.column(RESOURCE_ID),
+            'cost': _effective_cost(filtered, cost_columns)
+        })
+        grouped = table.group_by('resource_id').aggregate([('cost', 'sum')])
+        for resource, cost in zip(grouped.column('resource_id').to_pylist(), grouped.column('cost_sum').to_pylist()):
+            self.totals[resource] = self.totals.get(resource, 0.0) + cost
+        self.rows += filtered.num_rows
+
+
+class HourlyUsageAggregator:
+    """Uncovered, Savings Plan eligible on-demand spend per hour of [start, end), merged batch by batch."""
+
+    resource_level = False
+
+    def __init__(self, start: datetime, end: datetime):
+        self.start = start
+        self.end = end
+        self.hours = int((end - start).total_seconds() // 3600)
+        self.usage = np.zeros(self.hours)
+        self._start_ms = int(start.timestamp() * 1000)
+
+    def projection(self, schema: Any) -> Tuple[List[str], Optional[str]]:
+        """Columns to read and the on-demand cost column; no columns when the file lacks them."""
+        names = set(schema.names)
+        cost_column = next((c for c in ON_DEMAND_COLUMNS if c in names), None)
+        if cost_column is None or not {USAGE_START, USAGE_TYPE, LINE_ITEM_TYPE} <= names:
+            return [], None
+        if not pa.types.is_timestamp(schema.field(USAGE_START).type):
+            return [], None
+        return [LINE_ITEM_TYPE, USAGE_TYPE, USAGE_START, cost_column], cost_column
+
+    def add_batch(self, batch: Any, cost_column: str):
+        # Only on-demand 'Usage' lines: RI and Savings Plan covered usage is already committed
+        mask = pc.and_(
+            pc.equal(batch.column(LINE_ITEM_TYPE), 'Usage'),
+            pc.match_substring_regex(batch.column(USAGE_TYPE), ELIGIBLE_USAGE_PATTERN)
+        )
+        filtered = batch.filter(pc.fill_null(mask, False))
+        if filtered.num_rows == 0:
+            return
+
+        started = pc.cast(pc.cast(filtered.column(USAGE_START), pa.timestamp('ms')), pa.int64())
+        index = (started.to_numpy(zero_copy_only=False) - self._start_ms) // 3_600_000
+        cost = pc.fill_null(pc.cast(filtered.column(cost_column), pa.float64()), 0.0).to_numpy(zero_copy_only=False)
+        in_window = (index >= 0) & (index < self.hours)
+        self.usage += np.bincount(index[in_window], weights=cost[in_window], minlength=self.hours)
+
+
+def scan_files(location: str, aggregators: List[Any]) -> Dict[str, int]:
+    """
+    Open every CUR file overlapping the aggregators' windows once and feed
+    each record batch (read for the union of their columns) to every
+    aggregator that can use the file.
+    """
+    start = min(a.start for a in aggregators)
+    end = max(a.end for a in aggregators)
+    stats = {'files': 0, 'row_groups_read': 0, 'row_groups_skipped': 0}
+
+    for resolved in resolve_locations(location, start, end):
+        filesystem, root = open_location(resolved)
+        for path in list_parquet_files(filesystem, root):
+            stats['files'] += 1
+            with filesystem.open_input_file(path) as source:
+                parquet_file = pq.ParquetFile(source)
+                readers = []
+                for aggregator in aggregators:
+                    columns, context = aggregator.projection(parquet_file.schema_arrow)
+                    if columns:
+                        readers.append((aggregator, columns, context))
+                if not readers:
+                    continue
+
+                resource_level = all(aggregator.resource_level for aggregator, _, _ in readers)
+                row_groups = select_row_groups(parquet_file.metadata, start, end, resource_level)
+                stats['row_groups_read'] += len(row_groups)
+                stats['row_groups_skipped'] += parquet_file.metadata.num_row_groups - len(row_groups)
+                if not row_groups:
+                    continue
+
+                columns = sorted({column for _, wanted, _ in readers for column in wanted})
+                for batch in parquet_file.iter_batches(batch_size=BATCH_SIZE, row_groups=row_groups, columns=columns):
+                    for aggregator, _, context in readers:
+                        aggregator.add_batch(batch, context)
+
+    return stats
+
+
+def scan_cur(
+    location: str,
+    spend_days: int = 0,
+    usage_days: int = 0,
+    resource_ids: Optional[Iterable[str]] = None,
+    now: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    One pass over the CUR: effective cost per resource over the last
+    `spend_days` days, scaled to a monthly figure (with `resource_ids`, only
+    those resources are kept, bounding memory by the number of
+    recommendations), and uncovered eligible on-demand spend per hour over
+    the last `usage_days` days. Either part is skipped when its days are 0.
+    """
+    if pa is None:
+        raise RuntimeError("pyarrow is not available; attach the pyarrow layer")
+    if usage_days and np is None:
+        raise RuntimeError("numpy is not available; attach the numpy layer")
+
+    end = (now or datetime.now(timezone.utc)).replace(hour=0, minute=0, second=0, microsecond=0)
+    spend = SpendAggregator(end - timedelta(days=spend_days), end, resource_ids) if spend_days else None
+    usage = HourlyUsageAggregator(end - timedelta(days=usage_days), end) if usage_days else None
+    aggregators = [a for a in (spend, usage) if a is not None]
+    if not aggregators:
+        raise ValueError("Nothing to scan: spend_days and usage_days are both 0")
+
+    stats = scan_files(location, aggregators)
+    print(
+        f"CUR ingestion: {stats['files']} files, {stats['row_groups_read']} row groups read, "
+        f"{stats['row_groups_skipped']} skipped"
+        + (f", {spend.rows} rows, {len(spend.totals)} resources" if spend else '')
+    )
+
+    result: Dict[str, Any] = {'end': end.isoformat(), 'files': stats['files']}
+    if spend:
+        scale = DAYS_PER_MONTH / spend_days
+        result['start'] = spend.start.isoformat()
+        result['monthly_spend'] = {resource: total * scale for resource, total in spend.totals.items()}
+    if usage:
+        result['hourly_usage'] = usage.usage
+    return result
+
+
+def load_resource_spend(
+    location: str,
+    days: int = 30,
+    resource_ids: Optional[Iterable[str]] = None,
+    now: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Aggregate effective cost per resource over the last `days` days of usage
+    and scale it to a monthly figure. With `resource_ids`, only those
+    resources are kept, bounding memory by the number of recommendations.
+    """
+    return scan_cur(location, spend_days=days, resource_ids=resource_ids, now=now)
+
+
+# ARN service for recommendation types that CUR identifies by ARN
+ARN_SERVICES = {'RDS': 'rds', 'ElastiCache': 'elasticache'}
+
+
+def spend_key(resource_id: str) -> Tuple[str, str]:
+    """(service, name) for ARNs, ('', id) for plain IDs such as i-, vol-, eipalloc- or bucket names."""
+    if resource_id.startswith('arn:'):
+        parts = resource_id.split(':')
+        return parts[2], parts[-1].split('/')[-1]
+    return '', resource_id
+
+
+def recommendation_spend_key(recommendation: Dict[str, Any]) -> Tuple[str, str]:
+    return ARN_SERVICES.get(recommendation['resource_type'], ''), str(recommendation['resource_id'])
+
+
+def candidate_resource_ids(recommendations: List[Dict[str, Any]]) -> List[str]:
+    """Names to keep while aggregating, so memory is bounded by the recommendations."""
+    return [str(r['resource_id']) for r in recommendations]
+
+
+def apply_actual_spend(recommendations: List[Dict[str, Any]], monthly_spend: Dict[str, float]) -> int:
+    """
+    Replace estimated savings with a share of each resource's actual monthly
+    spend where the CUR has it. Returns the number of recommendations updated.
+    """
+    by_key: Dict[Tuple[str, str], float] = {}
+    for resource, spend in monthly_spend.items():
+        key = spend_key(resource)
+        by_key[key] = by_key.get(key, 0.0) + spend
+
+    updated = 0
+    for r in recommendations:
+        fraction = r.get('savings_fraction', RULE_SAVINGS_FRACTION.get(r.get('rule')))
+        spend = by_key.get(recommendation_spend_key(r))
+        if fraction is None or spend is None:
+            r.setdefault('savings_basis', 'estimate')
+            continue
+        r['monthly_spend'] = round(spend, 2)
+        r['estimated_monthly_savings'] = round(spend * fraction, 2)
+        r['savings_basis'] = 'cur'
+        updated += 1
+    return updated
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Actual monthly spend per resource from CUR Parquet files')
+    parser.add_argument('location', help='Local directory or S3 URI (may use {year}, {month}, {billing_period})')
+    parser.add_argument('--days', type=int, default=30, help='Days of usage to aggregate')
+    parser.add_argument('--top', type=int, default=20, help='Resources to print')
+    parser.add_argument('--json', action='store_true', help='Print all resources as JSON')
+    args = parser.parse_args(argv)
+
+    result = load_resource_spend(args.location, days=args.days)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+
+    print(f"Monthly spend per resource ({result['start'][:10]} to {result['end'][:10]}, {result['files']} files)")
+    ranked = sorted(result['monthly_spend'].items(), key=lambda item: item[1], reverse=True)
+    for resource, spend in ranked[:args.top]:
+        print(f"  ${spend:12.2f}  {resource}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,147 @@
+"""
+Cost Optimizer ECS Right-Sizing
+Task sizing from Container Insights service metrics: per-task peak CPU and
+memory, the smallest Fargate size that fits them with headroom, and the number
+of tasks the service's peak load actually needs.
+"""
+
+import math
+from typing import Dict, List, Any, Optional, Tuple
+
+# Fargate on-demand pricing (us-east-1) per vCPU-hour and GB-hour
+FARGATE_PRICES = {
+    'X86_64': (0.04048, 0.004445),
+    'ARM64': (0.03238, 0.00356),
+}
+
+HOURS_PER_MONTH = 730
+
+CPU_HEADROOM = 0.3
+MEMORY_HEADROOM = 0.2
+
+# Services keep at least this many tasks for availability
+MIN_TASKS = 2
+
+
+def _memory_steps(low: int, high: int, step: int) -> List[int]:
+    return list(range(low, high + 1, step))
+
+
+# Valid Fargate (cpu units, memory MiB) combinations
+FARGATE_SIZES: List[Tuple[int, int]] = sorted(
+    [(256, m) for m in (512, 1024, 2048)]
+    + [(512, m) for m in _memory_steps(1024, 4096, 1024)]
+    + [(1024, m) for m in _memory_steps(2048, 8192, 1024)]
+    + [(2048, m) for m in _memory_steps(4096, 16384, 1024)]
+    + [(4096, m) for m in _memory_steps(8192, 30720, 1024)]
+    + [(8192, m) for m in _memory_steps(16384, 61440, 4096)]
+    + [(16384, m) for m in _memory_steps(32768, 122880, 8192)]
+)
+
+
+def fargate_hourly_cost(cpu: int, memory: int, architecture: str = 'X86_64') -> float:
+    vcpu_price, gb_price = FARGATE_PRICES.get(architecture, FARGATE_PRICES['X86_64'])
+    return cpu / 1024 * vcpu_price + memory / 1024 * gb_price
+
+
+def smallest_fargate_size(cpu_needed: float, memory_needed: float, architecture: str = 'X86_64') -> Optional[Tuple[int, int]]:
+    """Cheapest valid Fargate size with at least the needed CPU units and MiB."""
+    fitting = [(cpu, memory) for cpu, memory in FARGATE_SIZES if cpu >= cpu_needed and memory >= memory_needed]
+    if not fitting:
+        return None
+    return min(fitting, key=lambda size: fargate_hourly_cost(size[0], size[1], architecture))
+
+
+def task_size(task_definition: Dict[str, Any]) -> Tuple[int, int]:
+    """Task-level CPU units and MiB, or the sum of container reservations when unset."""
+    cpu = int(task_definition.get('cpu') or 0)
+    memory = int(task_definition.get('memory') or 0)
+    containers = task_definition.get('containerDefinitions', [])
+    if not cpu:
+        cpu = sum(int(c.get('cpu') or 0) for c in containers)
+    if not memory:
+        memory = sum(int(c.get('memory') or c.get('memoryReservation') or 0) for c in containers)
+    return cpu, memory
+
+
+def per_task_peaks(series: Dict[str, Dict[str, List[Any]]], prefix: str) -> Optional[Dict[str, float]]:
+    """
+    Peak per-task CPU and memory and peak total CPU from service metrics.
+    Container Insights reports one data point per task, so the service's
+    Maximum already is the per-task peak, and the Sum over a one-minute
+    period is the CPU of all tasks running in that minute.
+    """
+    def values(name: str) -> List[float]:
+        return series.get(f"{prefix}_{name}", {}).get('values', [])
+
+    cpu_max = values('cpu_max')
+    cpu_total = values('cpu_total')
+    if not cpu_max:
+        return None
+
+    return {
+        'cpu_per_task': max(cpu_max),
+        'memory_per_task': max(values('mem_max'), default=0.0),
+        'peak_total_cpu': max(cpu_total, default=max(cpu_max)),
+        'average_total_cpu': sum(cpu_total) / len(cpu_total) if cpu_total else 0.0,
+        'hours': len(cpu_max)
+    }
+
+
+def is_fargate(service: Dict[str, Any]) -> bool:
+    if service.get('launchType'):
+        return service['launchType'] == 'FARGATE'
+    return any(
+        strategy.get('capacityProvider', '').startswith('FARGATE')
+        for strategy in service.get('capacityProviderStrategy', [])
+    )
+
+
+def _round_up(value: float, step: int) -> int:
+    return max(step, int(math.ceil(value / step)) * step)
+
+
+def right_size_service(
+    service: Dict[str, Any],
+    task_definition: Dict[str, Any],
+    peaks: Dict[str, float]
+) -> List[Dict[str, Any]]:
+    """
+    Smaller task size or fewer desired tasks for one service, with monthly
+    savings. A smaller size is preferred; the task count is only reduced when
+    the size already fits. EC2 launch type reservations are valued at Fargate
+    rates as an approximation of the cluster capacity they free.
+    """
+    cpu, memory = task_size(task_definition)
+    desired = service.get('desiredCount', 0)
+    if not cpu or not memory or not desired:
+        return []
+
+    architecture = (task_definition.get('runtimePlatform') or {}).get('cpuArchitecture', 'X86_64')
+    current_cost = fargate_hourly_cost(cpu, memory, architecture)
+
+    cpu_needed = peaks['cpu_per_task'] * (1 + CPU_HEADROOM)
+    memory_needed = peaks['memory_per_task'] * (1 + MEMORY_HEADROOM)
+    if is_fargate(service):
+        size = smallest_fargate_size(cpu_needed, memory_needed, architecture)
+    else:
+        size = (min(cpu, _round_up(cpu_needed, 128)), min(memory, _round_up(memory_needed, 128)))
+    if size and fargate_hourly_cost(size[0], size[1], architecture) < current_cost:
+        new_cost = fargate_hourly_cost(size[0], size[1], architecture)
+        return [{
+            'rule': 'ecs-task-size',
+            'current': {'cpu': cpu, 'memory': memory},
+            'recommended': {'cpu': size[0], 'memory': size[1]},
+            'monthly_savings': (current_cost - new_cost) * desired * HOURS_PER_MONTH
+        }]
+
+    needed_tasks = max(MIN_TASKS, math.ceil(peaks['peak_total_cpu'] * (1 + CPU_HEADROOM) / cpu))
+    if needed_tasks < desired:
+        return [{
+            'rule': 'ecs-desired-count',
+            'current': {'desired_count': desired},
+            'recommended': {'desired_count': needed_tasks},
+            'monthly_savings': current_cost * (desired - needed_tasks) * HOURS_PER_MONTH
+        }]
+
+    return []
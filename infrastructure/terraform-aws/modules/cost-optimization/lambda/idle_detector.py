@@ -0,0 +1,227 @@
+"""
+Cost Optimizer Idle Detector
+Finds EC2 instances, RDS instances and ElastiCache clusters that are idle on
+every signal, not just CPU: network traffic, open connections and cache
+lookups as well.
+
+Daily values of each signal are fetched for the whole estate in batched
+GetMetricData requests and stacked into one NumPy array per resource type
+(resources x signals x days). Every check is then evaluated for all resources
+at once: a day is quiet when the check's value stays at or below its
+threshold, and a resource's idle score is the weighted share of quiet days
+across its checks. Checks that the workload depends on (connections, cache
+lookups) weigh more than CPU, so a network-bound cache with low CPU is not
+flagged and a database nobody connects to is.
+
+numpy is provided by a Lambda layer.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # provided by a Lambda layer
+    np = None
+
+from metrics import metric_query, get_metric_data
+
+DAY = 86400
+MB = 1000000
+
+# Daily signals per resource type: signal -> (namespace, metric, stat, scale to a daily value)
+IDLE_SIGNALS = {
+    'EC2': {
+        'dimension': 'InstanceId',
+        'signals': {
+            'cpu_avg': ('AWS/EC2', 'CPUUtilization', 'Average', 1),
+            'cpu_max': ('AWS/EC2', 'CPUUtilization', 'Maximum', 1),
+            'network_in': ('AWS/EC2', 'NetworkIn', 'Sum', 1),
+            'network_out': ('AWS/EC2', 'NetworkOut', 'Sum', 1),
+        }
+    },
+    'RDS': {
+        'dimension': 'DBInstanceIdentifier',
+        'signals': {
+            'cpu_max': ('AWS/RDS', 'CPUUtilization', 'Maximum', 1),
+            'connections_max': ('AWS/RDS', 'DatabaseConnections', 'Maximum', 1),
+            # Bytes per second averaged over the day
+            'network_in': ('AWS/RDS', 'NetworkReceiveThroughput', 'Average', DAY),
+            'network_out': ('AWS/RDS', 'NetworkTransmitThroughput', 'Average', DAY),
+        }
+    },
+    'ElastiCache': {
+        'dimension': 'CacheClusterId',
+        'signals': {
+            'cpu_max': ('AWS/ElastiCache', 'CPUUtilization', 'Maximum', 1),
+            'connections_max': ('AWS/ElastiCache', 'CurrConnections', 'Maximum', 1),
+            'cache_hits': ('AWS/ElastiCache', 'CacheHits', 'Sum', 1),
+            'cache_misses': ('AWS/ElastiCache', 'CacheMisses', 'Sum', 1),
+            'network_in': ('AWS/ElastiCache', 'NetworkBytesIn', 'Sum', 1),
+            'network_out': ('AWS/ElastiCache', 'NetworkBytesOut', 'Sum', 1),
+        }
+    },
+}
+
+# Checks per resource type: (name, summed signals, quiet at or below, weight)
+IDLE_CHECKS = {
+    'EC2': [
+        ('cpu_avg', ('cpu_avg',), 2.0, 1.0),
+        ('cpu_max', ('cpu_max',), 10.0, 1.0),
+        ('network_bytes', ('network_in', 'network_out'), 50 * MB, 2.0),
+    ],
+    'RDS': [
+        ('connections', ('connections_max',), 0.0, 3.0),
+        ('cpu_max', ('cpu_max',), 10.0, 1.0),
+        ('network_bytes', ('network_in', 'network_out'), 50 * MB, 1.0),
+    ],
+    'ElastiCache': [
+        # Replication and monitoring keep a few connections open on an unused cluster
+        ('connections', ('connections_max',), 5.0, 1.0),
+        ('cache_lookups', ('cache_hits', 'cache_misses'), 100.0, 3.0),
+        ('cpu_max', ('cpu_max',), 10.0, 1.0),
+        ('network_bytes', ('network_in', 'network_out'), 50 * MB, 1.0),
+    ],
+}
+
+# (minimum idle score, minimum share of days with data) per confidence level
+CONFIDENCE_LEVELS = [
+    ('high', 0.95, 0.9),
+    ('medium', 0.8, 0.5),
+]
+
+# Action per resource type and confidence
+IDLE_ACTIONS = {
+    'EC2': {'high': 'stop', 'medium': 'stop'},
+    # Stopped RDS instances restart after seven days; only confidently idle ones are worth deleting
+    'RDS': {'high': 'delete', 'medium': 'stop'},
+    # ElastiCache clusters cannot be stopped
+    'ElastiCache': {'high': 'delete', 'medium': 'delete'},
+}
+
+
+def idle_queries(resources: List[Dict[str, Any]], resource_type: str) -> List[Dict[str, Any]]:
+    """Daily queries for every signal of every resource of one type."""
+    spec = IDLE_SIGNALS[resource_type]
+    queries = []
+    for index, resource in enumerate(resources):
+        dimensions = [{'Name': spec['dimension'], 'Value': resource['resource_id']}]
+        for signal, (namespace, metric_name, stat, _) in spec['signals'].items():
+            queries.append(metric_query(f"r{index}_{signal}", namespace, metric_name, dimensions, stat, DAY))
+    return queries
+
+
+def signal_array(series: Dict[str, Dict[str, List[Any]]], resource_type: str, count: int, days: int) -> Any:
+    """Daily values as a NaN-padded (resources x signals x days) array, scaled to daily units."""
+    signals = IDLE_SIGNALS[resource_type]['signals']
+    values = np.full((count, len(signals), days), np.nan)
+    for column, (signal, (_, _, _, scale)) in enumerate(signals.items()):
+        for index in range(count):
+            data = series.get(f"r{index}_{signal}", {}).get('values', [])[-days:]
+            values[index, column, :len(data)] = np.asarray(data, dtype=float) * scale
+    return values
+
+
+def score_idle(values: Any, resource_type: str, days: int) -> Dict[str, Any]:
+    """
+    Idle score, data coverage, per-check quiet share and per-check peak for
+    every resource, from the (resources x signals x days) array.
+    """
+    signal_index = {signal: column for column, signal in enumerate(IDLE_SIGNALS[resource_type]['signals'])}
+    checks = IDLE_CHECKS[resource_type]
+
+    quiet_shares, peaks, weights = [], [], []
+    with np.errstate(all='ignore'):
+        for _, signals, threshold, weight in checks:
+            selected = values[:, [signal_index[s] for s in signals], :]
+            # A day counts when any of the summed signals reported it
+            reported = ~np.isnan(selected).all(axis=1)
+            daily = np.where(reported, np.nansum(selected, axis=1), np.nan)
+            valid = reported.sum(axis=1)
+            quiet = ((daily <= threshold) & reported).sum(axis=1)
+            quiet_shares.append(np.where(valid > 0, quiet / np.maximum(valid, 1), np.nan))
+            peaks.append(np.nanmax(np.where(reported, daily, -np.inf), axis=1))
+            weights.append(weight)
+
+        quiet_shares = np.stack(quiet_shares, axis=1)
+        weights = np.array(weights)[None, :]
+        present = ~np.isnan(quiet_shares)
+        score = np.nansum(quiet_shares * weights, axis=1) / np.where(present.any(axis=1), (weights * present).sum(axis=1), np.nan)
+        coverage = (~np.isnan(values)).any(axis=1).sum(axis=1) / days
+
+    return {
+        'score': score,
+        'coverage': coverage,
+        'quiet_shares': quiet_shares,
+        'peaks': np.stack(peaks, axis=1),
+        'checks': [name for name, _, _, _ in checks]
+    }
+
+
+def confidence_levels(score: Any, coverage: Any) -> Any:
+    """Confidence level per resource ('' when not an idle candidate)."""
+    levels = np.full(score.shape, '', dtype=object)
+    undecided = np.ones(score.shape, dtype=bool)
+    with np.errstate(invalid='ignore'):
+        for level, min_score, min_coverage in CONFIDENCE_LEVELS:
+            match = undecided & (score >= min_score) & (coverage >= min_coverage)
+            levels[match] = level
+            undecided &= ~match
+    return levels
+
+
+def detect_idle(
+    cloudwatch_client: Any,
+    rows: List[Dict[str, Any]],
+    days: int = 14
+) -> List[Dict[str, Any]]:
+    """Idle EC2, RDS and ElastiCache resources with action, confidence, score and the signals behind it."""
+    if np is None:
+        raise RuntimeError("numpy is not available; attach the numpy layer")
+
+    end_time = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    start_time = end_time - timedelta(days=days)
+    candidates = []
+
+    for resource_type in IDLE_SIGNALS:
+        resources = [row for row in rows if row['resource_type'] == resource_type]
+        if not resources:
+            continue
+
+        group_size = len(IDLE_SIGNALS[resource_type]['signals'])
+        series = get_metric_data(cloudwatch_client, idle_queries(resources, resource_type), start_time, end_time, group_size)
+        scores = score_idle(signal_array(series, resource_type, len(resources), days), resource_type, days)
+        levels = confidence_levels(scores['score'], scores['coverage'])
+
+        for index in np.flatnonzero(levels != ''):
+            confidence = levels[index]
+            candidates.append({
+                'resource': resources[index],
+                'action': IDLE_ACTIONS[resource_type][confidence],
+                'confidence': confidence,
+                'score': round(float(scores['score'][index]), 3),
+                'coverage': round(float(scores['coverage'][index]), 3),
+                'signals': {
+                    check: {
+                        'quiet_share': round(float(scores['quiet_shares'][index, column]), 3),
+                        'peak': round(float(scores['peaks'][index, column]), 2)
+                    }
+                    for column, check in enumerate(scores['checks'])
+                    if not np.isnan(scores['quiet_shares'][index, column])
+                }
+            })
+
+    return candidates
+
+
+def describe_signals(signals: Dict[str, Dict[str, float]]) -> str:
+    """Human-readable peaks, e.g. 'peak CPU 3.1%, peak network 12.3 MB/day'."""
+    labels: List[Tuple[str, str]] = [
+        ('cpu_max', 'peak CPU {:.1f}%'),
+        ('connections', 'peak connections {:.0f}'),
+        ('cache_lookups', 'cache lookups up to {:.0f}/day'),
+    ]
+    parts = [template.format(signals[name]['peak']) for name, template in labels if name in signals]
+    if 'network_bytes' in signals:
+        parts.append(f"network up to {signals['network_bytes']['peak'] / MB:.1f} MB/day")
+    return ', '.join(parts)
@@ -0,0 +1,79 @@
+"""
+Cost Optimizer Batched Metrics
+Fetches CloudWatch metrics for many resources with GetMetricData, up to 500
+queries per request, instead of one GetMetricStatistics call per resource.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Any
+
+MAX_QUERIES_PER_REQUEST = 500
+
+
+def metric_query(
+    query_id: str,
+    namespace: str,
+    metric_name: str,
+    dimensions: List[Dict[str, str]],
+    stat: str,
+    period: int,
+    return_data: bool = True
+) -> Dict[str, Any]:
+    """One MetricDataQuery; `query_id` must start with a lowercase letter."""
+    return {
+        'Id': query_id,
+        'MetricStat': {
+            'Metric': {
+                'Namespace': namespace,
+                'MetricName': metric_name,
+                'Dimensions': dimensions
+            },
+            'Period': period,
+            'Stat': stat
+        },
+        'ReturnData': return_data
+    }
+
+
+def metric_expression(query_id: str, expression: str) -> Dict[str, Any]:
+    """A metric math query over other query IDs of the same request."""
+    return {'Id': query_id, 'Expression': expression, 'ReturnData': True}
+
+
+def get_metric_data(
+    cloudwatch_client: Any,
+    queries: List[Dict[str, Any]],
+    start_time: datetime,
+    end_time: datetime,
+    group_size: int = 1
+) -> Dict[str, Dict[str, List[Any]]]:
+    """
+    Run the queries in batches of up to 500, following NextToken, and return
+    {query id: {'timestamps': [...], 'values': [...]}} in ascending time order.
+
+    Queries come in consecutive groups of `group_size` (e.g. metrics and the
+    expression combining them) that are never split across requests.
+    """
+    results: Dict[str, Dict[str, List[Any]]] = {
+        query['Id']: {'timestamps': [], 'values': []} for query in queries if query.get('ReturnData', True)
+    }
+    batch_size = (MAX_QUERIES_PER_REQUEST // group_size) * group_size
+
+    for offset in range(0, len(queries), batch_size):
+        params = {
+            'MetricDataQueries': queries[offset:offset + batch_size],
+            'StartTime': start_time,
+            'EndTime': end_time,
+            'ScanBy': 'TimestampAscending'
+        }
+        while True:
+            response = cloudwatch_client.get_metric_data(**params)
+            for result in response.get('MetricDataResults', []):
+                series = results.setdefault(result['Id'], {'timestamps': [], 'values': []})
+                series['timestamps'].extend(result.get('Timestamps', []))
+                series['values'].extend(result.get('Values', []))
+            if not response.get('NextToken'):
+                break
+            params['NextToken'] = response['NextToken']
+
+    return results
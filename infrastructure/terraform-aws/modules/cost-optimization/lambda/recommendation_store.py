@@ -0,0 +1,242 @@
+"""
+Cost Optimizer Recommendation Store
+Persistent SQLite history of recommendations keyed by (resource_type, resource_id, rule),
+used to report only what changed since the previous run.
+
+The database lives in S3 between runs (downloaded to /tmp at the start of a run and
+uploaded at the end) or at a local path for testing.
+"""
+
+import os
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Iterable, Optional
+
+from sqlite_sync import SyncedDatabase, download_database, upload_database
+
+PRIORITY_RANK = {'low': 0, 'medium': 1, 'high': 2, 'critical': 3}
+
+# Savings growth that counts as an escalation even without a priority change
+ESCALATION_SAVINGS_RATIO = 1.25
+ESCALATION_SAVINGS_MIN = 10.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS recommendations (
+    resource_type TEXT NOT NULL,
+    resource_id TEXT NOT NULL,
+    rule TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    estimated_monthly_savings REAL NOT NULL DEFAULT 0,
+    recommendation TEXT,
+    state TEXT NOT NULL DEFAULT 'active',
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    resolved_at TEXT,
+    acknowledged INTEGER NOT NULL DEFAULT 0,
+    acknowledged_at TEXT,
+    last_run INTEGER NOT NULL,
+    PRIMARY KEY (resource_type, resource_id, rule)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_recommendations_state ON recommendations (state, last_run);
+
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    active INTEGER NOT NULL,
+    new INTEGER NOT NULL,
+    escalated INTEGER NOT NULL,
+    resolved INTEGER NOT NULL
+);
+"""
+
+
+def recommendation_key(recommendation: Dict[str, Any]) -> tuple:
+    return (
+        recommendation['resource_type'],
+        str(recommendation['resource_id']),
+        recommendation.get('rule') or recommendation['resource_type'].lower()
+    )
+
+
+class RecommendationStore(SyncedDatabase):
+    """Indexed recommendation history with first/last seen and acknowledgement tracking."""
+
+    def __init__(self, path: str):
+        super().__init__(path, SCHEMA)
+
+    def record_run(
+        self,
+        recommendations: List[Dict[str, Any]],
+        now: Optional[datetime] = None,
+        completed_rules: Optional[Iterable[str]] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Merge this run's recommendations into the store and return the delta:
+        new (never seen or previously resolved), escalated (higher priority or
+        notably higher savings) and resolved (active before, absent now).
+        Acknowledged items are only reported again when they escalate.
+
+        Only rules in `completed_rules` (all rules when None) are resolved, so
+        an analyzer that failed this run does not resolve its open items.
+        """
+        now_iso = (now or datetime.now(timezone.utc)).isoformat()
+        conn = self.conn
+        completed = None if completed_rules is None else sorted(set(completed_rules))
+        rule_filter = '' if completed is None else f"AND rule IN ({', '.join('?' for _ in completed)})"
+
+        with conn:
+            run_id = conn.execute(
+                'INSERT INTO runs (started_at, active, new, escalated, resolved) VALUES (?, 0, 0, 0, 0)',
+                (now_iso,)
+            ).lastrowid
+
+            conn.execute('DROP TABLE IF EXISTS temp.current')
+            conn.execute("""
+                CREATE TEMP TABLE current (
+                    resource_type TEXT NOT NULL,
+                    resource_id TEXT NOT NULL,
+                    rule TEXT NOT NULL,
+                    priority TEXT NOT NULL,
+                    estimated_monthly_savings REAL NOT NULL,
+                    recommendation TEXT,
+                    PRIMARY KEY (resource_type, resource_id, rule)
+                ) WITHOUT ROWID
+            """)
+            current = {}
+            for r in recommendations:
+                current[recommendation_key(r)] = r
+            conn.executemany(
+                'INSERT INTO temp.current VALUES (?, ?, ?, ?, ?, ?)',
+                [
+                    key + (r.get('priority', 'low'), float(r.get('estimated_monthly_savings', 0) or 0), r.get('recommendation'))
+                    for key, r in current.items()
+                ]
+            )
+
+            new, escalated = [], []
+            rows = conn.execute("""
+                SELECT c.resource_type, c.resource_id, c.rule, c.priority, c.estimated_monthly_savings,
+                       r.state AS previous_state, r.priority AS previous_priority,
+                       r.estimated_monthly_savings AS previous_savings, r.acknowledged
+                FROM temp.current c
+                LEFT JOIN recommendations r
+                  ON r.resource_type = c.resource_type AND r.resource_id = c.resource_id AND r.rule = c.rule
+            """).fetchall()
+            for row in rows:
+                key = (row['resource_type'], row['resource_id'], row['rule'])
+                if row['previous_state'] is None or row['previous_state'] == 'resolved':
+                    new.append(current[key])
+                elif (
+                    PRIORITY_RANK.get(row['priority'], 0) > PRIORITY_RANK.get(row['previous_priority'], 0)
+                    or row['estimated_monthly_savings'] >= max(
+                        row['previous_savings'] * ESCALATION_SAVINGS_RATIO,
+                        row['previous_savings'] + ESCALATION_SAVINGS_MIN
+                    )
+                ):
+                    escalated.append(dict(current[key], previous_priority=row['previous_priority']))
+
+            resolved = [dict(row) for row in conn.execute(f"""
+                SELECT r.resource_type, r.resource_id, r.rule, r.priority, r.estimated_monthly_savings,
+                       r.recommendation, r.first_seen, r.acknowledged
+                FROM recommendations r
+                WHERE r.state = 'active' {rule_filter}
+                  AND NOT EXISTS (
+                    SELECT 1 FROM temp.current c
+                    WHERE c.resource_type = r.resource_type AND c.resource_id = r.resource_id AND c.rule = r.rule
+                  )
+            """, completed or [])]
+
+            # Reopened items start over; escalations clear a previous acknowledgement
+            escalated_keys = {recommendation_key(r) for r in escalated}
+            conn.executemany("""
+                INSERT INTO recommendations (
+                    resource_type, resource_id, rule, priority, estimated_monthly_savings,
+                    recommendation, state, first_seen, last_seen, last_run
+                )
+                VALUES (?, ?, ?, ?, ?, ?, 'active', ?, ?, ?)
+                ON CONFLICT (resource_type, resource_id, rule) DO UPDATE SET
+                    priority = excluded.priority,
+                    estimated_monthly_savings = excluded.estimated_monthly_savings,
+                    recommendation = excluded.recommendation,
+                    first_seen = CASE WHEN recommendations.state = 'resolved' THEN excluded.first_seen ELSE recommendations.first_seen END,
+                    acknowledged = CASE WHEN recommendations.state = 'resolved' OR ? THEN 0 ELSE recommendations.acknowledged END,
+                    acknowledged_at = CASE WHEN recommendations.state = 'resolved' OR ? THEN NULL ELSE recommendations.acknowledged_at END,
+                    state = 'active',
+                    resolved_at = NULL,
+                    last_seen = excluded.last_seen,
+                    last_run = excluded.last_run
+            """, [
+                key + (
+                    r.get('priority', 'low'),
+                    float(r.get('estimated_monthly_savings', 0) or 0),
+                    r.get('recommendation'),
+                    now_iso,
+                    now_iso,
+                    run_id,
+                    key in escalated_keys,
+                    key in escalated_keys
+                )
+                for key, r in current.items()
+            ])
+
+            conn.execute(f"""
+                UPDATE recommendations SET state = 'resolved', resolved_at = ?
+                WHERE state = 'active' AND last_run < ? {rule_filter}
+            """, [now_iso, run_id] + (completed or []))
+
+            conn.execute(
+                'UPDATE runs SET active = ?, new = ?, escalated = ?, resolved = ? WHERE run_id = ?',
+                (len(current), len(new), len(escalated), len(resolved), run_id)
+            )
+            conn.execute('DROP TABLE temp.current')
+
+        return {
+            'new': new,
+            'escalated': escalated,
+            # Acknowledged items resolving on their own need no attention
+            'resolved': [r for r in resolved if not r.pop('acknowledged')]
+        }
+
+    def acknowledge(self, keys: List[Dict[str, Any]], now: Optional[datetime] = None) -> int:
+        """Mark recommendations as acknowledged so they are not reported until they escalate."""
+        now_iso = (now or datetime.now(timezone.utc)).isoformat()
+        with self.conn:
+            cursor = self.conn.executemany("""
+                UPDATE recommendations SET acknowledged = 1, acknowledged_at = ?
+                WHERE resource_type = ? AND resource_id = ? AND rule = ?
+            """, [(now_iso,) + recommendation_key(k) for k in keys])
+        return cursor.rowcount
+
+    def get(self, resource_type: str, resource_id: str, rule: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute(
+            'SELECT * FROM recommendations WHERE resource_type = ? AND resource_id = ? AND rule = ?',
+            (resource_type, resource_id, rule)
+        ).fetchone()
+        return dict(row) if row else None
+
+
+def open_recommendation_store(s3_client: Any = None) -> Optional[RecommendationStore]:
+    """
+    Open the store configured by RECOMMENDATION_STORE_BUCKET/KEY (S3, copied to
+    RECOMMENDATION_DB_PATH) or RECOMMENDATION_DB_PATH alone (local).
+    """
+    path = os.environ.get('RECOMMENDATION_DB_PATH', '/tmp/recommendations.sqlite')
+    bucket = os.environ.get('RECOMMENDATION_STORE_BUCKET', '')
+    key = os.environ.get('RECOMMENDATION_STORE_KEY', 'cost-optimizer/recommendations.sqlite')
+
+    if bucket:
+        download_database(s3_client, bucket, key, path)
+    elif not os.environ.get('RECOMMENDATION_DB_PATH'):
+        return None
+
+    return RecommendationStore(path)
+
+
+def save_recommendation_store(store: RecommendationStore, s3_client: Any = None) -> None:
+    """Close the store and upload it back to S3 when one is configured."""
+    upload_database(
+        store,
+        s3_client,
+        os.environ.get('RECOMMENDATION_STORE_BUCKET', ''),
+        os.environ.get('RECOMMENDATION_STORE_KEY', 'cost-optimizer/recommendations.sqlite')
+    )
@@ -0,0 +1,275 @@
+"""
+Cost Optimizer Rule Engine
+Evaluates declarative recommendation rules over a columnar resource table.
+
+Inventory and metric data for every resource are first loaded into one table of
+NumPy columns. Rules from the configuration (rules.json, or RULES_LOCATION) are
+compiled once into vectorized column filters and savings formulas, so each rule
+runs over the whole estate in a few array operations.
+
+Rule configuration:
+
+    {
+      "derived": {"monthly_gb_cost": "size_gb * 0.10"},
+      "rules": [
+        {
+          "rule": "ec2-rightsizing",
+          "resource_type": "EC2",
+          "when": [["cpu_avg", "<", 10]],
+          "priority": "high",
+          "savings": "rightsizing_savings",
+          "include": {"current_type": "instance_type"},
+          "message": "Instance {resource_id} has low CPU utilization ({cpu_avg:.1f}%)."
+        }
+      ]
+    }
+
+Conditions in "when" are ANDed; {"any": [...]} ORs a nested list. Operators:
+<, <=, >, >=, ==, !=, in, not in. Missing numeric values never match. Formulas
+support + - * / **, numbers, column names and min/max/abs/ceil/floor. Several
+entries may share a rule name (e.g. different thresholds); the first matching
+entry per resource wins, so stricter entries go first.
+
+numpy is provided by a Lambda layer.
+"""
+
+import ast
+import json
+import operator
+import string
+from typing import Dict, List, Any, Callable, Iterable
+
+try:
+    import numpy as np
+except ImportError:  # provided by a Lambda layer
+    np = None
+
+COMPARISONS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow,
+}
+
+
+class ResourceTable:
+    """Columnar resource data: numeric columns as float arrays (NaN when missing), others as object arrays."""
+
+    def __init__(self, columns: Dict[str, Any], size: int):
+        self.columns = columns
+        self.size = size
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict[str, Any]]) -> 'ResourceTable':
+        if np is None:
+            raise RuntimeError("numpy is not available; attach the numpy layer")
+
+        names = []
+        for row in rows:
+            for name in row:
+                if name not in names:
+                    names.append(name)
+
+        columns = {}
+        for name in names:
+            values = [row.get(name) for row in rows]
+            # All-None columns are numeric (all NaN), so numeric conditions simply never match
+            if all(isinstance(v, (bool, int, float)) for v in values if v is not None):
+                columns[name] = np.array([np.nan if v is None else float(v) for v in values], dtype=float)
+            else:
+                columns[name] = np.array(['' if v is None else v for v in values], dtype=object)
+        return cls(columns, len(rows))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add_column(self, name: str, values: Any):
+        self.columns[name] = values
+
+    def column(self, name: str) -> Any:
+        if name not in self.columns:
+            return np.full(self.size, np.nan)
+        return self.columns[name]
+
+    def row(self, index: int, names: Iterable[str]) -> Dict[str, Any]:
+        values = {}
+        for name in names:
+            value = self.column(name)[index]
+            values[name] = value.item() if hasattr(value, 'item') else value
+        return values
+
+
+def compile_expression(expression: Any) -> Callable[[ResourceTable], Any]:
+    """Compile a numeric formula over columns into a vectorized function of the table."""
+    if isinstance(expression, (int, float)):
+        constant = float(expression)
+        return lambda table: np.full(len(table), constant)
+
+    functions = {'min': np.minimum, 'max': np.maximum, 'abs': np.abs, 'ceil': np.ceil, 'floor': np.floor}
+
+    def build(node: ast.AST) -> Callable[[ResourceTable], Any]:
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            value = float(node.value)
+            return lambda table: value
+        if isinstance(node, ast.Name):
+            name = node.id
+            return lambda table: table.column(name).astype(float)
+        if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+            op = BINARY_OPERATORS[type(node.op)]
+            left, right = build(node.left), build(node.right)
+            return lambda table: op(left(table), right(table))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            operand = build(node.operand)
+            return lambda table: -operand(table)
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in functions and not node.keywords:
+            function = functions[node.func.id]
+            arguments = [build(argument) for argument in node.args]
+            return lambda table: function(*[argument(table) for argument in arguments])
+        raise ValueError(f"Unsupported expression in rule formula: {ast.dump(node)}")
+
+    compiled = build(ast.parse(str(expression), mode='eval').body)
+
+    def evaluate(table: ResourceTable) -> Any:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.broadcast_to(np.asarray(compiled(table), dtype=float), (len(table),))
+
+    return evaluate
+
+
+def compile_condition(condition: Any) -> Callable[[ResourceTable], Any]:
+    """Compile a [column, operator, value] condition or {"any": [...]} into a boolean mask function."""
+    if isinstance(condition, dict) and 'any' in condition:
+        parts = [compile_conditions(part if isinstance(part, list) and part and isinstance(part[0], list) else [part])
+                 for part in condition['any']]
+        return lambda table: np.logical_or.reduce([part(table) for part in parts]) if parts else np.zeros(len(table), dtype=bool)
+
+    column, op, value = condition
+    if op in ('in', 'not in'):
+        values = list(value)
+
+        def membership(table: ResourceTable) -> Any:
+            data = table.column(column)
+            mask = np.isin(data, values)
+            valid = ~np.isnan(data) if data.dtype == float else np.ones(len(table), dtype=bool)
+            return (mask if op == 'in' else ~mask) & valid
+        return membership
+
+    if op not in COMPARISONS:
+        raise ValueError(f"Unsupported operator in rule condition: {op}")
+    compare = COMPARISONS[op]
+
+    def comparison(table: ResourceTable) -> Any:
+        data = table.column(column)
+        if data.dtype == float:
+            if isinstance(value, str):
+                return np.zeros(len(table), dtype=bool)
+            with np.errstate(invalid='ignore'):
+                return compare(data, float(value)) & ~np.isnan(data)
+        try:
+            return np.asarray(compare(data, value), dtype=bool)
+        except TypeError:
+            # Mixed column: values that cannot be compared with the operand never match
+            return np.array([_compares(compare, item, value) for item in data], dtype=bool)
+    return comparison
+
+
+def _compares(compare: Callable[[Any, Any], Any], item: Any, value: Any) -> bool:
+    try:
+        return bool(compare(item, value))
+    except TypeError:
+        return False
+
+
+def compile_conditions(conditions: List[Any]) -> Callable[[ResourceTable], Any]:
+    parts = [compile_condition(condition) for condition in conditions]
+    return lambda table: np.logical_and.reduce([part(table) for part in parts] + [np.ones(len(table), dtype=bool)])
+
+
+class Rule:
+    """One compiled rule entry."""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.rule = config['rule']
+        self.resource_type = config['resource_type']
+        self.priority = config.get('priority', 'medium')
+        self.message = config['message']
+        self.include = config.get('include', {})
+        # Columns read per matching row: message fields, included columns and the ID
+        self.fields = {'resource_id'} | set(self.include.values()) | {
+            field.split('.')[0].split('[')[0]
+            for _, field, _, _ in string.Formatter().parse(self.message) if field
+        }
+        self.savings_fraction = config.get('savings_fraction')
+        self.condition = compile_conditions([['resource_type', '==', self.resource_type]] + config.get('when', []))
+        self.savings = compile_expression(config.get('savings', 0))
+
+
+class RuleEngine:
+    """Derived columns and rules compiled from a configuration."""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.derived = {name: compile_expression(formula) for name, formula in config.get('derived', {}).items()}
+        self.rules = [Rule(entry) for entry in config.get('rules', []) if entry.get('enabled', True)]
+
+    @classmethod
+    def from_json(cls, text: str) -> 'RuleEngine':
+        return cls(json.loads(text))
+
+    def evaluate(self, table: ResourceTable) -> List[Dict[str, Any]]:
+        """Recommendations for every (resource, rule) match across the table."""
+        for name, formula in self.derived.items():
+            table.add_column(name, formula(table))
+
+        recommendations = []
+        claimed: Dict[str, Any] = {}
+        for rule in self.rules:
+            mask = rule.condition(table)
+            if rule.rule in claimed:
+                mask &= ~claimed[rule.rule]
+                claimed[rule.rule] |= mask
+            else:
+                claimed[rule.rule] = mask.copy()
+
+            matches = np.flatnonzero(mask)
+            if matches.size == 0:
+                continue
+
+            savings = np.nan_to_num(rule.savings(table), nan=0.0, posinf=0.0, neginf=0.0)
+            for index in matches:
+                row = table.row(index, rule.fields)
+                recommendation = {
+                    'resource_type': rule.resource_type,
+                    'resource_id': row['resource_id'],
+                    'rule': rule.rule,
+                    'recommendation': rule.message.format(**row),
+                    'priority': rule.priority,
+                    'estimated_monthly_savings': round(float(savings[index]), 2)
+                }
+                for key, column in rule.include.items():
+                    recommendation[key] = row.get(column)
+                if rule.savings_fraction is not None:
+                    recommendation['savings_fraction'] = rule.savings_fraction
+                recommendations.append(recommendation)
+
+        return recommendations
+
+
+def load_rule_engine(location: str, s3_client: Any = None) -> RuleEngine:
+    """Load rules from a local JSON file or an s3://bucket/key URI."""
+    if location.startswith('s3://'):
+        bucket, _, key = location[len('s3://'):].partition('/')
+        text = s3_client.get_object(Bucket=bucket, Key=key)['Body'].read().decode('utf-8')
+    else:
+        with open(location) as f:
+            text = f.read()
+    return RuleEngine.from_json(text)
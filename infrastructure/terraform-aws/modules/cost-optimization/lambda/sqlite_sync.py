@@ -0,0 +1,52 @@
+"""
+Cost Optimizer SQLite Sync
+SQLite databases that live in S3 between runs: downloaded to /tmp at the start
+of a run and uploaded back at the end. Used by the recommendation store and the
+anomaly cost cube.
+"""
+
+import os
+import sqlite3
+from typing import Any
+
+
+class SyncedDatabase:
+    """SQLite connection in WAL mode whose file can be uploaded as a single file once closed."""
+
+    def __init__(self, path: str, schema: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(schema)
+
+    def close(self) -> None:
+        # Fold the WAL back into the main file so a single file can be uploaded
+        self.conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        self.conn.close()
+
+
+def download_database(s3_client: Any, bucket: str, key: str, path: str) -> None:
+    """
+    Replace the local copy at `path` with s3://bucket/key. A missing object
+    leaves no local file, so a fresh database is created.
+    """
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    try:
+        s3_client.download_file(bucket, key, path)
+    except Exception as e:
+        # Only a missing object starts a fresh database; anything else would overwrite it
+        code = getattr(e, 'response', {}).get('Error', {}).get('Code')
+        if code not in ('404', 'NoSuchKey'):
+            raise
+        print(f"Starting new database at s3://{bucket}/{key}")
+
+
+def upload_database(database: SyncedDatabase, s3_client: Any, bucket: str, key: str) -> None:
+    """Close the database and upload it to s3://bucket/key when a bucket is configured."""
+    database.close()
+    if bucket:
+        s3_client.upload_file(database.path, bucket, key)
@@ -0,0 +1,304 @@
+"""
+Cost Optimizer Storage Performance
+IOPS and throughput utilization of provisioned EBS volumes and RDS storage, and
+the exact gp3 settings that cover the observed load.
+
+Read and write activity is fetched in batched GetMetricData requests and
+combined with metric math into per-second rates at a fine period (5 minutes by
+default, down to 1 minute). EBS operation and byte counts are Sums per period;
+RDS IOPS and throughput are already per-second Averages. The rate series of a
+request's worth of resources are stacked into NumPy matrices to compute p99 and
+peak utilization against provisioned IOPS and throughput in one pass.
+
+The recommended gp3 IOPS/throughput cover the p99 rate plus headroom, and never
+go below the gp3 baseline. RDS gp3 IOPS and throughput can only be set from 400
+GB (except SQL Server), so smaller instances that need more than the baseline
+are recommended to grow to 400 GB, with the extra storage priced in. Prices are
+us-east-1 on-demand approximations.
+"""
+
+import math
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # provided by a Lambda layer
+    np = None
+
+from metrics import metric_query, metric_expression, get_metric_data
+
+HEADROOM = 0.2
+MIB = 1048576
+
+# EBS prices per GB-month, provisioned IOPS-month and MiB/s-month
+EBS_STORAGE_PRICE = {'gp2': 0.10, 'gp3': 0.08, 'io1': 0.125, 'io2': 0.125}
+EBS_IO1_IOPS_PRICE = 0.065
+EBS_IO2_IOPS_TIERS = [(32000, 0.065), (64000, 0.0455), (math.inf, 0.03185)]
+EBS_GP3_IOPS_PRICE = 0.005
+EBS_GP3_THROUGHPUT_PRICE = 0.04
+
+# gp3 volume limits
+EBS_GP3 = {
+    'baseline_iops': 3000,
+    'baseline_throughput': 125,
+    'max_iops': 80000,
+    'max_throughput': 2000,
+    'iops_per_gb': 500,
+    'throughput_per_iops': 0.25
+}
+
+# RDS prices (Single-AZ; Multi-AZ doubles)
+RDS_STORAGE_PRICE = {'gp2': 0.115, 'gp3': 0.115, 'io1': 0.125, 'io2': 0.125}
+RDS_IOPS_PRICE = {'io1': 0.10, 'io2': 0.10, 'gp3': 0.02}
+RDS_GP3_THROUGHPUT_PRICE = 0.08
+
+# RDS gp3 baseline depends on allocated storage (SQL Server always has the small baseline)
+RDS_GP3_SMALL = {'baseline_iops': 3000, 'baseline_throughput': 125}
+RDS_GP3_LARGE = {'baseline_iops': 12000, 'baseline_throughput': 500}
+RDS_GP3_LARGE_FROM_GB = 400
+RDS_GP3_MAX_IOPS = 64000
+RDS_GP3_MAX_THROUGHPUT = 4000
+
+PROVISIONED_VOLUME_TYPES = ('io1', 'io2', 'gp3')
+
+# Four hidden metrics and two rate expressions per resource fit 83 resources in one request
+RESOURCES_PER_REQUEST = 83
+
+
+def storage_queries(resources: List[Dict[str, Any]], period: int) -> Tuple[List[Dict[str, Any]], int]:
+    """Hidden read/write metrics and the IOPS and MiB/s rate expressions for each resource."""
+    queries = []
+    for index, resource in enumerate(resources):
+        prefix = f"r{index}"
+        if resource['resource_type'] == 'EBS':
+            dimensions = [{'Name': 'VolumeId', 'Value': resource['resource_id']}]
+            for suffix, metric_name in (('ro', 'VolumeReadOps'), ('wo', 'VolumeWriteOps'),
+                                        ('rb', 'VolumeReadBytes'), ('wb', 'VolumeWriteBytes')):
+                queries.append(metric_query(f"{prefix}_{suffix}", 'AWS/EBS', metric_name, dimensions, 'Sum', period, False))
+            queries.append(metric_expression(f"{prefix}_iops", f"(FILL({prefix}_ro, 0) + FILL({prefix}_wo, 0)) / PERIOD({prefix}_ro)"))
+            queries.append(metric_expression(f"{prefix}_mibps", f"(FILL({prefix}_rb, 0) + FILL({prefix}_wb, 0)) / PERIOD({prefix}_rb) / {MIB}"))
+        else:
+            dimensions = [{'Name': 'DBInstanceIdentifier', 'Value': resource['resource_id']}]
+            for suffix, metric_name in (('ro', 'ReadIOPS'), ('wo', 'WriteIOPS'),
+                                        ('rb', 'ReadThroughput'), ('wb', 'WriteThroughput')):
+                queries.append(metric_query(f"{prefix}_{suffix}", 'AWS/RDS', metric_name, dimensions, 'Average', period, False))
+            queries.append(metric_expression(f"{prefix}_iops", f"FILL({prefix}_ro, 0) + FILL({prefix}_wo, 0)"))
+            queries.append(metric_expression(f"{prefix}_mibps", f"(FILL({prefix}_rb, 0) + FILL({prefix}_wb, 0)) / {MIB}"))
+    return queries, 6
+
+
+def _stack(series: Dict[str, Dict[str, List[Any]]], ids: List[str]) -> Any:
+    """Rate series of all resources as a NaN-padded matrix (resources x periods)."""
+    lengths = [len(series.get(query_id, {}).get('values', [])) for query_id in ids]
+    matrix = np.full((len(ids), max(lengths + [1])), np.nan)
+    for row, query_id in enumerate(ids):
+        values = series.get(query_id, {}).get('values', [])
+        matrix[row, :len(values)] = values
+    return matrix
+
+
+def rate_statistics(series: Dict[str, Dict[str, List[Any]]], count: int) -> Dict[str, Any]:
+    """p99 and peak IOPS and MiB/s per resource (NaN without data)."""
+    iops = _stack(series, [f"r{index}_iops" for index in range(count)])
+    mibps = _stack(series, [f"r{index}_mibps" for index in range(count)])
+    with np.errstate(all='ignore'):
+        empty = np.isnan(iops).all(axis=1)
+        iops[empty] = 0.0
+        mibps[np.isnan(mibps).all(axis=1)] = 0.0
+        stats = {
+            'p99_iops': np.nanpercentile(iops, 99, axis=1),
+            'peak_iops': np.nanmax(iops, axis=1),
+            'p99_mibps': np.nanpercentile(mibps, 99, axis=1),
+            'peak_mibps': np.nanmax(mibps, axis=1),
+        }
+    stats['has_data'] = ~empty
+    return stats
+
+
+def _round_up(value: float, step: int) -> int:
+    return int(math.ceil(value / step) * step)
+
+
+def ebs_monthly_cost(volume_type: str, size_gb: float, iops: float, throughput: float) -> float:
+    cost = size_gb * EBS_STORAGE_PRICE.get(volume_type, 0.10)
+    if volume_type == 'io1':
+        cost += iops * EBS_IO1_IOPS_PRICE
+    elif volume_type == 'io2':
+        remaining, lower = iops, 0
+        for upper, price in EBS_IO2_IOPS_TIERS:
+            tier = min(remaining, upper - lower)
+            cost += tier * price
+            remaining -= tier
+            lower = upper
+            if remaining <= 0:
+                break
+    elif volume_type == 'gp3':
+        cost += max(0, iops - EBS_GP3['baseline_iops']) * EBS_GP3_IOPS_PRICE
+        cost += max(0, throughput - EBS_GP3['baseline_throughput']) * EBS_GP3_THROUGHPUT_PRICE
+    return cost
+
+
+def gp3_settings(p99_iops: float, p99_mibps: float, size_gb: float) -> Optional[Tuple[int, int]]:
+    """Smallest gp3 IOPS/throughput covering p99 plus headroom, or None when gp3 cannot."""
+    iops = max(EBS_GP3['baseline_iops'], _round_up(p99_iops * (1 + HEADROOM), 100))
+    throughput = max(EBS_GP3['baseline_throughput'], _round_up(p99_mibps * (1 + HEADROOM), 5))
+    # Throughput above 0.25 MiB/s per IOPS needs more IOPS
+    iops = max(iops, _round_up(throughput / EBS_GP3['throughput_per_iops'], 100))
+    max_iops = min(EBS_GP3['max_iops'], max(EBS_GP3['baseline_iops'], size_gb * EBS_GP3['iops_per_gb']))
+    if iops > max_iops or throughput > EBS_GP3['max_throughput']:
+        return None
+    return iops, throughput
+
+
+def recommend_ebs(volume: Dict[str, Any], stats: Dict[str, float]) -> Optional[Dict[str, Any]]:
+    """gp3 settings (or lower provisioned IOPS when gp3 cannot carry the load) with savings."""
+    volume_type = volume['volume_type']
+    size_gb = volume['size_gb']
+    provisioned_iops = volume.get('iops') or 0
+    provisioned_throughput = volume.get('throughput') or (EBS_GP3['baseline_throughput'] if volume_type == 'gp3' else 0)
+    current = ebs_monthly_cost(volume_type, size_gb, provisioned_iops, provisioned_throughput)
+
+    settings = gp3_settings(stats['p99_iops'], stats['p99_mibps'], size_gb)
+    if settings:
+        iops, throughput = settings
+        target = {'volume_type': 'gp3', 'iops': iops, 'throughput': throughput}
+        proposed = ebs_monthly_cost('gp3', size_gb, iops, throughput)
+    elif volume_type in ('io1', 'io2'):
+        iops = min(provisioned_iops, _round_up(stats['p99_iops'] * (1 + HEADROOM), 100))
+        target = {'volume_type': volume_type, 'iops': iops}
+        proposed = ebs_monthly_cost(volume_type, size_gb, iops, 0)
+    else:
+        return None
+
+    if proposed >= current - 1:
+        return None
+    return {'current_monthly_cost': current, 'target': target, 'monthly_savings': current - proposed}
+
+
+def rds_gp3_baseline(allocated_gb: float, engine: str) -> Dict[str, int]:
+    if allocated_gb >= RDS_GP3_LARGE_FROM_GB and not engine.startswith('sqlserver'):
+        return RDS_GP3_LARGE
+    return RDS_GP3_SMALL
+
+
+def rds_monthly_cost(storage_type: str, allocated_gb: float, iops: float, throughput: float, engine: str, multi_az: bool) -> float:
+    cost = allocated_gb * RDS_STORAGE_PRICE.get(storage_type, 0.115)
+    if storage_type in ('io1', 'io2'):
+        cost += iops * RDS_IOPS_PRICE[storage_type]
+    elif storage_type == 'gp3':
+        baseline = rds_gp3_baseline(allocated_gb, engine)
+        cost += max(0, iops - baseline['baseline_iops']) * RDS_IOPS_PRICE['gp3']
+        cost += max(0, throughput - baseline['baseline_throughput']) * RDS_GP3_THROUGHPUT_PRICE
+    return cost * (2 if multi_az else 1)
+
+
+def recommend_rds(instance: Dict[str, Any], stats: Dict[str, float]) -> Optional[Dict[str, Any]]:
+    """
+    gp3 storage settings for an RDS instance with savings. Below 400 GB only
+    SQL Server can set gp3 IOPS/throughput; other engines that need more than
+    the baseline get a target size of 400 GB, priced into the proposal.
+    """
+    storage_type = instance['storage_type']
+    allocated_gb = instance['allocated_gb']
+    engine = instance.get('engine', '')
+    multi_az = bool(instance.get('multi_az'))
+    baseline = rds_gp3_baseline(allocated_gb, engine)
+    current = rds_monthly_cost(
+        storage_type, allocated_gb, instance.get('iops') or 0,
+        instance.get('throughput') or baseline['baseline_throughput'], engine, multi_az
+    )
+
+    iops_needed = _round_up(stats['p99_iops'] * (1 + HEADROOM), 100)
+    throughput_needed = _round_up(stats['p99_mibps'] * (1 + HEADROOM), 5)
+    target_gb = allocated_gb
+    if (
+        allocated_gb < RDS_GP3_LARGE_FROM_GB
+        and not engine.startswith('sqlserver')
+        and (iops_needed > baseline['baseline_iops'] or throughput_needed > baseline['baseline_throughput'])
+    ):
+        target_gb = RDS_GP3_LARGE_FROM_GB
+        baseline = rds_gp3_baseline(target_gb, engine)
+
+    iops = max(baseline['baseline_iops'], iops_needed)
+    throughput = max(baseline['baseline_throughput'], throughput_needed)
+    if iops > RDS_GP3_MAX_IOPS or throughput > RDS_GP3_MAX_THROUGHPUT:
+        return None
+
+    proposed = rds_monthly_cost('gp3', target_gb, iops, throughput, engine, multi_az)
+    if proposed >= current - 1:
+        return None
+    target = {'storage_type': 'gp3', 'iops': iops, 'throughput': throughput}
+    if target_gb != allocated_gb:
+        target['allocated_gb'] = target_gb
+    return {
+        'current_monthly_cost': current,
+        'target': target,
+        'monthly_savings': current - proposed
+    }
+
+
+def provisioned_resources(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """EBS io1/io2/gp3 volumes and RDS instances with EBS-backed storage (not Aurora)."""
+    return [
+        row for row in rows
+        if (row['resource_type'] == 'EBS' and row.get('volume_type') in PROVISIONED_VOLUME_TYPES)
+        or (row['resource_type'] == 'RDS' and row.get('storage_type') in RDS_STORAGE_PRICE
+            and not str(row.get('engine', '')).startswith('aurora'))
+    ]
+
+
+def analyze_storage(
+    cloudwatch_client: Any,
+    rows: List[Dict[str, Any]],
+    days: int = 14,
+    period: int = 300
+) -> List[Dict[str, Any]]:
+    """
+    Utilization and gp3 recommendation for every provisioned volume and RDS
+    instance. Resources are processed in chunks that fill one GetMetricData
+    request, which bounds the size of the rate matrices.
+    """
+    if np is None:
+        raise RuntimeError("numpy is not available; attach the numpy layer")
+
+    resources = provisioned_resources(rows)
+    end_time = datetime.utcnow()
+    start_time = end_time - timedelta(days=days)
+    results = []
+
+    for offset in range(0, len(resources), RESOURCES_PER_REQUEST):
+        chunk = resources[offset:offset + RESOURCES_PER_REQUEST]
+        queries, group_size = storage_queries(chunk, period)
+        series = get_metric_data(cloudwatch_client, queries, start_time, end_time, group_size)
+        stats = rate_statistics(series, len(chunk))
+
+        for index, resource in enumerate(chunk):
+            if not stats['has_data'][index]:
+                continue
+            resource_stats = {name: float(values[index]) for name, values in stats.items() if name != 'has_data'}
+
+            if resource['resource_type'] == 'EBS':
+                provisioned_iops = resource.get('iops') or 0
+                provisioned_throughput = resource.get('throughput') or 0
+                change = recommend_ebs(resource, resource_stats)
+            else:
+                baseline = rds_gp3_baseline(resource['allocated_gb'], resource.get('engine', ''))
+                provisioned_iops = resource.get('iops') or baseline['baseline_iops']
+                provisioned_throughput = resource.get('throughput') or 0
+                change = recommend_rds(resource, resource_stats)
+
+            if change:
+                utilization = {
+                    'p99_iops': round(resource_stats['p99_iops'], 1),
+                    'peak_iops': round(resource_stats['peak_iops'], 1),
+                    'p99_mibps': round(resource_stats['p99_mibps'], 2),
+                    'peak_mibps': round(resource_stats['peak_mibps'], 2),
+                    'p99_iops_utilization': round(resource_stats['p99_iops'] / provisioned_iops, 4) if provisioned_iops else None,
+                    'peak_iops_utilization': round(resource_stats['peak_iops'] / provisioned_iops, 4) if provisioned_iops else None,
+                    'p99_throughput_utilization': round(resource_stats['p99_mibps'] / provisioned_throughput, 4) if provisioned_throughput else None,
+                    'peak_throughput_utilization': round(resource_stats['peak_mibps'] / provisioned_throughput, 4) if provisioned_throughput else None
+                }
+                results.append({'resource': resource, 'utilization': utilization, **change})
+
+    return results
@@ -0,0 +1,44 @@
+"""Tests for anomaly_drilldown"""
+
+from datetime import date, timedelta
+
+from anomaly_drilldown import CostCube, drill_down
+
+TODAY = date(2026, 6, 1)
+
+
+class FakeCostExplorer:
+    """Daily cost of one service: $10/day, $50/day from the anomaly start."""
+
+    def __init__(self, anomaly_start):
+        self.anomaly_start = anomaly_start
+
+    def get_cost_and_usage(self, TimePeriod, **_):
+        day, end = date.fromisoformat(TimePeriod['Start']), date.fromisoformat(TimePeriod['End'])
+        results = []
+        while day < end:
+            cost = 50.0 if day >= self.anomaly_start else 10.0
+            results.append({
+                'TimePeriod': {'Start': day.isoformat()},
+                'Groups': [{'Keys': ['Amazon RDS', 'InstanceUsage'], 'Metrics': {'UnblendedCost': {'Amount': str(cost)}}}]
+            })
+            day += timedelta(days=1)
+        return {'ResultsByTime': results}
+
+
+def test_drill_down_keeps_the_baseline_of_anomalies_older_than_retention(tmp_path):
+    start = TODAY - timedelta(days=150)
+    anomaly = {
+        'AnomalyId': 'a-1',
+        'AnomalyStartDate': start.isoformat(),
+        'AnomalyEndDate': (start + timedelta(days=1)).isoformat(),
+        'RootCauses': [{'Service': 'Amazon RDS'}]
+    }
+    cube = CostCube(str(tmp_path / 'cube.sqlite'))
+
+    [result] = drill_down(FakeCostExplorer(start), cube, [anomaly], baseline_days=14, today=TODAY)
+
+    [driver] = result['drivers']['service_usage_type']
+    assert driver['baseline_daily_cost'] == 10.0
+    assert driver['daily_increase'] == 40.0
+    cube.close()
@@ -0,0 +1,26 @@
+"""Tests for commitment_planner"""
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from commitment_planner import best_commitment, evaluate_commitments  # noqa: E402
+
+
+def test_flat_usage_is_fully_committed_at_its_level():
+    plan = best_commitment(evaluate_commitments([10.0] * 720, {'compute-1yr-no-upfront': 0.3}, grid_points=101))
+
+    best = plan['recommended']
+    assert best['hourly_commitment'] == pytest.approx(7.0)
+    assert best['utilization'] == pytest.approx(1.0)
+    assert best['monthly_savings'] == pytest.approx(3.0 * 730)
+
+
+def test_spiky_usage_commits_only_to_the_level_used_often_enough():
+    # 2 $/h around the clock, 20 $/h for one hour a day
+    usage = ([2.0] * 23 + [20.0]) * 30
+    plan = best_commitment(evaluate_commitments(usage, {'compute-1yr-no-upfront': 0.3}, grid_points=1001))
+
+    best = plan['recommended']
+    assert best['hourly_commitment'] == pytest.approx(2.0 * 0.7, abs=0.02)
+    assert best['utilization'] >= best['break_even_utilization']
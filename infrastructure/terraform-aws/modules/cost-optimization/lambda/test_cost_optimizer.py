@@ -0,0 +1,64 @@
+"""Tests for the cost optimizer handler module (cost-optimizer.py)"""
+
+import importlib.util
+import os
+
+import pytest
+
+pytest.importorskip('boto3')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+spec = importlib.util.spec_from_file_location('cost_optimizer', os.path.join(os.path.dirname(__file__), 'cost-optimizer.py'))
+cost_optimizer = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(cost_optimizer)
+
+
+def test_idle_resources_keep_only_their_idle_recommendation():
+    recommendations = [
+        {'resource_type': 'RDS', 'resource_id': 'db-1', 'rule': 'rds-rightsizing'},
+        {'resource_type': 'RDS', 'resource_id': 'db-1', 'rule': 'rds-provisioned-iops'},
+        {'resource_type': 'RDS', 'resource_id': 'db-1', 'rule': 'rds-idle'},
+        {'resource_type': 'RDS', 'resource_id': 'db-2', 'rule': 'rds-rightsizing'},
+        {'resource_type': 'EC2', 'resource_id': 'db-1', 'rule': 'ec2-rightsizing'},
+    ]
+
+    kept = cost_optimizer.drop_superseded_by_idle(recommendations)
+
+    assert [(r['resource_id'], r['rule']) for r in kept] == [
+        ('db-1', 'rds-idle'),
+        ('db-2', 'rds-rightsizing'),
+        ('db-1', 'ec2-rightsizing'),
+    ]
+
+
+def test_failed_collector_keeps_its_open_items_active(tmp_path, monkeypatch):
+    from recommendation_store import RecommendationStore
+
+    store = RecommendationStore(str(tmp_path / 'store.sqlite'))
+    store.record_run([
+        {'resource_type': 'EC2', 'resource_id': 'i-1', 'rule': 'ec2-rightsizing', 'priority': 'medium',
+         'estimated_monthly_savings': 20.0, 'recommendation': 'downsize'},
+        {'resource_type': 'RDS', 'resource_id': 'db-1', 'rule': 'rds-rightsizing', 'priority': 'medium',
+         'estimated_monthly_savings': 20.0, 'recommendation': 'downsize'},
+    ])
+
+    def throttled():
+        print("Error collecting EC2 instances: Throttling")
+        raise RuntimeError('Throttling')
+
+    monkeypatch.setattr(cost_optimizer, 'numpy', cost_optimizer.numpy or object())
+    monkeypatch.setattr(cost_optimizer, 'collect_ec2_instances', throttled)
+    for name in ('collect_rds_instances', 'collect_ebs_volumes', 'collect_elasticache_clusters',
+                 'analyze_elastic_ips', 'analyze_s3_buckets', 'analyze_ecs_services', 'get_cost_anomalies'):
+        monkeypatch.setattr(cost_optimizer, name, lambda: [])
+    for name in ('analyze_resources', 'analyze_idle_resources', 'analyze_storage_performance', 'analyze_commitments'):
+        monkeypatch.setattr(cost_optimizer, name, lambda rows: [])
+    monkeypatch.setattr(cost_optimizer, 'open_recommendation_store', lambda s3_client: store)
+    monkeypatch.setattr(cost_optimizer, 'save_recommendation_store', lambda store, s3_client: None)
+    monkeypatch.setattr(cost_optimizer, 'send_notification', lambda *args: None)
+
+    assert cost_optimizer.lambda_handler({}, None)['statusCode'] == 200
+
+    # EC2 could not be listed, so its item stays open; RDS was listed without db-1
+    assert store.get('EC2', 'i-1', 'ec2-rightsizing')['state'] == 'active'
+    assert store.get('RDS', 'db-1', 'rds-rightsizing')['state'] == 'resolved'
@@ -0,0 +1,49 @@
+"""Tests for cur_ingestion"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pa = pytest.importorskip('pyarrow')
+pq = pytest.importorskip('pyarrow.parquet')
+pytest.importorskip('numpy')
+
+from cur_ingestion import scan_cur  # noqa: E402
+
+NOW = datetime(2026, 6, 10, tzinfo=timezone.utc)
+
+
+def write_cur(path):
+    day = NOW - timedelta(days=1)
+    rows = [
+        # resource, line item type, usage type, usage start, cost
+        ('i-1', 'Usage', 'BoxUsage:m5.large', day, 2.0),
+        ('i-1', 'Usage', 'BoxUsage:m5.large', day + timedelta(hours=1), 3.0),
+        ('vol-1', 'Usage', 'EBS:VolumeUsage.gp3', day, 1.0),
+        ('i-2', 'SavingsPlanCoveredUsage', 'BoxUsage:m5.large', day, 4.0),
+        # Outside the spend window but inside the usage window
+        ('i-1', 'Usage', 'BoxUsage:m5.large', NOW - timedelta(days=40), 5.0),
+    ]
+    pq.write_table(pa.table({
+        'line_item_resource_id': [r[0] for r in rows],
+        'line_item_line_item_type': [r[1] for r in rows],
+        'line_item_usage_type': [r[2] for r in rows],
+        'line_item_usage_start_date': pa.array([r[3] for r in rows], pa.timestamp('ms', tz='UTC')),
+        'line_item_unblended_cost': [r[4] for r in rows],
+        'savings_plan_savings_plan_effective_cost': [0.0, 0.0, 0.0, 4.0, 0.0],
+    }), str(path / 'part-0.parquet'))
+
+
+def test_one_pass_yields_spend_and_hourly_usage_matching_separate_passes(tmp_path):
+    write_cur(tmp_path)
+
+    both = scan_cur(str(tmp_path), spend_days=30, usage_days=60, now=NOW)
+    spend = scan_cur(str(tmp_path), spend_days=30, now=NOW)
+    usage = scan_cur(str(tmp_path), usage_days=60, now=NOW)
+
+    assert both['monthly_spend'] == spend['monthly_spend']
+    assert set(both['monthly_spend']) == {'i-1', 'vol-1', 'i-2'}
+    assert both['hourly_usage'].tolist() == usage['hourly_usage'].tolist()
+    # Only uncovered eligible usage counts: 2 + 3 + 5, not EBS or covered usage
+    assert both['hourly_usage'].sum() == 10.0
+    assert both['files'] == 1
@@ -0,0 +1,33 @@
+"""Tests for ecs_rightsizing"""
+
+from ecs_rightsizing import per_task_peaks, right_size_service
+
+
+def series(**metrics):
+    return {f"s0_{name}": {'timestamps': list(range(len(values))), 'values': values} for name, values in metrics.items()}
+
+
+def test_per_task_peaks_use_maximum_directly_and_sum_for_the_total():
+    # Four tasks peaking at 300 CPU units each, 1000 units in total at the busiest minute
+    peaks = per_task_peaks(series(cpu_max=[250.0, 300.0], mem_max=[700.0, 900.0], cpu_total=[800.0, 1000.0, 600.0]), 's0')
+
+    assert peaks['cpu_per_task'] == 300.0
+    assert peaks['memory_per_task'] == 900.0
+    assert peaks['peak_total_cpu'] == 1000.0
+    assert peaks['average_total_cpu'] == 800.0
+
+
+def test_per_task_peaks_without_container_insights():
+    assert per_task_peaks({}, 's0') is None
+
+
+def test_right_size_service_sizes_tasks_from_per_task_peaks():
+    service = {'desiredCount': 4, 'launchType': 'FARGATE'}
+    task_definition = {'cpu': '1024', 'memory': '4096'}
+    peaks = {'cpu_per_task': 300.0, 'memory_per_task': 900.0, 'peak_total_cpu': 1000.0}
+
+    [change] = right_size_service(service, task_definition, peaks)
+
+    assert change['rule'] == 'ecs-task-size'
+    assert change['recommended'] == {'cpu': 512, 'memory': 2048}
+    assert change['monthly_savings'] > 0
@@ -0,0 +1,32 @@
+"""Tests for idle_detector"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from idle_detector import confidence_levels, score_idle  # noqa: E402
+
+DAYS = 14
+
+
+def test_busy_cache_with_low_cpu_is_not_idle_but_unused_database_is():
+    # ElastiCache signals: cpu_max, connections_max, cache_hits, cache_misses, network_in, network_out
+    cache = np.array([[[3.0] * DAYS, [40.0] * DAYS, [5e6] * DAYS, [1e5] * DAYS, [1e9] * DAYS, [1e9] * DAYS]])
+    scores = score_idle(cache, 'ElastiCache', DAYS)
+    assert confidence_levels(scores['score'], scores['coverage'])[0] == ''
+
+    # RDS signals: cpu_max, connections_max, network_in, network_out (already daily bytes)
+    database = np.array([[[12.0] * DAYS, [0.0] * DAYS, [1e6] * DAYS, [1e6] * DAYS]])
+    scores = score_idle(database, 'RDS', DAYS)
+    # CPU from background work is busy, but no connections weigh three times as much
+    assert scores['score'][0] == pytest.approx(4 / 5)
+    assert confidence_levels(scores['score'], scores['coverage'])[0] == 'medium'
+
+
+def test_missing_days_lower_coverage_and_confidence():
+    values = np.full((1, 4, DAYS), np.nan)
+    values[0, :, :3] = 0.0
+    scores = score_idle(values, 'EC2', DAYS)
+
+    assert scores['score'][0] == 1.0
+    assert confidence_levels(scores['score'], scores['coverage'])[0] == ''
@@ -0,0 +1,47 @@
+"""Tests for recommendation_store"""
+
+from datetime import datetime, timedelta, timezone
+
+from recommendation_store import RecommendationStore
+
+NOW = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+
+def recommendation(resource_id, rule, resource_type='EC2', savings=20.0):
+    return {
+        'resource_type': resource_type,
+        'resource_id': resource_id,
+        'rule': rule,
+        'priority': 'medium',
+        'estimated_monthly_savings': savings,
+        'recommendation': f"{rule} for {resource_id}"
+    }
+
+
+def test_record_run_reports_new_and_resolved(tmp_path):
+    store = RecommendationStore(str(tmp_path / 'store.sqlite'))
+    store.record_run([recommendation('i-1', 'ec2-idle'), recommendation('i-2', 'ec2-idle')], NOW)
+
+    delta = store.record_run([recommendation('i-1', 'ec2-idle')], NOW + timedelta(days=1))
+
+    assert delta['new'] == []
+    assert [r['resource_id'] for r in delta['resolved']] == ['i-2']
+    assert store.get('EC2', 'i-2', 'ec2-idle')['state'] == 'resolved'
+
+
+def test_record_run_only_resolves_rules_that_completed(tmp_path):
+    store = RecommendationStore(str(tmp_path / 'store.sqlite'))
+    store.record_run([
+        recommendation('i-1', 'ec2-idle'),
+        recommendation('vol-1', 'ebs-provisioned-iops', resource_type='EBS'),
+    ], NOW)
+
+    # The storage analyzer failed this run, so its item is not resolved
+    delta = store.record_run([], NOW + timedelta(days=1), completed_rules={'ec2-idle'})
+
+    assert [r['resource_id'] for r in delta['resolved']] == ['i-1']
+    assert store.get('EBS', 'vol-1', 'ebs-provisioned-iops')['state'] == 'active'
+
+    # Once it completes again without the item, it resolves
+    delta = store.record_run([], NOW + timedelta(days=2), completed_rules={'ec2-idle', 'ebs-provisioned-iops'})
+    assert [r['resource_id'] for r in delta['resolved']] == ['vol-1']
@@ -0,0 +1,50 @@
+"""Tests for rule_engine"""
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from rule_engine import ResourceTable, RuleEngine  # noqa: E402
+
+ENGINE = RuleEngine({
+    'rules': [
+        {
+            'rule': 'ec2-rightsizing',
+            'resource_type': 'EC2',
+            'when': [['cpu_avg', '<', 10]],
+            'savings': 'monthly_cost * 0.5',
+            'message': '{resource_id} CPU {cpu_avg:.1f}%'
+        },
+        {
+            'rule': 'ebs-unattached',
+            'resource_type': 'EBS',
+            'when': [['state', '==', 'available']],
+            'savings': 'size_gb * 0.1',
+            'message': '{resource_id} unattached'
+        }
+    ]
+})
+
+
+def test_all_none_column_is_numeric_and_never_matches():
+    table = ResourceTable.from_rows([
+        {'resource_type': 'EC2', 'resource_id': 'i-1', 'cpu_avg': None, 'monthly_cost': 60.0},
+        {'resource_type': 'EBS', 'resource_id': 'vol-1', 'state': 'available', 'size_gb': 100},
+    ])
+
+    assert table.column('cpu_avg').dtype == float
+
+    recommendations = ENGINE.evaluate(table)
+    assert [(r['rule'], r['resource_id']) for r in recommendations] == [('ebs-unattached', 'vol-1')]
+
+
+def test_numeric_condition_on_mixed_column_skips_non_numeric_values():
+    table = ResourceTable.from_rows([
+        {'resource_type': 'EC2', 'resource_id': 'i-1', 'cpu_avg': 'n/a', 'monthly_cost': 60.0},
+        {'resource_type': 'EC2', 'resource_id': 'i-2', 'cpu_avg': 4.0, 'monthly_cost': 60.0},
+        {'resource_type': 'EC2', 'resource_id': 'i-3', 'cpu_avg': None, 'monthly_cost': 60.0},
+    ])
+
+    recommendations = ENGINE.evaluate(table)
+    assert [r['resource_id'] for r in recommendations] == ['i-2']
+    assert recommendations[0]['estimated_monthly_savings'] == 30.0
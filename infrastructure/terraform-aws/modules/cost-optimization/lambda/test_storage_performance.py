@@ -0,0 +1,47 @@
+"""Tests for storage_performance"""
+
+from storage_performance import gp3_settings, recommend_ebs, recommend_rds
+
+
+def stats(p99_iops, p99_mibps):
+    return {'p99_iops': p99_iops, 'peak_iops': p99_iops, 'p99_mibps': p99_mibps, 'peak_mibps': p99_mibps}
+
+
+def test_gp3_settings_never_go_below_the_baseline():
+    assert gp3_settings(100, 10, 20) == (3000, 125)
+
+
+def test_ebs_io1_moves_to_gp3_sized_from_p99():
+    volume = {'volume_type': 'io1', 'size_gb': 500, 'iops': 10000}
+
+    change = recommend_ebs(volume, stats(4000, 100))
+
+    assert change['target'] == {'volume_type': 'gp3', 'iops': 4800, 'throughput': 125}
+    assert change['monthly_savings'] > 0
+
+
+def test_rds_below_400_gb_grows_to_400_gb_to_set_gp3_iops():
+    instance = {'storage_type': 'io1', 'allocated_gb': 200, 'iops': 10000, 'engine': 'postgres'}
+
+    change = recommend_rds(instance, stats(5000, 50))
+
+    # 6000 IOPS is within the 12000 IOPS baseline at 400 GB
+    assert change['target'] == {'storage_type': 'gp3', 'iops': 12000, 'throughput': 500, 'allocated_gb': 400}
+    current = 200 * 0.125 + 10000 * 0.10
+    assert round(change['monthly_savings'], 2) == round(current - 400 * 0.115, 2)
+
+
+def test_rds_below_400_gb_within_baseline_keeps_its_size():
+    instance = {'storage_type': 'io1', 'allocated_gb': 200, 'iops': 3000, 'engine': 'postgres'}
+
+    change = recommend_rds(instance, stats(1000, 20))
+
+    assert change['target'] == {'storage_type': 'gp3', 'iops': 3000, 'throughput': 125}
+
+
+def test_rds_sql_server_sets_gp3_iops_at_any_size():
+    instance = {'storage_type': 'io1', 'allocated_gb': 200, 'iops': 10000, 'engine': 'sqlserver-se'}
+
+    change = recommend_rds(instance, stats(5000, 50))
+
+    assert change['target'] == {'storage_type': 'gp3', 'iops': 6000, 'throughput': 125}
@@ -18,6 +18,20 @@ locals {
     CostCenter  = var.cost_center
     Environment = var.environment
   })
+
+  # Read access to Cost and Usage Report files for the cost optimizer
+  cur_policy_statements = var.cur_bucket_name == "" ? [] : [
+    {
+      Effect   = "Allow"
+      Action   = ["s3:GetObject"]
+      Resource = "arn:aws:s3:::${var.cur_bucket_name}/*"
+    },
+    {
+      Effect   = "Allow"
+      Action   = ["s3:ListBucket"]
+      Resource = "arn:aws:s3:::${var.cur_bucket_name}"
+    }
+  ]
 }
 
 # ============================================
@@ -517,12 +531,25 @@ resource "aws_lambda_function" "cost_optimizer" {
   runtime       = "python3.11"
   handler       = "index.handler"
   role          = aws_iam_role.cost_optimizer_lambda[0].arn
-  timeout       = 300
-  memory_size   = 256
+  timeout       = var.cost_optimizer_timeout
+  memory_size   = var.cost_optimizer_memory_size
+
+  # Runs and acknowledgements rewrite the same SQLite objects in S3; one at a time
+  reserved_concurrent_executions = 1
 
   # Use ARM for 20% cost savings
   architectures = ["arm64"]
 
+  # numpy/pyarrow for the rule engine, idle detection, CUR ingestion and commitment planning
+  layers = var.cost_optimizer_layer_arns
+
+  lifecycle {
+    precondition {
+      condition     = length(var.cost_optimizer_layer_arns) > 0
+      error_message = "cost_optimizer_layer_arns must provide numpy and pyarrow (e.g. the AWS SDK for pandas layer); without them no resource recommendations are produced."
+    }
+  }
+
   filename         = "${path.module}/lambda/cost-optimizer.zip"
   source_code_hash = filebase64sha256("${path.module}/lambda/cost-optimizer.zip")
 
@@ -532,9 +559,42 @@ resource "aws_lambda_function" "cost_optimizer" {
       PROJECT_NAME  = var.project_name
       ALERT_EMAILS  = join(",", var.budget_alert_emails)
       SNS_TOPIC_ARN = var.sns_topic_arn
+
+      # Recommendation history (SQLite) used for delta-only notifications
+      RECOMMENDATION_STORE_BUCKET = aws_s3_bucket.cost_optimized_storage.id
+      RECOMMENDATION_STORE_KEY    = "cost-optimizer/recommendations.sqlite"
+
+      # Cost and Usage Report Parquet files for actual-spend savings
+      CUR_LOCATION      = var.cur_bucket_name != "" ? "s3://${var.cur_bucket_name}/${var.cur_prefix}" : ""
+      CUR_LOOKBACK_DAYS = tostring(var.cur_lookback_days)
+
+      # Savings Plan commitment planning
+      COMMITMENT_LOOKBACK_DAYS  = tostring(var.commitment_lookback_days)
+      COMMITMENT_DISCOUNT_RATES = jsonencode(var.commitment_discount_rates)
+
+      # Anomaly drill-down with a cached daily cost cube (SQLite)
+      COST_CUBE_BUCKET      = aws_s3_bucket.cost_optimized_storage.id
+      COST_CUBE_KEY         = "cost-optimizer/cost-cube.sqlite"
+      ANOMALY_LOOKBACK_DAYS = tostring(var.anomaly_lookback_days)
+      ANOMALY_BASELINE_DAYS = tostring(var.anomaly_baseline_days)
+
+      # Multi-signal idle detection for EC2, RDS and ElastiCache
+      IDLE_LOOKBACK_DAYS = tostring(var.idle_lookback_days)
+
+      # EBS/RDS storage IOPS and throughput utilization
+      STORAGE_LOOKBACK_DAYS = tostring(var.storage_lookback_days)
+      STORAGE_METRIC_PERIOD = tostring(var.storage_metric_period)
+
+      # Recommendation rules; empty uses the bundled rules.json
+      RULES_LOCATION = var.cost_optimizer_rules_location
     }
   }
 
+  # Room in /tmp for the recommendation store and cost cube
+  ephemeral_storage {
+    size = var.cost_optimizer_ephemeral_storage_mb
+  }
+
   tags = local.cost_tags
 }
 
@@ -565,14 +625,16 @@ resource "aws_iam_role_policy" "cost_optimizer_lambda" {
 
   policy = jsonencode({
     Version = "2012-10-17"
-    Statement = [
+    Statement = concat([
       {
         Effect = "Allow"
         Action = [
           "ce:GetCostAndUsage",
           "ce:GetCostForecast",
+          "ce:GetAnomalies",
           "ce:GetReservationUtilization",
           "ce:GetSavingsPlansUtilization",
+          "ce:GetSavingsPlansCoverage",
           "ce:GetRightsizingRecommendation"
         ]
         Resource = "*"
@@ -583,7 +645,19 @@ resource "aws_iam_role_policy" "cost_optimizer_lambda" {
           "ec2:DescribeInstances",
           "ec2:DescribeVolumes",
           "rds:DescribeDBInstances",
-          "elasticache:DescribeCacheClusters"
+          "elasticache:DescribeCacheClusters",
+          "ecs:ListClusters",
+          "ecs:ListServices",
+          "ecs:DescribeServices",
+          "ecs:DescribeTaskDefinition"
+        ]
+        Resource = "*"
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "cloudwatch:GetMetricData",
+          "cloudwatch:GetMetricStatistics"
         ]
         Resource = "*"
       },
@@ -594,6 +668,27 @@ resource "aws_iam_role_policy" "cost_optimizer_lambda" {
         ]
         Resource = var.sns_topic_arn
       },
+      {
+        Effect = "Allow"
+        Action = [
+          "s3:GetObject",
+          "s3:PutObject"
+        ]
+        Resource = "${aws_s3_bucket.cost_optimized_storage.arn}/cost-optimizer/*"
+      },
+      {
+        # Lets a missing store read as 404 (first run) rather than access denied
+        Effect = "Allow"
+        Action = [
+          "s3:ListBucket"
+        ]
+        Resource = aws_s3_bucket.cost_optimized_storage.arn
+        Condition = {
+          StringLike = {
+            "s3:prefix" = ["cost-optimizer/*"]
+          }
+        }
+      },
       {
         Effect = "Allow"
         Action = [
@@ -603,7 +698,7 @@ resource "aws_iam_role_policy" "cost_optimizer_lambda" {
         ]
         Resource = "arn:aws:logs:*:*:*"
       }
-    ]
+    ], local.cur_policy_statements)
   })
 }
 
@@ -255,3 +255,116 @@ variable "sns_topic_arn" {
   type        = string
   default     = ""
 }
+
+variable "cost_optimizer_ephemeral_storage_mb" {
+  description = "Ephemeral /tmp storage (MB) for the cost optimizer Lambda, which holds the recommendation store during a run"
+  type        = number
+  default     = 1024
+}
+
+variable "cost_optimizer_memory_size" {
+  description = "Memory (MB) for the cost optimizer Lambda; CUR ingestion streams record batches but pyarrow needs headroom, and Lambda CPU scales with memory"
+  type        = number
+  default     = 1024
+}
+
+variable "cost_optimizer_timeout" {
+  description = "Timeout (seconds) for the cost optimizer Lambda; stage durations are logged to size it for the estate"
+  type        = number
+  default     = 900
+
+  validation {
+    condition     = var.cost_optimizer_timeout > 0 && var.cost_optimizer_timeout <= 900
+    error_message = "cost_optimizer_timeout must be between 1 and 900 seconds."
+  }
+}
+
+variable "cost_optimizer_layer_arns" {
+  description = "Lambda layer ARNs for the cost optimizer providing numpy and pyarrow (e.g. AWS SDK for pandas); required when the Lambda is enabled"
+  type        = list(string)
+  default     = []
+}
+
+# ============================================
+# Cost and Usage Report
+# ============================================
+
+variable "cur_bucket_name" {
+  description = "S3 bucket holding Cost and Usage Report Parquet files (empty disables actual-spend savings)"
+  type        = string
+  default     = ""
+}
+
+variable "cur_prefix" {
+  description = "CUR prefix within the bucket; may contain {year}, {month} (unpadded) or {billing_period} (YYYY-MM)"
+  type        = string
+  default     = "cur/year={year}/month={month}"
+}
+
+variable "cur_lookback_days" {
+  description = "Days of CUR usage averaged into monthly spend per resource"
+  type        = number
+  default     = 30
+}
+
+# ============================================
+# Savings Plan Commitment Planning
+# ============================================
+
+variable "commitment_lookback_days" {
+  description = "Days of hourly usage (30-90) simulated by the Savings Plan commitment planner"
+  type        = number
+  default     = 60
+
+  validation {
+    condition     = var.commitment_lookback_days >= 30 && var.commitment_lookback_days <= 90
+    error_message = "commitment_lookback_days must be between 30 and 90."
+  }
+}
+
+variable "commitment_discount_rates" {
+  description = "Discount off on-demand per commitment option (e.g. compute-1yr-no-upfront = 0.27); empty uses built-in approximations"
+  type        = map(number)
+  default     = {}
+}
+
+variable "anomaly_lookback_days" {
+  description = "Days of Cost Explorer anomalies drilled into on each run"
+  type        = number
+  default     = 7
+}
+
+variable "anomaly_baseline_days" {
+  description = "Days before an anomaly whose average daily cost is the baseline for its drivers"
+  type        = number
+  default     = 14
+}
+
+variable "idle_lookback_days" {
+  description = "Days every idle signal (CPU, network, connections, cache lookups) must stay quiet before a resource is a stop/delete candidate"
+  type        = number
+  default     = 14
+}
+
+variable "storage_lookback_days" {
+  description = "Days of EBS/RDS IOPS and throughput history used for storage recommendations"
+  type        = number
+  default     = 14
+}
+
+variable "storage_metric_period" {
+  description = "Period in seconds of the storage utilization metrics (60 or 300; 60 needs detailed monitoring and a lookback of at most 15 days)"
+  type        = number
+  default     = 300
+
+  validation {
+    condition     = contains([60, 300], var.storage_metric_period)
+    error_message = "storage_metric_period must be 60 or 300."
+  }
+}
+
+variable "cost_optimizer_rules_location" {
+  description = "Recommendation rules JSON as an s3:// URI (readable under the optimized-storage bucket's cost-optimizer/ prefix); empty uses the bundled rules.json"
+  type        = string
+  default     = ""
+}